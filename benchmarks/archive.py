@@ -0,0 +1,160 @@
+# benchmarks/archive.py
+#
+# Synthetic station archives laid out like VLF/ (HiRes, LoRes, Wav),
+# for the benchmark suite:
+#
+#   PYTHONPATH=src python benchmarks/archive.py /tmp/vlf-month --days 30
+
+import argparse
+import io
+import json
+import os
+import shutil
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+import numpy as np
+from PIL import Image
+from scipy.io import wavfile
+
+SIZES = {"day": 1, "month": 30, "year": 365}
+STATION = "BenchG4"
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+@dataclass(frozen=True)
+class ArchiveSpec:
+    days: int
+    station: str = STATION
+    hires_cadence: int = 40   # seconds between HiRes frames
+    wav_days: int = 1         # real WAVs only for the last days (size on disk)
+    wav_every: int = 3600     # seconds between WAVs
+    wav_seconds: int = 40
+    sample_rate: int = 44_100
+
+
+def _template_jpeg(size, seed: int) -> bytes:
+    """Noise-like spectrogram stand-in (compresses like the real frames)."""
+    rng = np.random.default_rng(seed)
+    w, h = size
+    base = rng.integers(0, 60, (h, w), dtype=np.uint8)
+    lines = np.zeros((h, w), np.uint8)
+    lines[rng.integers(0, h, 12)] = 180
+    arr = np.stack([base + lines, base // 2, 255 - base], axis=-1)
+    buf = io.BytesIO()
+    Image.fromarray(arr).save(buf, "JPEG", quality=85)
+    return buf.getvalue()
+
+
+def _wav_bytes(spec: ArchiveSpec, seed: int) -> bytes:
+    rng = np.random.default_rng(seed)
+    n = spec.wav_seconds * spec.sample_rate
+    t = np.arange(n) / spec.sample_rate
+    tone = np.sin(2 * np.pi * (8_000 + 50 * seed) * t) * 3_000
+    data = (tone + rng.normal(0, 800, n)).astype(np.int16)
+    buf = io.BytesIO()
+    wavfile.write(buf, spec.sample_rate, data)
+    return buf.getvalue()[:-8]  # station files are a few bytes short
+
+
+def _link(template: str, dest: str) -> None:
+    try:
+        os.link(template, dest)
+    except OSError:
+        shutil.copyfile(template, dest)
+
+
+class Archive:
+    """A generated archive on disk (reused when ``root`` already has it)."""
+
+    def __init__(self, root: str, spec: ArchiveSpec):
+        self.root = root
+        self.spec = spec
+
+    def dir(self, resolution: str) -> str:
+        return os.path.join(self.root, resolution)
+
+    def names(self, resolution: str) -> List[str]:
+        return sorted(os.listdir(self.dir(resolution)))
+
+    def paths(self, resolution: str) -> List[str]:
+        return [os.path.join(self.dir(resolution), n) for n in self.names(resolution)]
+
+    @property
+    def start(self) -> datetime:
+        return START
+
+    @property
+    def end(self) -> datetime:
+        return START + timedelta(days=self.spec.days)
+
+    @classmethod
+    def ensure(cls, root: str, spec: ArchiveSpec) -> "Archive":
+        marker = os.path.join(root, "archive.json")
+        try:
+            with open(marker) as f:
+                if json.load(f) == asdict(spec):
+                    return cls(root, spec)
+        except (OSError, ValueError):
+            pass
+        if os.path.isdir(root):
+            shutil.rmtree(root)
+        archive = cls(root, spec)
+        archive._generate()
+        with open(marker, "w") as f:
+            json.dump(asdict(spec), f)
+        return archive
+
+    def _generate(self) -> None:
+        spec, st = self.spec, self.spec.station
+        for res in ("HiRes", "LoRes", "Wav"):
+            os.makedirs(self.dir(res), exist_ok=True)
+        templates = os.path.join(self.root, ".templates")
+        os.makedirs(templates, exist_ok=True)
+
+        # image content is shared through hard links: listing and parsing
+        # cost depend on the number of names, not on distinct bytes
+        hi_t = os.path.join(templates, "hires.jpg")
+        lo_t = os.path.join(templates, "lores.jpg")
+        with open(hi_t, "wb") as f:
+            f.write(_template_jpeg((1035, 279), 1))
+        with open(lo_t, "wb") as f:
+            f.write(_template_jpeg((1035, 558), 2))
+
+        total = spec.days * 86_400
+        hi = self.dir("HiRes")
+        for s in range(0, total, spec.hires_cadence):
+            ts = START + timedelta(seconds=s)
+            _link(hi_t, os.path.join(hi, f"{st}_HiRest_{ts:%d%m%yUTC%H%M%S}.jpg"))
+        lo = self.dir("LoRes")
+        for s in range(0, total, 3600):
+            ts = START + timedelta(seconds=s)
+            _link(lo_t, os.path.join(lo, f"{st}_LoRest_{ts:%d%m%yUTC%H}00.jpg"))
+
+        # WAV names carry only the day: month and year come from the mtime
+        wav = self.dir("Wav")
+        first = max(0, total - spec.wav_days * 86_400)
+        for i, s in enumerate(range(first, total, spec.wav_every)):
+            ts = START + timedelta(seconds=s)
+            path = os.path.join(wav, f"{st}_Audio_{ts:%dUTC%H%M%S}.wav")
+            with open(path, "wb") as f:
+                f.write(_wav_bytes(spec, i))
+            epoch = ts.timestamp() + spec.wav_seconds
+            os.utime(path, (epoch, epoch))
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Generate a synthetic VLF archive.")
+    ap.add_argument("root")
+    ap.add_argument("--days", type=int, default=1)
+    ap.add_argument("--wav-days", type=int, default=1)
+    args = ap.parse_args()
+    spec = ArchiveSpec(days=args.days, wav_days=args.wav_days)
+    archive = Archive.ensure(args.root, spec)
+    for res in ("HiRes", "LoRes", "Wav"):
+        print(f"{res:6} {len(archive.names(res)):>9,} files")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,452 @@
+# benchmarks/run.py
+#
+# Benchmarks of the indexing, remote I/O and rendering hot paths on a
+# synthetic archive (see archive.py), remote ones against a local SFTP
+# server (see sftp_server.py). Results are stored per commit under
+# benchmarks/results/<size>/ for comparison:
+#
+#   PYTHONPATH=src python benchmarks/run.py --size month
+#   PYTHONPATH=src python benchmarks/run.py --size month --compare HEAD~3
+#   PYTHONPATH=src python benchmarks/run.py --size day -k remote
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(HERE, "results")
+SLOWER = 1.10  # ratio flagged by --compare
+
+# keep envelopes, tiles and thumbnails out of the user's cache
+_WORK = tempfile.mkdtemp(prefix="cassandra-bench-")
+os.environ.setdefault("CASSANDRA_CACHE_DIR", os.path.join(_WORK, "cache"))
+
+import numpy as np  # noqa: E402
+import plotly.graph_objects as go  # noqa: E402
+from PIL import Image  # noqa: E402
+
+from archive import SIZES, Archive, ArchiveSpec  # noqa: E402
+from media.envelope import Envelope, envelope_for, lod_points  # noqa: E402
+from media.remote_file import BlockCache, RemoteFile  # noqa: E402
+from media.thumbnails import SIZES as THUMB_SIZES, make_thumbnail  # noqa: E402
+from media.wav import MappedWav, WavFile, open_local  # noqa: E402
+from parser.catalog import Catalog  # noqa: E402
+from parser.frame_index import FrameIndex  # noqa: E402
+from parser.index_local import index_local_images  # noqa: E402
+from parser.parse_filenames import parse_filename, parse_filenames_bulk  # noqa: E402
+from sftp_server import LocalSFTPServer  # noqa: E402
+from ui.tabs.spectrograms import _plotly_img  # noqa: E402
+from ui.viewer_utils import closest_match  # noqa: E402
+
+
+# ----------------------------------------------------------------------#
+# registry
+# ----------------------------------------------------------------------#
+class Bench(NamedTuple):
+    name: str
+    setup: Callable[["Context"], Callable[[], object]]
+    items: Callable[["Context"], int]  # work units per call, for rates
+    remote: bool
+
+
+BENCHMARKS: List[Bench] = []
+
+
+def bench(
+    name: str,
+    items: Callable[["Context"], int] = lambda ctx: 1,
+    remote: bool = False,
+):
+    """
+    Register ``setup(ctx)``, which prepares its inputs and returns the
+    callable to time (setup itself is not measured).
+    """
+    def wrap(setup):
+        BENCHMARKS.append(Bench(name, setup, items, remote))
+        return setup
+    return wrap
+
+
+class Context:
+    """Inputs shared by the benchmarks of one run, built on first use."""
+
+    LOOKUPS = 1_000
+
+    def __init__(self, archive: Archive):
+        self.archive = archive
+        self.rng = random.Random(0)
+        self._server: Optional[LocalSFTPServer] = None
+        self._cache: Dict[str, object] = {}
+
+    def _memo(self, key: str, make: Callable[[], object]):
+        if key not in self._cache:
+            self._cache[key] = make()
+        return self._cache[key]
+
+    @property
+    def hires_names(self) -> List[str]:
+        return self._memo("names", lambda: self.archive.names("HiRes"))
+
+    @property
+    def catalog(self) -> Catalog:
+        def make():
+            cat = Catalog(self.archive.root, os.path.join(_WORK, "catalog.sqlite"))
+            cat.refresh()
+            return cat
+        return self._memo("catalog", make)
+
+    @property
+    def hires(self) -> FrameIndex:
+        return self._memo(
+            "hires", lambda: FrameIndex.from_table(self.catalog.table(None, "HiRes"))
+        )
+
+    @property
+    def wav_path(self) -> str:
+        return self.archive.paths("Wav")[0]
+
+    def targets(self, n: int) -> List[datetime]:
+        span = (self.archive.end - self.archive.start).total_seconds()
+        return [
+            self.archive.start + timedelta(seconds=self.rng.uniform(0, span))
+            for _ in range(n)
+        ]
+
+    @property
+    def server(self) -> LocalSFTPServer:
+        if self._server is None:
+            self._server = LocalSFTPServer(self.archive.root).start()
+        return self._server
+
+    def close(self) -> None:
+        if self._server is not None:
+            self._server.stop()
+
+
+# ----------------------------------------------------------------------#
+# indexing
+# ----------------------------------------------------------------------#
+@bench("parse.filename", items=lambda ctx: len(ctx.hires_names))
+def _parse_filename(ctx: Context):
+    names = ctx.hires_names
+    return lambda: [parse_filename(n) for n in names]
+
+
+@bench("parse.bulk", items=lambda ctx: len(ctx.hires_names))
+def _parse_bulk(ctx: Context):
+    names = ctx.hires_names
+    return lambda: parse_filenames_bulk(names)
+
+
+@bench("index.local_images", items=lambda ctx: len(ctx.hires_names))
+def _index_local(ctx: Context):
+    directory = ctx.archive.dir("HiRes")
+
+    def run():
+        # it prints a line per file: measure it writing to /dev/null
+        with open(os.devnull, "w") as null, contextlib.redirect_stdout(null):
+            return index_local_images(directory)
+    return run
+
+
+@bench("catalog.refresh_cold", items=lambda ctx: len(ctx.hires_names))
+def _catalog_cold(ctx: Context):
+    def run():
+        fd, db = tempfile.mkstemp(suffix=".sqlite", dir=_WORK)
+        os.close(fd)
+        os.remove(db)
+        try:
+            Catalog(ctx.archive.root, db).refresh()
+        finally:
+            os.remove(db)
+    return run
+
+
+@bench("catalog.refresh_warm")
+def _catalog_warm(ctx: Context):
+    return ctx.catalog.refresh
+
+
+@bench("catalog.table", items=lambda ctx: len(ctx.hires_names))
+def _catalog_table(ctx: Context):
+    cat = ctx.catalog
+    return lambda: cat.table(None, "HiRes")
+
+
+@bench("index.window_1h", items=lambda ctx: Context.LOOKUPS)
+def _window(ctx: Context):
+    frames, targets = ctx.hires, ctx.targets(Context.LOOKUPS)
+    hour = timedelta(hours=1)
+    return lambda: [len(frames.window(t, t + hour)) for t in targets]
+
+
+@bench("closest_match.index", items=lambda ctx: Context.LOOKUPS)
+def _closest_index(ctx: Context):
+    frames, targets = ctx.hires, ctx.targets(Context.LOOKUPS)
+    return lambda: [closest_match(frames, t) for t in targets]
+
+
+@bench("closest_match.list", items=lambda ctx: 10)
+def _closest_list(ctx: Context):
+    rows, targets = list(ctx.hires), ctx.targets(10)
+    return lambda: [closest_match(rows, t) for t in targets]
+
+
+# ----------------------------------------------------------------------#
+# WAV and rendering
+# ----------------------------------------------------------------------#
+@bench("wav.map_and_read")
+def _wav_read(ctx: Context):
+    path = ctx.wav_path
+    return lambda: float(MappedWav(path).samples.astype(np.float32).sum())
+
+
+@bench("envelope.build")
+def _envelope_build(ctx: Context):
+    samples = open_local(ctx.wav_path).samples
+    return lambda: Envelope.build(samples)
+
+
+@bench("envelope.lod_points")
+def _lod(ctx: Context):
+    wav = open_local(ctx.wav_path)
+    envelope_for(wav.path)
+    n = wav.info.n_frames
+    return lambda: lod_points(wav, 0, n)
+
+
+@bench("figure.waveform")
+def _figure_waveform(ctx: Context):
+    wav = open_local(ctx.wav_path)
+    x, y = lod_points(wav, 0, wav.info.n_frames)
+    sr = wav.info.sample_rate
+
+    def run():
+        fig = go.Figure(go.Scatter(x=x / sr, y=y, line=dict(width=1)))
+        fig.update_layout(height=300, xaxis_title="Time (s)", yaxis_title="Amplitude")
+        return fig.to_json()
+    return run
+
+
+@bench("figure.hires_frame")
+def _figure_frame(ctx: Context):
+    img = Image.open(os.path.join(ctx.archive.dir("HiRes"), ctx.hires_names[0]))
+    img.load()
+    return lambda: _plotly_img(img).to_json()
+
+
+@bench("thumbnail.make")
+def _thumbnail(ctx: Context):
+    path = os.path.join(ctx.archive.dir("HiRes"), ctx.hires_names[0])
+    return lambda: make_thumbnail(path, THUMB_SIZES[0])
+
+
+# ----------------------------------------------------------------------#
+# remote (local SFTP server)
+# ----------------------------------------------------------------------#
+FETCHES = 64
+
+
+@bench("remote.connect", remote=True)
+def _remote_connect(ctx: Context):
+    server = ctx.server
+
+    def run():
+        pool = server.pool()
+        server.client(pool=pool).connect()
+        pool.close_all()
+    return run
+
+
+@bench("remote.list_hires", items=lambda ctx: len(ctx.hires_names), remote=True)
+def _remote_list(ctx: Context):
+    client = ctx.server.client()
+    client.connect()
+    return lambda: client.list_images("HiRes")
+
+
+@bench("remote.fetch_sequential", items=lambda ctx: FETCHES, remote=True)
+def _remote_fetch(ctx: Context):
+    client = ctx.server.client()
+    paths = [r["remote_path"] for r in client.list_images("HiRes")[:FETCHES]]
+    return lambda: [client.fetch_image_bytes(p) for p in paths]
+
+
+@bench("remote.fetch_many", items=lambda ctx: FETCHES, remote=True)
+def _remote_fetch_many(ctx: Context):
+    client = ctx.server.client()
+    paths = [r["remote_path"] for r in client.list_images("HiRes")[:FETCHES]]
+    return lambda: list(client.fetch_many(paths))
+
+
+@bench("remote.wav_window_10s", remote=True)
+def _remote_wav(ctx: Context):
+    client = ctx.server.client()
+    path = client.list_wavs()[0]["remote_path"]
+
+    def run():
+        # a cold block cache each time: measures the ranged reads
+        wav = WavFile(RemoteFile(client, path, cache=BlockCache(64 * 1024**2)))
+        return wav.frames(0, 10 * wav.info.sample_rate)
+    return run
+
+
+# ----------------------------------------------------------------------#
+# timing and results
+# ----------------------------------------------------------------------#
+def measure(fn: Callable[[], object], min_time: float, min_runs: int = 3,
+            max_runs: int = 50) -> Dict[str, float]:
+    """Run ``fn`` after one warm-up call until ``min_time`` has elapsed."""
+    fn()
+    times: List[float] = []
+    t_end = time.perf_counter() + min_time
+    while len(times) < max_runs and (
+        len(times) < min_runs or time.perf_counter() < t_end
+    ):
+        t = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t)
+    return {
+        "min": min(times),
+        "median": statistics.median(times),
+        "mean": statistics.fmean(times),
+        "runs": len(times),
+    }
+
+
+def _git(*args: str) -> str:
+    return subprocess.run(
+        ["git", *args], cwd=HERE, capture_output=True, text=True, check=True
+    ).stdout.strip()
+
+
+def commit_id(ref: str = "HEAD") -> str:
+    return _git("rev-parse", "--short=10", ref)
+
+
+def result_path(size: str, ref: Optional[str] = None) -> str:
+    if ref is None:
+        dirty = bool(_git("status", "--porcelain", "--untracked-files=no"))
+        name = commit_id() + ("-dirty" if dirty else "")
+    else:
+        name = commit_id(ref)
+    return os.path.join(RESULTS_DIR, size, name + ".json")
+
+
+def compare(current: Dict, baseline: Dict) -> None:
+    print(f"\nvs {baseline['commit']} ({baseline['date'][:10]}), median time ratio:")
+    for name, res in current["results"].items():
+        old = baseline["results"].get(name)
+        if old is None:
+            continue
+        ratio = res["median"] / old["median"]
+        flag = ""
+        if ratio >= SLOWER:
+            flag = "  SLOWER"
+        elif ratio <= 1 / SLOWER:
+            flag = "  faster"
+        print(f"  {name:26} {ratio:6.2f}x{flag}")
+
+
+def _fmt(seconds: float) -> str:
+    if seconds >= 1:
+        return f"{seconds:8.2f} s "
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:8.2f} ms"
+    return f"{seconds * 1e6:8.2f} µs"
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Cassandra benchmark suite.")
+    ap.add_argument("--size", choices=sorted(SIZES), default="day")
+    ap.add_argument("--archive-dir", help="where the synthetic archive is kept "
+                    "(default: <tmp>/cassandra-bench-archive/<size>)")
+    ap.add_argument("-k", dest="select",
+                    help="only benchmarks whose name contains this")
+    ap.add_argument("--no-remote", action="store_true", help="skip SFTP benchmarks")
+    ap.add_argument("--min-time", type=float, default=1.0,
+                    help="seconds spent timing each benchmark (at least 3 runs)")
+    ap.add_argument("--compare", metavar="REF",
+                    help="commit whose results to compare with")
+    ap.add_argument("--no-save", action="store_true")
+    args = ap.parse_args()
+
+    root = args.archive_dir or os.path.join(
+        tempfile.gettempdir(), "cassandra-bench-archive", args.size
+    )
+    t = time.perf_counter()
+    archive = Archive.ensure(root, ArchiveSpec(days=SIZES[args.size]))
+    counts = {
+        res: len(os.listdir(archive.dir(res))) for res in ("HiRes", "LoRes", "Wav")
+    }
+    print(f"archive {root}: " + ", ".join(f"{n:,} {r}" for r, n in counts.items())
+          + f" (ready in {time.perf_counter() - t:.1f} s)")
+
+    ctx = Context(archive)
+    results: Dict[str, Dict[str, float]] = {}
+    try:
+        for b in BENCHMARKS:
+            if args.select and args.select not in b.name:
+                continue
+            if b.remote and args.no_remote:
+                continue
+            fn = b.setup(ctx)
+            res = measure(fn, args.min_time)
+            res["items"] = b.items(ctx)
+            results[b.name] = res
+            rate = ""
+            if res["items"] > 1:
+                rate = f"  {res['items'] / res['median']:14,.0f} items/s"
+            print(f"{b.name:26} {_fmt(res['median'])}  "
+                  f"(min {_fmt(res['min']).strip()}, {res['runs']} runs){rate}",
+                  flush=True)
+    finally:
+        ctx.close()
+
+    current = {
+        "commit": commit_id(),
+        "date": datetime.now(timezone.utc).isoformat(),
+        "size": args.size,
+        "archive": counts,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "results": results,
+    }
+    if not args.no_save:
+        path = result_path(args.size)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if os.path.exists(path):  # keep benchmarks not selected this time
+            with open(path) as f:
+                current["results"] = {**json.load(f)["results"], **results}
+        with open(path, "w") as f:
+            json.dump(current, f, indent=1)
+        print(f"\nsaved {os.path.relpath(path)}")
+
+    if args.compare:
+        path = result_path(args.size, args.compare)
+        try:
+            with open(path) as f:
+                baseline = json.load(f)
+        except FileNotFoundError:
+            sys.exit(f"no {args.size} results for {args.compare} ({path})")
+        compare({**current, "results": results}, baseline)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    finally:
+        shutil.rmtree(_WORK, ignore_errors=True)
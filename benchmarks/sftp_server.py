@@ -0,0 +1,215 @@
+# benchmarks/sftp_server.py
+#
+# Read-only SFTP server on 127.0.0.1 serving a local folder, so that
+# RemoteVLFClient can be measured without a station:
+#
+#   with LocalSFTPServer("/tmp/vlf-day") as server:
+#       client = server.client()
+#       client.list_images("HiRes")
+#
+# Any public key is accepted and exec requests are refused (stations
+# without a shell are listed over SFTP), so ``list_newer`` returns None.
+
+import os
+import socket
+import stat
+import tempfile
+import threading
+from typing import List, Optional
+
+import paramiko
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519
+
+REMOTE_BASE = "C:/htdocs/VLF"
+USERNAME = "bench"
+
+
+class _Auth(paramiko.ServerInterface):
+    def get_allowed_auths(self, username):
+        return "publickey"
+
+    def check_auth_publickey(self, username, key):
+        return paramiko.AUTH_SUCCESSFUL
+
+    def check_channel_request(self, kind, chanid):
+        if kind == "session":
+            return paramiko.OPEN_SUCCEEDED
+        return paramiko.OPEN_FAILED_ADMINISTRATIVELY_PROHIBITED
+
+    def check_channel_exec_request(self, channel, command):
+        return False
+
+
+class _Handle(paramiko.SFTPHandle):
+    def stat(self):
+        return paramiko.SFTPAttributes.from_stat(os.fstat(self.readfile.fileno()))
+
+
+class _ReadOnlySFTP(paramiko.SFTPServerInterface):
+    """Maps ``REMOTE_BASE/...`` onto the served folder."""
+
+    ROOT = "."
+
+    def _local(self, path: str) -> str:
+        path = path.replace("\\", "/")
+        if path.startswith(REMOTE_BASE):
+            path = path[len(REMOTE_BASE):]
+        local = os.path.realpath(os.path.join(self.ROOT, path.lstrip("/")))
+        if local != self.ROOT and not local.startswith(self.ROOT + os.sep):
+            raise PermissionError(path)
+        return local
+
+    def _attrs(self, fn):
+        try:
+            return fn()
+        except PermissionError:
+            return paramiko.SFTP_PERMISSION_DENIED
+        except OSError as e:
+            return paramiko.SFTPServer.convert_errno(e.errno)
+
+    def list_folder(self, path):
+        def run() -> List[paramiko.SFTPAttributes]:
+            local = self._local(path)
+            out = []
+            with os.scandir(local) as it:
+                for entry in it:
+                    attr = paramiko.SFTPAttributes.from_stat(entry.stat(), entry.name)
+                    out.append(attr)
+            return out
+        return self._attrs(run)
+
+    def stat(self, path):
+        def run():
+            return paramiko.SFTPAttributes.from_stat(os.stat(self._local(path)))
+        return self._attrs(run)
+
+    lstat = stat
+
+    def open(self, path, flags, attr):
+        if flags & (os.O_WRONLY | os.O_RDWR | os.O_CREAT):
+            return paramiko.SFTP_PERMISSION_DENIED
+
+        def run():
+            local = self._local(path)
+            if stat.S_ISDIR(os.stat(local).st_mode):
+                return paramiko.SFTP_FAILURE
+            handle = _Handle(flags)
+            handle.readfile = open(local, "rb")
+            return handle
+        return self._attrs(run)
+
+
+class LocalSFTPServer:
+    """
+    Threaded SFTP server on an ephemeral local port, serving ``root`` as
+    ``REMOTE_BASE``. Use as a context manager; :meth:`client` returns a
+    ``RemoteVLFClient`` with its own SSH pool pointed at it.
+    """
+
+    def __init__(self, root: str):
+        self.root = os.path.realpath(root)
+        self._host_key = paramiko.RSAKey.generate(2048)
+        self._tmp = tempfile.TemporaryDirectory(prefix="bench-sftp-")
+        self.key_path = os.path.join(self._tmp.name, "id_ed25519")
+        self._write_client_key()
+
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind(("127.0.0.1", 0))
+        self.port = self._sock.getsockname()[1]
+        self._transports: List[paramiko.Transport] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _write_client_key(self) -> None:
+        key = ed25519.Ed25519PrivateKey.generate()
+        pem = key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.OpenSSH,
+            serialization.NoEncryption(),
+        )
+        with open(self.key_path, "wb") as f:
+            f.write(pem)
+
+    # ------------------------------------------------------------------#
+    # lifecycle
+    # ------------------------------------------------------------------#
+    def start(self) -> "LocalSFTPServer":
+        self._sock.listen(16)
+        self._sock.settimeout(0.2)
+        self._thread = threading.Thread(
+            target=self._serve, name="bench-sftp", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def _serve(self) -> None:
+        sftp_cls = type("_Served", (_ReadOnlySFTP,), {"ROOT": self.root})
+        while not self._stop.is_set():
+            try:
+                conn, _ = self._sock.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            t = paramiko.Transport(conn)
+            t.add_server_key(self._host_key)
+            t.set_subsystem_handler("sftp", paramiko.SFTPServer, sftp_cls)
+            t.start_server(server=_Auth())
+            self._transports.append(t)
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        for t in self._transports:
+            t.close()
+        self._sock.close()
+        self._tmp.cleanup()
+
+    def __enter__(self) -> "LocalSFTPServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    # ------------------------------------------------------------------#
+    # clients
+    # ------------------------------------------------------------------#
+    def pool(self):
+        """A private SSH pool (the process-wide one would be shared)."""
+        from ssh.pool import SSHPool
+
+        return SSHPool(connect=_connect)
+
+    def client(self, *, pool=None, cache=None, station: Optional[str] = None):
+        """A ``RemoteVLFClient`` for this server, on a new pool unless given."""
+        from ssh.fetcher_remote import RemoteVLFClient
+
+        return RemoteVLFClient(
+            "127.0.0.1",
+            self.port,
+            USERNAME,
+            self.key_path,
+            REMOTE_BASE,
+            pool=pool if pool is not None else self.pool(),
+            cache=cache,
+            station=station or "bench",
+        )
+
+
+def _connect(host: str, port: int, username: str, key_path: str):
+    """Like the pool's default, minus agent and ~/.ssh key lookup."""
+    client = paramiko.SSHClient()
+    client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+    client.connect(
+        hostname=host,
+        port=port,
+        username=username,
+        pkey=paramiko.Ed25519Key.from_private_key_file(key_path),
+        allow_agent=False,
+        look_for_keys=False,
+    )
+    return client
@@ -1,7 +1,10 @@
+import bisect
 import streamlit as st
 from typing import List
 from datetime import datetime, date, timedelta
 
+from parser.frame_index import FrameIndex, day_bounds, merged_days
+
 
 _STATION_DEFAULTS = {
     "ExperimentalG4": "VLF/",
@@ -56,13 +59,13 @@ def select_station_folder_mode():
     return station, src_folder, mode
 
 
-def select_date_time(all_ts):
+def select_date_time(indexes: List[FrameIndex]):
     """
     Calendar date-picker that *looks* free-form but snaps to the
     closest available day if the user picks an empty one.
     """
     # all unique UTC dates that really exist
-    valid_days = sorted({ts.date() for ts in all_ts})
+    valid_days = merged_days(indexes)
 
     min_day, max_day = valid_days[0], valid_days[-1]
 
@@ -71,14 +74,16 @@ def select_date_time(all_ts):
         "Date",
         value=max_day,             # pre-select the latest
         min_value=min_day,
-        max_value=max_day
+        max_value=max_day,
+        key="date",
     )
 
     # ── snap to nearest valid day if necessary
-    if picked not in valid_days:
-        # find the closest existing day
-        # (simple linear search – list is small)
-        nearest = min(valid_days, key=lambda d: abs(d - picked))
+    i = bisect.bisect_left(valid_days, picked)
+    if i == len(valid_days) or valid_days[i] != picked:
+        # closest existing day is one of the two bisect neighbours
+        around = valid_days[max(i - 1, 0):i + 1]
+        nearest = min(around, key=lambda d: abs(d - picked))
         st.sidebar.warning(
             f"No data for {picked:%Y-%m-%d}. "
             f"Jumped to closest available day ({nearest:%Y-%m-%d}).",
@@ -86,11 +91,11 @@ def select_date_time(all_ts):
         )
         picked = nearest
 
-    # ── build the list of valid times *for that day* --------------
-    times_for_day = sorted({ts.time() for ts in all_ts if ts.date() == picked})
+    # ── first / last valid time *for that day* --------------------
+    first_t, last_t = day_bounds(indexes, picked)
 
-    start_t = st.sidebar.time_input("Start Time", value=times_for_day[0])
-    end_t   = st.sidebar.time_input("End Time",   value=times_for_day[-1])
+    start_t = st.sidebar.time_input("Start Time", value=first_t)
+    end_t   = st.sidebar.time_input("End Time",   value=last_t)
 
     # guarantee chronological order
     if start_t >= end_t:
@@ -99,6 +104,19 @@ def select_date_time(all_ts):
     return picked, start_t, end_t
 
 
+def jump_to(when: datetime, window: timedelta = timedelta(hours=1)) -> None:
+    """
+    Point every navigation control at ``when``: its day, its LoRes hour
+    and a ``window``-long slider range starting on its 5-minute mark.
+    Call from a widget callback (before the controls are drawn).
+    """
+    ss = st.session_state
+    hour = when.replace(minute=0, second=0, microsecond=0)
+    start = hour + timedelta(minutes=when.minute // 5 * 5)
+    ss["date"] = when.date()
+    ss["lores_hour"] = ss["lores_picker"] = hour
+    ss["range_slider"] = (start, start + window)
+
 
 def render_download_buttons():
     st.sidebar.markdown("---")
@@ -108,4 +126,4 @@ def render_download_buttons():
     st.sidebar.button("🗜️ Download LoRes WAV",     use_container_width=True)
     st.sidebar.button("🗜️ Download HiRes WAV",     use_container_width=True)
     st.sidebar.button("🖼️ Download LoRes Spec",    use_container_width=True)
-    st.sidebar.button("🖼️ Download HiRes Spec",    use_container_width=True)
\ No newline at end of file
+    st.sidebar.button("🖼️ Download HiRes Spec",    use_container_width=True)
@@ -1,54 +1,141 @@
 import os
 import yaml
-from datetime import datetime, timezone 
 from pathlib import Path
-from typing import List, Dict, Optional
+from datetime import datetime
+from typing import Dict, Optional, Tuple
 from dotenv import load_dotenv
 import streamlit as st
 
-from parser.index_local import index_local_images
+from cache.disk import cache_dir, get_disk_cache
+from inference.store import DetectionStore, default_path
+from parser.catalog import Catalog
+from parser.frame_index import FrameIndex
+from parser.frame_table import FrameTable
+from perf.trace import span, traced
+from ssh.async_client import MultiStationClient
 from ssh.fetcher_remote import RemoteVLFClient
+from ssh.remote_catalog import RemoteCatalog
+from ssh.sync import DEFAULT_MIRROR_ROOT, mirror_dir
 
 # Load remote‐station configs from your top‐level ssh/stations.yml
 load_dotenv()
 _CFG_PATH = Path(__file__).parents[2] / "src" / "ssh" / "stations.yml"
 with open(_CFG_PATH) as f:
-    _REMOTE_STATIONS: Dict[str,Dict] = yaml.safe_load(f)
+    _REMOTE_STATIONS: Dict[str, Dict] = yaml.safe_load(f)
 
+
+@st.cache_resource(show_spinner=False)
+def _get_catalog(src_folder: str) -> Catalog:
+    """One on-disk catalog per source folder, shared across reruns."""
+    return Catalog(src_folder)
+
+
+@st.cache_resource(show_spinner=False)
+def detection_store() -> DetectionStore:
+    """
+    The detection store the inference service and backfills write
+    (``$CASSANDRA_MIRROR_DIR/.cassandra/detections.sqlite``), shared by
+    every station and session.
+    """
+    root = os.getenv("CASSANDRA_MIRROR_DIR", DEFAULT_MIRROR_ROOT)
+    return DetectionStore(default_path(root))
+
+
+@st.cache_resource(show_spinner=False)
+def _remote_client(station: str, key_path: str) -> RemoteVLFClient:
+    """
+    One client per station for the whole process. Clients draw their
+    SSH transport from the shared pool, so reruns skip the handshake,
+    and keep an incremental listing of the station on disk.
+    """
+    cfg = _REMOTE_STATIONS[station]
+    client = RemoteVLFClient(
+        host=cfg["host"],
+        port=cfg["port"],
+        username=cfg["username"],
+        key_path=key_path,
+        remote_base=cfg["remote_base"],
+        cache=get_disk_cache(),
+        station=station,
+    )
+    client.listing = RemoteCatalog(
+        client, os.path.join(cache_dir("listings"), f"{station}.sqlite")
+    )
+    return client
+
+
+@st.cache_resource(show_spinner=False)
+def _fleet(key_path: str) -> MultiStationClient:
+    """Async engine over every configured station (per-station + global caps)."""
+    return MultiStationClient(
+        {name: _remote_client(name, key_path) for name in _REMOTE_STATIONS}
+    )
+
+
+def compare_stations(when: datetime, resolution: str = "HiRes") -> Dict:
+    """
+    ``{station: (frame, FetchResult) | None | exception}`` — the frame
+    nearest ``when`` from every remote station, fetched in parallel.
+    """
+    key_path = os.path.expanduser(os.getenv("SSH_KEY_PATH", "~/.ssh/id_ed25519"))
+    fleet = _fleet(key_path)
+    return fleet.run(fleet.frames_at(when, resolution))
+
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def _remote_indexes(
+    station: str, key_path: str, stamp: tuple
+) -> Tuple[FrameIndex, FrameIndex, FrameIndex]:
+    """Sorted indexes from the station's listing; rebuilt when `stamp` changes."""
+    listing = _remote_client(station, key_path).listing
+    return tuple(
+        FrameIndex(listing.table(res)) for res in ("LoRes", "HiRes", "Wav")
+    )
+
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def _local_indexes(
+    src_folder: str, station: Optional[str], stamp: tuple
+) -> Tuple[FrameIndex, FrameIndex, FrameIndex]:
+    """Sorted indexes for one station; rebuilt only when `stamp` changes."""
+    catalog = _get_catalog(src_folder)
+    return tuple(
+        FrameIndex(catalog.table(station, res))
+        for res in ("LoRes", "HiRes", "Wav")
+    )
+
+
+@traced("load_data")
 def load_data(
     station: str,
     src_folder: str
-) -> (List[Dict], List[Dict], List[Dict], bool, Optional[RemoteVLFClient]):
+) -> (FrameIndex, FrameIndex, FrameIndex, bool, Optional[RemoteVLFClient]):
     """
-    Returns (lores, hires, wavs, is_remote, client).
-    If `station` appears in stations.yml, we SSH; else local disk.
+    Returns (lores, hires, wavs, is_remote, client), each a time-sorted
+    :class:`FrameIndex`.
+    If `station` appears in stations.yml we read its local mirror (kept
+    up to date by ``python -m ssh.sync``) when there is one, else SSH;
+    other stations are read from local disk.
     """
+    catalog_station: Optional[str] = station
 
-    # ─── Remote path? ────────────────────────────────────────────
-    if station in _REMOTE_STATIONS:
-        cfg = _REMOTE_STATIONS[station]
+    # ─── Mirrored by the sync daemon? read it from disk ─────────
+    if station in _REMOTE_STATIONS and os.path.isdir(mirror_dir(station)):
+        src_folder, catalog_station = mirror_dir(station), None
 
-        # Gather exactly the args RemoteVLFClient expects:
-        host       = cfg["host"]
-        port       = cfg["port"]
-        user       = cfg["username"]
+    # ─── Remote path? ────────────────────────────────────────────
+    elif station in _REMOTE_STATIONS:
         # key comes from your .env:
-        key_path = os.path.expanduser(os.getenv("SSH_KEY_PATH", "~/.ssh/id_ed25519")) 
-        if not key_path:
-            raise RuntimeError("SSH_KEY_PATH not set in environment")
-        remote_base = cfg["remote_base"]
-
-        client = RemoteVLFClient(
-            host=host,
-            port=port,
-            username=user,
-            key_path=key_path,
-            remote_base=remote_base
-        )
+        key_path = os.path.expanduser(os.getenv("SSH_KEY_PATH", "~/.ssh/id_ed25519"))
+        client = _remote_client(station, key_path)
 
-        lores = client.list_images("LoRes")
-        hires = client.list_images("HiRes")
-        wavs  = client.list_wavs()
+        # only entries newer than the last known listing cross the wire
+        with span("listing.refresh"):
+            client.listing.refresh()
+        with span("index.build"):
+            lores, hires, wavs = _remote_indexes(
+                station, key_path, client.listing.stamp()
+            )
 
         st.sidebar.caption(
             f"Data range: {lores[0]['timestamp']:%Y-%m-%d} → "
@@ -56,29 +143,21 @@ def load_data(
         )
 
         return lores, hires, wavs, True, client
-    
 
     # ─── Local fallback ───────────────────────────────────────────
-    lo_dir = os.path.join(src_folder, "LoRes")
-    hi_dir = os.path.join(src_folder, "HiRes")
-
-    lo = index_local_images(lo_dir) if os.path.isdir(lo_dir) else []
-    hi = index_local_images(hi_dir) if os.path.isdir(hi_dir) else []
-    lores = [img for img in lo if station in img["station"]]
-    hires = [img for img in hi if station in img["station"]]
-
-
-    # local WAVs
-    wavs = []
-    wav_dir = os.path.join(src_folder, "Wav")
-    if os.path.isdir(wav_dir):
-        for fn in os.listdir(wav_dir):
-            if fn.lower().endswith(".wav") and station in fn:
-                p = os.path.join(wav_dir, fn)
-                wavs.append({
-                    "path":      p,
-                    "timestamp": datetime.fromtimestamp(os.path.getmtime(p), tz=timezone.utc),
-                    "filename":  fn
-                })
-
-    return lores, hires, wavs, False, None
\ No newline at end of file
+    if not os.path.isdir(src_folder):
+        empty = FrameIndex(FrameTable.empty())
+        return empty, empty, empty, False, None
+
+    # the catalog only re-lists a folder whose mtime changed
+    src_folder = os.path.abspath(src_folder)
+    catalog = _get_catalog(src_folder)
+    with span("catalog.refresh"):
+        catalog.refresh()
+
+    with span("index.build"):
+        lores, hires, wavs = _local_indexes(
+            src_folder, catalog_station, catalog.stamp()
+        )
+
+    return lores, hires, wavs, False, None
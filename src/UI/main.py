@@ -9,6 +9,7 @@ st.set_page_config(
 )
 
 
+import uuid
 from datetime import datetime, timedelta, timezone
 
 from ui.controls      import (
@@ -19,10 +20,12 @@ from ui.controls      import (
 from ui.data_loading import (
     load_data,
 )
-from ui.viewer_utils import generate_timeline, closest_match
+from ui.viewer_utils import generate_timeline
+from ui.prefetch      import prefetch_adjacent_hours
 from ui.tabs.spectrograms import render_spectrograms_tab
 from ui.tabs.waveform     import render_waveform_tab
-from ui.tabs.logs         import render_logs_tab
+from ui.tabs.logs         import render_logs_tab, render_performance
+from perf import trace
 
 
 # ─────────── Title & Caption ───────────
@@ -38,24 +41,39 @@ It allows you to:
 - Run (or simulate) AI-based signal classification
 - Download any combination of files for offline use
 
-Use the control panel on the left to configure your source folders, time ranges, and station of interest.
+Use the control panel on the left to configure your source folders, time ranges,
+and station of interest.
 """
 )
 
 def main():
+    ss = st.session_state
+    profiling = ss.get("perf_enabled", bool(os.getenv("CASSANDRA_PERF")))
+    if profiling:
+        trace.start()
+    try:
+        perf_slot = _main()
+    finally:
+        rec = trace.finish() if profiling else None
+    if perf_slot is not None:
+        with perf_slot:
+            render_performance(ss, rec)
+
+
+def _main():
+    """One rerun; returns the Logs-tab slot for the Performance section."""
     # ───────── Sidebar • Station/Folder/Mode ─────────
     station, src_folder, mode = select_station_folder_mode()
 
 
     # ───────── Load & index data ─────────
     lores, hires, wavs, is_remote, client = load_data(station, src_folder)
-    all_ts       = [item["timestamp"] for item in lores + hires + wavs]
-    if not all_ts:
+    if not (lores or hires or wavs):
         st.error("No data found for this station/folder.")
-        return
+        return None
 
     # ───────── Sidebar • Date & Time Pickers ─────────
-    sel_date, start_t, end_t = select_date_time(all_ts)
+    sel_date, start_t, end_t = select_date_time([lores, hires, wavs])
 
     # ───────── Sidebar • Download Buttons ─────────
     render_download_buttons()
@@ -72,7 +90,14 @@ def main():
     timeline = generate_timeline(dt0, dt1, 5)
     if not timeline:
         st.error("Start Time must be before End Time.")
-        return
+        return None
+
+    # a jump (detection timeline) may land outside this day's range
+    lo, hi = ss["range_slider"]
+    if lo < timeline[0] or hi > timeline[-1]:
+        length = hi - lo
+        lo = min(max(lo, timeline[0]), timeline[-1] - timedelta(minutes=5))
+        ss["range_slider"] = (lo, min(lo + length, timeline[-1]))
 
     # ───────── Active Window ─────────
     if mode == "Use slider":
@@ -89,12 +114,12 @@ def main():
         ss["lores_hour"] = rng_start.replace(minute=0, second=0, microsecond=0)
     else:
         # hour‑picker mode
-        lo_hours = sorted({
-            lo["timestamp"].replace(minute=0, second=0, microsecond=0)
-            for lo in lores if lo["timestamp"].date() == sel_date
-        })
-        # if ss["lores_hour"] not in lo_hours:
-        #     ss["lores_hour"] = lo_hours[0]
+        lo_hours = lores.hours(sel_date)
+        if lo_hours and ss["lores_hour"] not in lo_hours:
+            # nearest LoRes hour of the day (e.g. after a jump)
+            ss["lores_hour"] = ss["lores_picker"] = min(
+                lo_hours, key=lambda h: abs(h - ss["lores_hour"])
+            )
 
         col_l, col_m, col_r = st.columns([1,6,1], gap="small")
         with col_l:
@@ -148,6 +173,8 @@ def main():
             session_state   = ss,
             is_remote       = is_remote,
             client          = client,
+            wavs            = wavs,
+            station         = station,
         )
 
     with tab_wav:
@@ -157,11 +184,28 @@ def main():
             rng_end     = rng_end,
             ss          = ss,
             is_remote   = is_remote,   # <─ add these two lines
-            client      = client       # <─ so remote stations work too
+            client      = client,      # <─ so remote stations work too
+            station     = station,
         )
 
     with tab_logs:
-        render_logs_tab(ss=ss)
+        render_logs_tab(ss=ss, station=station, when=rng_start)
+        perf_slot = st.container()
+
+    # ───────── Warm the neighbouring hours ─────────
+    if mode == "Use hour picker":
+        prefetch_adjacent_hours(
+            ss["lores_hour"],
+            lo_hours,
+            group  = ss.setdefault("prefetch_group", uuid.uuid4().hex),
+            lores  = lores,
+            hires  = hires,
+            wavs   = wavs,
+            before = timedelta(minutes=int(ss.get("mins_before", 0))),
+            after  = timedelta(minutes=int(ss.get("mins_after", 60))),
+            client = client if is_remote else None,
+        )
+    return perf_slot
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
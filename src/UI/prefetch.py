@@ -0,0 +1,201 @@
+# src/ui/prefetch.py
+
+from __future__ import annotations
+
+import concurrent.futures
+import functools
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+import streamlit as st
+
+from media.envelope import envelope_for
+from media.remote_file import RemoteFile
+from media.thumbnails import Thumbnails
+from media.wav import WavFile
+from parser.frame_index import FrameIndex
+from ssh.fetcher_remote import RemoteVLFClient
+from ui.tabs.waveform import REMOTE_ZOOM_SECONDS
+
+Task = Callable[[], object]
+
+
+class Prefetcher:
+    """
+    Best-effort cache warm-up on a small thread pool.
+
+    Work is scheduled per ``group`` (one per browser session). A new
+    batch for a group supersedes the previous one: its queued tasks are
+    dropped and the ones already running are the last to execute, so
+    jumping elsewhere never leaves the pool busy with stale work.
+    Failures are counted, not raised.
+    """
+
+    def __init__(self, workers: int = 4):
+        self._pool = ThreadPoolExecutor(max_workers=workers,
+                                        thread_name_prefix="prefetch")
+        self._lock = threading.Lock()
+        self._generation: Dict[str, int] = {}
+        self._futures: Dict[str, List[Future]] = {}
+        self.stats = {"scheduled": 0, "done": 0, "skipped": 0, "failed": 0}
+
+    def schedule(self, tasks: Iterable[Task], group: str = "default") -> int:
+        """Replace ``group``'s pending work with ``tasks`` (run in order)."""
+        with self._lock:
+            gen = self._supersede(group)
+            futures = [self._pool.submit(self._run, group, gen, t) for t in tasks]
+            self._futures[group] = futures
+            self.stats["scheduled"] += len(futures)
+        return gen
+
+    def cancel(self, group: str = "default") -> None:
+        with self._lock:
+            self._supersede(group)
+
+    def _supersede(self, group: str) -> int:
+        gen = self._generation[group] = self._generation.get(group, 0) + 1
+        dropped = sum(f.cancel() for f in self._futures.pop(group, []))
+        self.stats["skipped"] += dropped
+        return gen
+
+    def _run(self, group: str, gen: int, task: Task) -> None:
+        if self._generation.get(group) != gen:  # superseded while queued
+            self._count("skipped")
+            return
+        try:
+            task()
+        except Exception:
+            self._count("failed")
+        else:
+            self._count("done")
+
+    def _count(self, what: str) -> None:
+        with self._lock:
+            self.stats[what] += 1
+
+    def wait(self, group: str = "default", timeout: Optional[float] = None) -> None:
+        """Block until ``group``'s current batch has finished (tests, CLI)."""
+        with self._lock:
+            futures = list(self._futures.get(group, []))
+        concurrent.futures.wait(futures, timeout)
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+@st.cache_resource(show_spinner=False)
+def get_prefetcher() -> Prefetcher:
+    """One prefetch pool for the whole server process."""
+    return Prefetcher()
+
+
+# ----------------------------------------------------------------------#
+# hour-picker warm-up
+# ----------------------------------------------------------------------#
+def _read_wav_head(client: RemoteVLFClient, remote_path: str, seconds: float) -> None:
+    wav = WavFile(RemoteFile(client, remote_path))
+    wav.frames(0, int(seconds * wav.info.sample_rate))
+
+
+def hour_tasks(
+    hour: datetime,
+    *,
+    lores: FrameIndex,
+    hires: FrameIndex,
+    wavs: FrameIndex,
+    before: timedelta = timedelta(0),
+    after: timedelta = timedelta(hours=1),
+    client: Optional[RemoteVLFClient] = None,
+    wav_seconds: float = REMOTE_ZOOM_SECONDS,
+) -> List[Task]:
+    """
+    What the hour-picker view loads for ``hour``, as warm-up tasks:
+    the LoRes frame (remote only: local files need no transfer), the
+    waveform shown for the hour (its envelope, or the first
+    ``wav_seconds`` of blocks when remote) and the HiRes previews of
+    ``[hour - before, hour + after)``.
+    """
+    tasks: List[Task] = []
+    lo = lores.hour(hour)
+    if lo is not None and client is not None:
+        tasks.append(functools.partial(client.fetch_image_bytes, lo["remote_path"]))
+
+    wav = wavs.window(hour, hour + timedelta(hours=1)).nearest(hour)
+    if wav is not None:
+        if client is not None:
+            tasks.append(functools.partial(
+                _read_wav_head, client, wav["remote_path"], wav_seconds))
+        else:
+            tasks.append(functools.partial(envelope_for, wav["path"]))
+
+    thumbs = Thumbnails(client)
+    for row in hires.window(hour - before, hour + after, include_end=False):
+        tasks.append(functools.partial(thumbs.make, row))
+    return tasks
+
+
+def event_tasks(
+    when: datetime,
+    *,
+    wavs: FrameIndex,
+    client: Optional[RemoteVLFClient] = None,
+    wav_seconds: float = REMOTE_ZOOM_SECONDS,
+    **sources,
+) -> List[Task]:
+    """
+    What jumping to an event at ``when`` loads: the view of its hour
+    (:func:`hour_tasks`) and the WAV holding the event itself.
+    """
+    hour = when.replace(minute=0, second=0, microsecond=0)
+    tasks = hour_tasks(hour, wavs=wavs, client=client, wav_seconds=wav_seconds,
+                       **sources)
+    wav = wavs.window(when - timedelta(hours=1), when).nearest(when)  # last one started
+    shown = wavs.window(hour, hour + timedelta(hours=1)).nearest(hour)
+    if wav is not None and (shown is None or wav["timestamp"] != shown["timestamp"]):
+        if client is not None:
+            tasks.insert(0, functools.partial(
+                _read_wav_head, client, wav["remote_path"], wav_seconds))
+        else:
+            tasks.insert(0, functools.partial(envelope_for, wav["path"]))
+    return tasks
+
+
+def prefetch_events(
+    events: Sequence[datetime],
+    *,
+    group: str,
+    prefetcher: Optional[Prefetcher] = None,
+    **sources,
+) -> int:
+    """
+    Warm the views a jump to each of ``events`` would show, strongest
+    first, superseding what ``group`` had queued. ``sources`` are passed
+    to :func:`event_tasks`. Returns the number of tasks queued.
+    """
+    prefetcher = prefetcher if prefetcher is not None else get_prefetcher()
+    tasks = [t for when in events for t in event_tasks(when, **sources)]
+    prefetcher.schedule(tasks, group=group)
+    return len(tasks)
+
+
+def prefetch_adjacent_hours(
+    hour: datetime,
+    hours: Sequence[datetime],
+    *,
+    group: str,
+    prefetcher: Optional[Prefetcher] = None,
+    **sources,
+) -> int:
+    """
+    Warm the hours after and before ``hour`` (in that order) in the
+    background, superseding what ``group`` had queued. ``sources`` are
+    passed to :func:`hour_tasks`. Returns the number of tasks queued.
+    """
+    prefetcher = prefetcher if prefetcher is not None else get_prefetcher()
+    i = hours.index(hour) if hour in hours else -1
+    neighbours = [hours[j] for j in (i + 1, i - 1) if i >= 0 and 0 <= j < len(hours)]
+    tasks = [t for h in neighbours for t in hour_tasks(h, **sources)]
+    prefetcher.schedule(tasks, group=group)
+    return len(tasks)
@@ -1,7 +1,82 @@
+from collections import deque
+from datetime import datetime
+from typing import Optional
+
 import streamlit as st
 
-def render_logs_tab(ss):
+from cache.disk import get_disk_cache
+from cache.memory import get_image_cache
+from media.remote_file import get_block_cache
+from perf.trace import Recorder, span
+from ui.data_loading import detection_store
+
+PERF_HISTORY = 20  # reruns kept per session for the JSON-lines export
+TOP_DETECTIONS = 20
+
+
+def _hit_rate(stats):
+    lookups = stats["hits"] + stats["misses"]
+    hit_rate = stats["hits"] / lookups if lookups else 0.0
+    return f"hit rate {hit_rate:.0%} ({stats['hits']}/{lookups})"
+
+
+def _usage(stats):
+    return f"{stats['bytes_stored'] / 1e6:.1f} / {stats['max_bytes'] / 1e6:.0f} MB"
+
+
+def _render_cache_stats():
+    stats = get_disk_cache().stats()
+    st.caption(
+        f"💾 File cache: {stats['entries']} files, {_usage(stats)} · "
+        f"{_hit_rate(stats)} · "
+        f"{stats['bytes_saved'] / 1e6:.1f} MB not re-downloaded"
+    )
+    images = get_image_cache().stats()
+    blocks = get_block_cache().stats()
+    st.caption(
+        f"🖼️ Decoded frames (all sessions): {images['entries']} frames, "
+        f"{_usage(images)} · {_hit_rate(images)} · "
+        f"{images['evictions']} evicted"
+    )
+    st.caption(
+        f"🧱 WAV blocks: {blocks['entries']} blocks, {_usage(blocks)} · "
+        f"{_hit_rate(blocks)}"
+    )
+
+
+def _render_top_detections(station: Optional[str], when: datetime):
+    """Strongest stored detections of the month around ``when``."""
+    month = when.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    next_month = (month.replace(year=month.year + 1, month=1) if month.month == 12
+                  else month.replace(month=month.month + 1))
+    with span("detections.top"):
+        top = detection_store().top(TOP_DETECTIONS, station, month, next_month)
+    st.markdown(f"#### 🟧 Top detections · {month:%B %Y}")
+    if not top:
+        st.caption("No stored detections this month.")
+        return
+    st.dataframe(
+        [
+            {
+                "start (UTC)": f"{d.start:%Y-%m-%d %H:%M:%S}",
+                "s": round((d.end - d.start).total_seconds(), 1),
+                "station": d.station,
+                "model": d.model,
+                "score": d.score,
+                "file": d.source,
+            }
+            for d in top
+        ],
+        use_container_width=True,
+        hide_index=True,
+    )
+
+
+def render_logs_tab(ss, station: Optional[str] = None, when: Optional[datetime] = None):
     st.subheader("📜 Runtime Logs")
+    _render_cache_stats()
+    if when is not None:
+        _render_top_detections(station, when)
     logs = ss.get("logs", [])
     if logs:
         for line in logs:
@@ -10,4 +85,60 @@ def render_logs_tab(ss):
                      else "red")
             st.markdown(f"<span style='color:{color}'>{line}</span>", unsafe_allow_html=True)
     else:
-        st.info("No log entries yet.")
\ No newline at end of file
+        st.info("No log entries yet.")
+
+
+def render_performance(ss, rec: Optional[Recorder]):
+    """Spans of this rerun (when recording) and the JSON-lines export."""
+    st.markdown("#### ⏱️ Performance")
+    st.toggle("Record timings of each rerun", key="perf_enabled",
+              help="Takes effect from the next rerun.")
+    if rec is None:
+        st.caption("Not recording.")
+        return
+
+    runs = ss.setdefault("perf_runs", deque(maxlen=PERF_HISTORY))
+    runs.append(rec)
+    st.caption(f"Rerun took {rec.duration * 1e3:.0f} ms · {len(rec.spans)} spans")
+
+    totals = sorted(rec.totals().items(), key=lambda kv: -kv[1]["total"])
+    st.dataframe(
+        [
+            {
+                "span": name,
+                "calls": int(t["calls"]),
+                "total ms": round(t["total"] * 1e3, 1),
+                "max ms": round(t["max"] * 1e3, 1),
+                "% of rerun": round(100 * t["total"] / rec.duration, 1),
+            }
+            for name, t in totals
+        ],
+        use_container_width=True,
+        hide_index=True,
+    )
+    if rec.counters:
+        st.caption(" · ".join(f"{k}: {v:,.0f}" for k, v in rec.counters.items()))
+
+    with st.expander("Timeline"):
+        st.dataframe(
+            [
+                {
+                    "start ms": round(s.start * 1e3, 1),
+                    "ms": round(s.duration * 1e3, 1),
+                    "span": "  " * s.depth + s.name,
+                    "thread": s.thread,
+                    "attrs": ", ".join(f"{k}={v}" for k, v in s.attrs.items()),
+                }
+                for s in sorted(rec.spans, key=lambda s: s.start)
+            ],
+            use_container_width=True,
+            hide_index=True,
+        )
+
+    st.download_button(
+        f"Download last {len(runs)} reruns (JSON lines)",
+        data="".join(r.to_jsonl() for r in runs),
+        file_name="cassandra-perf.jsonl",
+        mime="application/x-ndjson",
+        key="perf_download",
+    )
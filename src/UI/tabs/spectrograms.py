@@ -1,26 +1,334 @@
 # ── src/ui/tabs/spectrograms.py ─────────────────────────────────────────
 from __future__ import annotations
 
+import functools
 import io
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, Optional
 
+import numpy as np
 import streamlit as st
 import plotly.express as px
+import plotly.graph_objects as go
 from PIL import Image
 
+from cache.disk import local_key
+from cache.memory import get_image_cache
+from media.spectrogram import LocalWavs, RemoteWavs, TileStore
+from media.thumbnails import SIZES, Thumbnails, render_pool
+from parser.frame_index import FrameIndex
+from perf.trace import span, traced
 from ssh.fetcher_remote import RemoteVLFClient   # ➜ remote streaming support
+from ui.controls import jump_to
+from ui.data_loading import compare_stations, detection_store
+from ui.prefetch import prefetch_events
 
 
 # ───────── helpers ────────────────────────────────────────────────────
+@traced("image.decode")
+def _decode(src) -> Image.Image:
+    img = Image.open(src)
+    img.load()
+    return img
+
+
+@traced("ui.load_image")
 def _load_pillow(img_meta: Dict,
                  is_remote: bool,
                  client: Optional[RemoteVLFClient]) -> Image.Image:
-    """Return a Pillow image – stream via SSH if `is_remote`."""
+    """Return a Pillow image – stream via SSH if `is_remote`.
+
+    Decoded frames are shared by every session through the process-wide
+    image cache (keyed by file version), so a frame is decoded once
+    however many operators are looking at it.
+    """
     if is_remote and client:
-        raw = client.fetch_image_bytes(img_meta["remote_path"])
-        return Image.open(io.BytesIO(raw))
-    return Image.open(img_meta["full_path"])
+        path = img_meta["remote_path"]
+        key = client.version_key(path)
+
+        def load() -> Image.Image:
+            return _decode(io.BytesIO(client.fetch_image_bytes(path)))
+    else:
+        path = img_meta["full_path"]
+        key = local_key(path)
+
+        def load() -> Image.Image:
+            return _decode(path)
+    return get_image_cache().get_or_compute(("frame", key), load)
+
+
+PAGE_SIZES = (8, 16, 32, 64)
+WARM_EVENTS = 3  # strongest events of the timeline kept warm for a jump
+
+
+@st.cache_resource(show_spinner=False)
+def _thumbnails(_client: Optional[RemoteVLFClient], station: str) -> Thumbnails:
+    return Thumbnails(_client)
+
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def _tile_store(_wavs: FrameIndex,
+                _client: Optional[RemoteVLFClient],
+                station: Optional[str],
+                is_remote: bool) -> TileStore:
+    """One tile store per station: its stats and file versions outlive reruns."""
+    source = RemoteWavs(_client) if is_remote and _client else LocalWavs()
+    return TileStore(_wavs, source)
+
+
+@st.cache_resource(show_spinner=False)
+def _render_pool() -> ProcessPoolExecutor:
+    """Worker processes for the previews of the page being shown."""
+    return render_pool()
+
+
+@st.cache_resource(show_spinner=False)
+def _preview_worker() -> Dict:
+    """One background thread making previews for pages not shown yet."""
+    return {"pool": ThreadPoolExecutor(1, thread_name_prefix="previews"),
+            "pending": {},
+            "lock": threading.Lock()}
+
+
+def _make_previews(thumbs: Thumbnails, frames: FrameIndex) -> None:
+    """Previews of ``frames`` one at a time, in this process."""
+    for row in frames:
+        try:
+            thumbs.make(row)
+        except Exception:  # unreadable or unreachable frame: shown as such later
+            continue
+
+
+def _warm_previews(thumbs: Thumbnails, station: str, frames: FrameIndex) -> None:
+    """Queue the previews of ``frames`` once (skipped while already queued)."""
+    if not len(frames):
+        return
+    worker = _preview_worker()
+    key = (station, frames[0]["original_filename"], len(frames))
+    pending = worker["pending"]
+    # shared by every session: reruns of two sessions may race here
+    with worker["lock"]:
+        if key in pending and not pending[key].done():
+            return
+        for k in [k for k, f in pending.items() if f.done()]:
+            del pending[k]
+        pending[key] = worker["pool"].submit(_make_previews, thumbs, frames)
+
+
+def _turn_page(step: int) -> None:
+    page = st.session_state.get("hires_page", 0) + step
+    st.session_state["hires_page"] = max(0, page)
+
+
+@st.fragment
+def _render_hires_grid(frames: FrameIndex,
+                       is_remote: bool,
+                       client: Optional[RemoteVLFClient]) -> None:
+    """
+    One page of cached previews at a time; the full frame only for the
+    expanded cell. Paging reruns just this fragment, and previews of the
+    other pages are made in the background.
+    """
+    client = client if is_remote else None
+    station = client.station if client else ""
+    thumbs = _thumbnails(client, station)
+
+    c_size, c_wide = st.columns([1, 3])
+    per_page = c_size.selectbox("Frames per page", PAGE_SIZES, index=1,
+                                key="hires_page_size")
+    wide = c_wide.toggle("Larger previews", key="hires_wide")
+    n_cols, edge = (2, SIZES[1]) if wide else (4, SIZES[0])
+
+    n_pages = max(1, -(-len(frames) // per_page))
+    page = st.session_state["hires_page"] = min(
+        st.session_state.get("hires_page", 0), n_pages - 1)
+    if n_pages > 1:
+        c_prev, c_info, c_next = st.columns([1, 2, 1])
+        c_prev.button("◀ Previous", key="hires_prev", disabled=page == 0,
+                      on_click=_turn_page, args=(-1,))
+        c_next.button("Next ▶", key="hires_next", disabled=page == n_pages - 1,
+                      on_click=_turn_page, args=(1,))
+        c_info.caption(f"Page {page + 1} / {n_pages} · {len(frames)} frames")
+
+    shown = frames[page * per_page:(page + 1) * per_page]
+    missing = thumbs.missing(shown)
+    if len(missing) > n_cols:
+        with st.spinner(f"Making previews for {len(missing)} frames…"), \
+                span("thumbnails.generate", frames=len(missing)):
+            thumbs.generate(missing, _render_pool())
+    _warm_previews(thumbs, station, frames[(page + 1) * per_page:])
+    _warm_previews(thumbs, station, frames[:page * per_page])
+
+    expanded = st.session_state.get("hires_expanded")
+    cols = st.columns(n_cols)
+    for idx, img in enumerate(shown):
+        with cols[idx % n_cols]:
+            try:
+                with span("ui.preview"):
+                    st.image(thumbs.thumbnail(img, edge), use_container_width=True)
+            except Exception as exc:  # unreadable or unreachable frame
+                st.warning(f"{img['original_filename']}: {exc}")
+                continue
+            c_time, c_btn = st.columns([3, 1])
+            c_time.caption(img["timestamp"].strftime("%H:%M:%S"))
+            name = img["original_filename"]
+            if c_btn.button("🔍", key=f"hires_zoom_{name}",
+                            help="Show at full resolution"):
+                expanded = st.session_state["hires_expanded"] = name
+
+    frame = next((f for f in shown if f["original_filename"] == expanded), None)
+    if frame is not None:
+        st.markdown(f"**{frame['original_filename']}**")
+        pil = _load_pillow(frame, is_remote, client)
+        with span("plotly.figure", view="hires"):
+            st.plotly_chart(_plotly_img(pil), use_container_width=True)
+        st.button("Close", key="hires_close",
+                  on_click=lambda: st.session_state.pop("hires_expanded", None))
+
+
+def _render_station_comparison(when: datetime) -> None:
+    """Nearest HiRes frame from every remote station, side by side."""
+    with st.spinner("Fetching from every station…"):
+        results = compare_stations(when)
+    cols = st.columns(max(1, len(results)))
+    for col, (station, res) in zip(cols, results.items()):
+        with col:
+            st.markdown(f"**{station}**")
+            if isinstance(res, BaseException):
+                st.warning(f"Unavailable: {res}")
+            elif res is None:
+                st.info("No frame near this time.")
+            elif res[1].error is not None:
+                st.warning(f"Fetch failed: {res[1].error}")
+            else:
+                frame, fetched = res
+                st.plotly_chart(_plotly_img(Image.open(io.BytesIO(fetched.data))),
+                                use_container_width=True)
+                st.caption(f"{frame['timestamp']:%H:%M:%S} · "
+                           f"{fetched.latency:.2f}s")
+
+
+def _render_computed_spectrogram(wavs: FrameIndex,
+                                 start: datetime,
+                                 end: datetime,
+                                 is_remote: bool,
+                                 client: Optional[RemoteVLFClient],
+                                 station: Optional[str] = None) -> None:
+    """STFT of the WAVs in [start, end) from cached multi-level tiles."""
+    store = _tile_store(wavs, client, station, is_remote)
+    # a new index (the catalog changed) makes the store look versions up again
+    store.use(wavs)
+
+    if not is_remote and st.button("Precompute this window on all cores",
+                                   key="spec_precompute"):
+        with st.spinner("Computing spectrograms…"):
+            n = store.precompute(start, end)
+        st.caption(f"{n} recordings ready.")
+
+    with st.spinner("Loading tiles…"), span("spectrogram.window"):
+        times, values = store.window(start, end)
+    z = values.astype(np.float32).T
+    if not z.size or np.isnan(z).all():
+        st.info("No audio in this window.")
+        return
+
+    # ≤ 256 frequency rows on screen (max-pooled pairs)
+    f_khz = store.freqs() / 1e3
+    rows = (len(f_khz) - 1) // 2 * 2
+    z = np.fmax(z[:rows:2], z[1:rows:2])
+    f_khz = f_khz[:rows:2]
+
+    with span("plotly.figure", view="spectrogram", cells=z.size):
+        fig = go.Figure(go.Heatmap(
+            x=times, y=f_khz, z=z, colorscale="Viridis",
+            zmin=float(np.nanpercentile(z, 5)), zmax=float(np.nanpercentile(z, 99.5)),
+            colorbar=dict(title="dB"),
+        ))
+        fig.update_layout(height=320, margin=dict(l=0, r=0, t=10, b=30),
+                          yaxis_title="kHz")
+        st.plotly_chart(fig, use_container_width=True)
+    st.caption(f"{len(times)} columns · tiles: {store.stats['memory']} memory, "
+               f"{store.stats['disk']} disk, {store.stats['computed']} computed")
+
+
+def _jump_to_bin(station: Optional[str],
+                 bins: list,
+                 width: timedelta,
+                 key: str) -> None:
+    """Timeline click: show the strongest event of the clicked bin."""
+    points = st.session_state[key]["selection"]["points"]
+    if not points:
+        return
+    b0 = bins[points[0]["point_index"]]
+    top = detection_store().top(1, station, b0, b0 + width)
+    if top:
+        ss = st.session_state
+        lo, hi = ss.get("range_slider", (b0, b0 + timedelta(hours=1)))
+        jump_to(top[0].start, hi - lo)
+
+
+def _render_detection_timeline(station: Optional[str],
+                               when: datetime,
+                               sources: Dict,
+                               client: Optional[RemoteVLFClient]) -> None:
+    """
+    Detections per hour of the day or per day of the month, drawn from
+    the store's pre-aggregated bins; clicking a bar jumps to its
+    strongest event. The strongest events are warmed in the background
+    so a jump to them renders from cache.
+    """
+    c_title, c_width = st.columns([3, 1])
+    per = c_width.radio("Detections per", ["hour", "day"], horizontal=True,
+                        key="det_timeline_per", label_visibility="collapsed")
+    day = when.replace(hour=0, minute=0, second=0, microsecond=0)
+    if per == "hour":
+        start, end, width = day, day + timedelta(days=1), timedelta(hours=1)
+    else:
+        start = day.replace(day=1)
+        end = (start + timedelta(days=32)).replace(day=1)
+        width = timedelta(days=1)
+
+    store = detection_store()
+    with span("detections.bins"):
+        bins = store.bins(per, station, start, end)
+    label = f"{start:%Y-%m-%d}" if per == "hour" else f"{start:%B %Y}"
+    if not bins:
+        c_title.caption(f"🟧 No stored detections · {label}")
+        return
+    times, counts, best = zip(*bins)
+    c_title.caption(f"🟧 {sum(counts)} detections · {label} · "
+                    "click a bar to jump to its strongest event")
+
+    with span("plotly.figure", view="detections", bins=len(bins)):
+        fig = go.Figure(go.Bar(
+            x=[t + width / 2 for t in times], y=counts,
+            width=width.total_seconds() * 1e3 * 0.9,
+            marker=dict(color=best, colorscale="YlOrRd", cmin=0, cmax=1),
+            customdata=best,
+            hovertemplate=("%{x}<br>%{y} detection(s), "
+                           "best %{customdata:.2f}<extra></extra>"),
+        ))
+        lo, hi = st.session_state.get("range_slider",
+                                      (when, when + timedelta(hours=1)))
+        fig.add_vrect(x0=when, x1=when + (hi - lo), fillcolor="royalblue",
+                      opacity=0.15, line_width=0)
+        fig.update_layout(height=120, margin=dict(l=0, r=0, t=0, b=20),
+                          xaxis=dict(range=[start, end]),
+                          yaxis=dict(showticklabels=False), bargap=0)
+        key = "det_timeline"
+        st.plotly_chart(fig, use_container_width=True, key=key,
+                        on_select=functools.partial(_jump_to_bin, station, list(times),
+                                                    width, key),
+                        selection_mode="points")
+
+    # Streamlit has no hover events: warm the likeliest jumps instead
+    group = st.session_state.setdefault("prefetch_group", uuid.uuid4().hex)
+    top = store.top(WARM_EVENTS, station, start, end)
+    prefetch_events([d.start for d in top], group=f"{group}/events",
+                    client=client, **sources)
 
 
 def _plotly_img(pil_img: Image.Image):
@@ -35,24 +343,35 @@ def _plotly_img(pil_img: Image.Image):
 # ───────── public tab renderer ────────────────────────────────────────
 def render_spectrograms_tab(
     *,
-    low_res_images:  List[Dict],
-    high_res_images: List[Dict],
+    low_res_images:  FrameIndex,
+    high_res_images: FrameIndex,
     control_mode:    str,              # "Use slider" | "Use hour picker"
     window_start:    datetime,
     window_end:      datetime,
     session_state:   Dict,             # st.session_state
     is_remote:       bool = False,
     client:          Optional[RemoteVLFClient] = None,
+    wavs:            Optional[FrameIndex] = None,
+    station:         Optional[str] = None,
 ) -> None:
     """Compact Spectrograms tab - local & SSH aware."""
     # st.subheader("📊 Spectrograms")
 
+    # ── Detections timeline ─────────────────────────────────────────
+    _render_detection_timeline(
+        station, window_start,
+        dict(lores=low_res_images, hires=high_res_images,
+             wavs=wavs if wavs is not None else FrameIndex.from_records([]),
+             before=timedelta(minutes=int(session_state.get("mins_before", 0))),
+             after=timedelta(minutes=int(session_state.get("mins_after", 60)))),
+        client if is_remote else None,
+    )
+
     # ── LoRes section ───────────────────────────────────────────────
     if control_mode == "Use slider":
-        lo_sel = [img for img in low_res_images
-                  if window_start <= img["timestamp"] <= window_end]
+        lo_sel = low_res_images.window(window_start, window_end)
         st.write(f"LoRes frames: {len(lo_sel)}")
-        for img in sorted(lo_sel, key=lambda x: x["timestamp"]):
+        for img in lo_sel:
             pil = _load_pillow(img, is_remote, client)
             st.image(pil,
                      caption=img["timestamp"].strftime("%H:%M"),
@@ -60,12 +379,7 @@ def render_spectrograms_tab(
 
     else:  # hour picker → single frame
         target_hour = session_state["lores_hour"]
-        img = next(
-            (im for im in low_res_images
-             if im["timestamp"].replace(minute=0, second=0, microsecond=0)
-                == target_hour),
-            None
-        )
+        img = low_res_images.hour(target_hour)
         if img:
             pil = _load_pillow(img, is_remote, client)
             st.image(pil,
@@ -90,20 +404,24 @@ def render_spectrograms_tab(
     else:
         hi_start, hi_end = window_start, window_end
 
-    hi_sel = sorted(
-        [img for img in high_res_images
-         if hi_start <= img["timestamp"] < hi_end],
-        key=lambda x: x["timestamp"]
-    )
+    hi_sel = high_res_images.window(hi_start, hi_end, include_end=False)
     st.write(f"HiRes frames: {len(hi_sel)} "
              f"({hi_start:%H:%M}-{hi_end:%H:%M})")
 
     if hi_sel:
-        cols = st.columns(4)
-        for idx, img in enumerate(hi_sel):
-            with cols[idx % 4]:
-                pil = _load_pillow(img, is_remote, client)
-                st.plotly_chart(_plotly_img(pil), use_container_width=True)
-                st.caption(img["timestamp"].strftime("%H:%M:%S"))
+        _render_hires_grid(hi_sel, is_remote, client)
     else:
-        st.info("No HiRes frames in this interval.")
\ No newline at end of file
+        st.info("No HiRes frames in this interval.")
+
+    # ── Spectrogram computed from the WAVs ──────────────────────────
+    if wavs:
+        with st.expander("🧮 Spectrogram computed from WAV audio"):
+            if st.toggle("Compute for this window", key="computed_spectrogram"):
+                _render_computed_spectrogram(wavs, hi_start, hi_end,
+                                             is_remote, client, station)
+
+    # ── Station comparison ──────────────────────────────────────────
+    with st.expander("🛰️ Compare stations at this time"):
+        st.caption(f"Nearest HiRes frame to {hi_start:%Y-%m-%d %H:%M} UTC")
+        if st.toggle("Fetch from every station", key="compare_stations"):
+            _render_station_comparison(hi_start)
@@ -2,48 +2,94 @@
 
 from __future__ import annotations
 
-import io
-from datetime import datetime, timezone
-from typing import Dict, List, Optional
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, Union
 
 import numpy as np
 import plotly.graph_objects as go
 import streamlit as st
-from scipy.io import wavfile
-
-from ui.viewer_utils   import closest_match
+from plotly.subplots import make_subplots
+
+from cache.disk import local_key
+from inference.models import MODELS, Model, load_model
+from inference.pipeline import InferencePipeline, WavJob
+from media.envelope import lod_points
+from media.features import DEFAULT as FEATURES, band_energies, features_for, frame_times
+from media.remote_file import RemoteFile
+from media.wav import MappedWav, WavFile, open_local
+from parser.frame_index import FrameIndex
+from perf.trace import span, traced
 from ssh.fetcher_remote import RemoteVLFClient
+from ui.data_loading import detection_store
+
+REMOTE_ZOOM_SECONDS = 10.0  # initial zoom of remote files (read in blocks)
+MAX_COLUMNS = 2000          # heatmap columns drawn for the band overlay
 
 
-def _load_wav(
+@traced("ui.open_wav")
+def _open_wav(
     meta: Dict,
     *,
     is_remote: bool,
     client: Optional[RemoteVLFClient],
-) -> tuple[np.ndarray, int]:
+) -> Union[WavFile, MappedWav]:
     """
-    Return (signal, sample_rate) for the given WAV metadata, fetching
-    over SSH when needed.
+    Frame reader for the given WAV metadata. Remote files are read in
+    cached blocks over SFTP, so only the header and the samples actually
+    shown cross the network; local files are memory-mapped and shared
+    across reruns and sessions.
     """
     if is_remote and client:
-        raw = client.fetch_wav_bytes(meta["remote_path"])
-        data, sr = wavfile.read(io.BytesIO(raw))
+        return WavFile(RemoteFile(client, meta["remote_path"]))
+    return open_local(meta["path"])
+
+
+def _band_view(wav: Union[WavFile, MappedWav], f0: int, f1: int):
+    """
+    Band energies over frames ``[f0, f1)`` as ``(times, (bands, columns))``.
+    Local files slice the per-file feature cache the models also read;
+    remote files compute the zoomed segment only. Long views are
+    max-pooled down to ``MAX_COLUMNS`` columns so short events stay visible.
+    """
+    sr = wav.info.sample_rate
+    if isinstance(wav, MappedWav):
+        hop = FEATURES.hop(sr)
+        i0, i1 = f0 // hop, max(f0 // hop, (f1 - FEATURES.frame(sr)) // hop + 1)
+        feats = np.asarray(features_for(wav.path)[i0:i1])
+        times = frame_times(i1, sr)[i0:i0 + len(feats)]
     else:
-        sr, data = wavfile.read(meta["path"])
-    return data, sr
+        feats = band_energies(wav.frames(f0, f1), sr)
+        times = f0 / sr + frame_times(len(feats), sr)
+    step = -(-len(feats) // MAX_COLUMNS)
+    if step > 1:
+        n = len(feats) // step * step
+        feats = feats[:n].reshape(-1, step, feats.shape[1]).max(axis=1)
+        times = times[:n:step]
+    return times, feats.T
+
+
+@st.cache_resource(show_spinner=False)
+def _model(name: str) -> Model:
+    return load_model(name)
 
 
 # ─────────────────────────────────────────────────────────────────────
 def render_waveform_tab(
-    wavs:        List[Dict],
+    wavs:        FrameIndex,
     rng_start,
     rng_end,
     ss,
     *,
     is_remote: bool = False,
     client:    Optional[RemoteVLFClient] = None,
+    station:   Optional[str] = None,
 ) -> None:
-    """Waveform + AI tab (local **and** remote)."""
+    """
+    Waveform + AI tab (local **and** remote). ``station`` is the sidebar
+    station: detections are stored and looked up under that key, as the
+    inference service does, whatever the file-name prefix.
+    """
+    station = station or None
 
     st.subheader("🔊 Waveform + AI Inference")
 
@@ -52,10 +98,10 @@ def render_waveform_tab(
         rng_start = rng_start.replace(tzinfo=timezone.utc)
         rng_end   = rng_end.replace(tzinfo=timezone.utc)
 
-    window = [w for w in wavs if rng_start <= w["timestamp"] <= rng_end]
+    window = wavs.window(rng_start, rng_end)
 
     wav_file = (
-        closest_match(window, rng_start)
+        window.nearest(rng_start)
         if window
         else (wavs[0] if wavs else None)
     )
@@ -63,36 +109,118 @@ def render_waveform_tab(
     if wav_file:
         st.markdown(f"**File:** `{wav_file['filename']}`")
 
-        signal, sr = _load_wav(wav_file, is_remote=is_remote, client=client)
-        t_axis = np.arange(len(signal)) / sr
-
-        fig = go.Figure(go.Scatter(x=t_axis, y=signal, line=dict(width=1)))
-        fig.update_layout(
-            height=300,
-            margin=dict(l=0, r=0, t=10, b=40),
-            xaxis_title="Time (s)",
-            yaxis_title="Amplitude",
-        )
-        st.plotly_chart(fig, use_container_width=True)
-
-        if is_remote and client:          # play from bytes
-            st.audio(io.BytesIO(client.fetch_wav_bytes(wav_file["remote_path"])))
+        wav = _open_wav(wav_file, is_remote=is_remote, client=client)
+        sr, duration = wav.info.sample_rate, wav.info.duration
+        # local files draw from the envelope pyramid: open on the whole file
+        if isinstance(wav, MappedWav):
+            zoom = duration
         else:
-            st.audio(wav_file["path"])
+            zoom = min(duration, REMOTE_ZOOM_SECONDS)
+        z0, z1 = st.slider(
+            "Zoom (s)",
+            min_value=0.0,
+            max_value=max(duration, 0.1),
+            value=(0.0, zoom),
+            step=0.1,
+            key=f"wav_zoom_{wav_file['filename']}",
+        )
+        show_bands = st.checkbox(
+            "Band energies", key="wav_bands",
+            help="Log band power per frame: the features the models see.",
+        )
+        f0, f1 = int(z0 * sr), int(z1 * sr)
+        # ≤ ~2000 points whatever the zoom, refined as the window narrows
+        with span("waveform.points"):
+            x, y = lod_points(wav, f0, f1)
+        if isinstance(wav, WavFile):
+            f = wav.file
+            st.caption(
+                f"Read {f.transferred / 1e3:.0f} kB of "
+                f"{f.size / 1e6:.1f} MB over SSH"
+            )
+        if show_bands:
+            with span("waveform.features"):
+                times, bands = _band_view(wav, f0, f1)
+        t_file = wav_file["timestamp"]
+        with span("detections.query"):
+            stored = detection_store().detections(
+                station, t_file, t_file + timedelta(seconds=duration)
+            )
+        with span("plotly.figure", view="waveform", points=len(x)):
+            trace = go.Scatter(x=x / sr, y=y, line=dict(width=1))
+            if show_bands:
+                fig = make_subplots(rows=2, cols=1, shared_xaxes=True,
+                                    vertical_spacing=0.04, row_heights=[0.55, 0.45])
+                fig.add_trace(trace, row=1, col=1)
+                fig.add_trace(
+                    go.Heatmap(
+                        x=times, y=FEATURES.labels(), z=bands,
+                        colorscale="Viridis", showscale=False,
+                        hovertemplate="%{x:.2f} s · %{y}: %{z:.1f}<extra></extra>",
+                    ),
+                    row=2, col=1,
+                )
+                fig.update_yaxes(title_text="Amplitude", row=1, col=1)
+                fig.update_xaxes(title_text="Time (s)", row=2, col=1)
+                fig.update_layout(height=520, margin=dict(l=0, r=0, t=10, b=40),
+                                  showlegend=False)
+            else:
+                fig = go.Figure(trace)
+                fig.update_layout(
+                    height=300,
+                    margin=dict(l=0, r=0, t=10, b=40),
+                    xaxis_title="Time (s)",
+                    yaxis_title="Amplitude",
+                )
+            for d in stored:
+                fig.add_vrect(
+                    x0=(d.start - t_file).total_seconds(),
+                    x1=(d.end - t_file).total_seconds(),
+                    fillcolor="orange", opacity=0.2 + 0.3 * d.score, line_width=0,
+                    **({"row": "all", "col": 1} if show_bands else {}),
+                )
+            st.plotly_chart(fig, use_container_width=True)
+        if stored:
+            models = sorted({d.model for d in stored})
+            st.caption(f"🟧 {len(stored)} stored detection(s) · {', '.join(models)}")
+
+        # play the zoomed segment: no second fetch of the whole file
+        signal = wav.frames(f0, f1)
+        if len(signal):
+            st.audio(signal.T if signal.ndim > 1 else signal, sample_rate=sr)
     else:
+        wav = None
         st.info("No .wav files in this window.")
 
-    # ── AI-stub (unchanged) ─────────────────────────────────────────
+    # ── AI inference ────────────────────────────────────────────────
     st.divider()
-    st.subheader("🤖 AI Inference (stub)")
-    model = st.selectbox("Model", ["1-D CNN", "Simple RNN", "Transformer"])
-    if st.button("Run Inference"):
+    st.subheader("🤖 AI Inference")
+    if "inference_result" in ss:
+        st.success(ss.pop("inference_result"))
+    model_name = st.selectbox("Model", list(MODELS))
+    if st.button("Run Inference", disabled=not wav_file):
+        model = _model(model_name)
+        if is_remote and client:
+            path = wav_file["remote_path"]
+            version = client.version_key(path)
+        else:
+            path = wav_file["path"]
+            version = local_key(path)
+        job = WavJob(station or wav_file.get("station", ""), wav_file["timestamp"],
+                     wav_file["filename"], path, version)
+        # the reader already open for the plot: remote files are read once
+        pipeline = InferencePipeline(model, detection_store(), opener=lambda _: wav)
+        with st.spinner(f"Running {model_name}…"):
+            with span("inference.file", model=model_name):
+                found = pipeline.run([job])
         now = datetime.utcnow().strftime("%H:%M:%S UTC")
-        st.success("Inference complete (mock). See Logs.")
         ss.setdefault("logs", []).extend(
-            [
-                f"🟢 {now} — Started {model}",
-                "🟡 00:00:01 — No peaks found (stub)",
-                "🟢 00:00:02 — Finished (stub)",
+            [f"🟢 {now} — {model_name} on {job.source}: {len(found)} detection(s)"]
+            + [
+                f"🟡 {d.start:%H:%M:%S}–{d.end:%H:%M:%S} — score {d.score:.2f}"
+                for d in found
             ]
-        )
\ No newline at end of file
+        )
+        # rerun so the plot above shows the new detections
+        ss["inference_result"] = f"{len(found)} detection(s) in {job.source}. See Logs."
+        st.rerun()
@@ -6,8 +6,8 @@ from typing import Dict, List
 import numpy as np
 import plotly.graph_objects as go
 import streamlit as st
-from scipy.io import wavfile
 
+from media.wav import open_local
 from ui.viewer_utils import closest_match, generate_timeline
 
 # ───────── Page config ─────────
@@ -259,7 +259,8 @@ with tab_wav:
 
     if wav_file:
         st.markdown(f"**Waveform:** {wav_file['filename']}")
-        sr, data = wavfile.read(wav_file["path"])
+        mapped = open_local(wav_file["path"])  # zero-copy, shared pages
+        sr, data = mapped.info.sample_rate, mapped.samples
         t_axis = np.arange(len(data)) / sr
 
         # if st.checkbox("Interactive zoom", True):
@@ -1,7 +1,9 @@
 # viewer_utils.py
 
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Union
+
+from parser.frame_index import FrameIndex
 
 
 def generate_timeline(
@@ -18,12 +20,18 @@ def generate_timeline(
     return [start_dt + timedelta(minutes=step_minutes * i) for i in range(count)]
 
 
-def closest_match(images: List[Dict], target_dt: datetime) -> Optional[Dict]:
+def closest_match(
+    images: Union[List[Dict], FrameIndex], target_dt: datetime
+) -> Optional[Dict]:
     """
     Given a list of dicts each with a 'timestamp' key (a datetime),
     return the dict whose timestamp is nearest to target_dt.
     Returns None if images is empty.
+
+    A :class:`FrameIndex` is answered by bisection instead of a scan.
     """
+    if isinstance(images, FrameIndex):
+        return images.nearest(target_dt)
     if not images:
         return None
     return min(images, key=lambda img: abs(img["timestamp"] - target_dt))
@@ -0,0 +1,180 @@
+# src/cache/disk.py
+
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+DEFAULT_MAX_BYTES = 2 * 1024**3  # 2 GiB
+
+
+def cache_dir(*parts: str) -> str:
+    """
+    ``$CASSANDRA_CACHE_DIR/<parts>`` (default ``~/.cache/cassandra``),
+    created on first use.
+    """
+    root = os.path.expanduser(
+        os.getenv("CASSANDRA_CACHE_DIR", "~/.cache/cassandra")
+    )
+    path = os.path.join(root, *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def file_key(station: str, remote_path: str, size: int, mtime: int) -> str:
+    """Cache key for one version of a remote file."""
+    raw = f"{station}\0{remote_path}\0{int(size)}\0{int(mtime)}"
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def local_key(path: str) -> str:
+    """Cache key for the current version of a local file."""
+    path = os.path.abspath(path)
+    st = os.stat(path)
+    return file_key("", path, st.st_size, st.st_mtime_ns)
+
+
+class DiskCache:
+    """
+    Read-through byte cache on local disk with an LRU byte budget.
+
+    Entries are files named by their key (``ab/abcdef…``). Writes go to a
+    temporary file that is renamed into place, so readers never see a
+    partial entry. Recency survives restarts through the file mtimes,
+    which are bumped on every hit.
+    """
+
+    def __init__(self, root: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self._root = root
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._lru: "OrderedDict[str, int]" = OrderedDict()  # key → size
+        self._bytes = 0
+        self._hits = self._misses = self._saved = self._evictions = 0
+        os.makedirs(root, exist_ok=True)
+        self._load()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self._root, key[:2], key)
+
+    def _load(self) -> None:
+        found = []
+        for sub in os.listdir(self._root):
+            d = os.path.join(self._root, sub)
+            if not os.path.isdir(d):
+                continue
+            for key in os.listdir(d):
+                if key.startswith("."):
+                    continue  # leftover temp file
+                st = os.stat(os.path.join(d, key))
+                found.append((st.st_mtime, key, st.st_size))
+        for _, key, size in sorted(found):
+            self._lru[key] = size
+            self._bytes += size
+        self._evict()
+
+    # ------------------------------------------------------------------#
+    # read / write
+    # ------------------------------------------------------------------#
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            size = self._lru.get(key)
+            if size is None:
+                self._misses += 1
+                return None
+            self._lru.move_to_end(key)
+        try:
+            with open(self._path(key), "rb") as f:
+                data = f.read()
+            os.utime(self._path(key))
+        except FileNotFoundError:
+            with self._lock:
+                if self._lru.pop(key, None) is not None:
+                    self._bytes -= size
+                self._misses += 1
+            return None
+        with self._lock:
+            self._hits += 1
+            self._saved += len(data)
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        if len(data) > self._max_bytes:
+            return
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=".", dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        with self._lock:
+            old = self._lru.pop(key, None)
+            self._bytes += len(data) - (old or 0)
+            self._lru[key] = len(data)
+        self._evict()
+
+    def get_or_fetch(self, key: str, fetch: Callable[[], bytes]) -> bytes:
+        data = self.get(key)
+        if data is None:
+            data = fetch()
+            self.put(key, data)
+        return data
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._lru
+
+    # ------------------------------------------------------------------#
+    # eviction / stats
+    # ------------------------------------------------------------------#
+    def _evict(self) -> None:
+        victims = []
+        with self._lock:
+            while self._bytes > self._max_bytes and self._lru:
+                key, size = self._lru.popitem(last=False)
+                self._bytes -= size
+                self._evictions += 1
+                victims.append(key)
+        for key in victims:
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "bytes_saved": self._saved,
+                "bytes_stored": self._bytes,
+                "entries": len(self._lru),
+                "evictions": self._evictions,
+                "max_bytes": self._max_bytes,
+            }
+
+
+_CACHE: Optional[DiskCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_disk_cache() -> DiskCache:
+    """
+    Process-wide cache for remote files under ``cache_dir("files")``;
+    budget from ``$CASSANDRA_CACHE_BYTES``.
+    """
+    global _CACHE
+    with _CACHE_LOCK:
+        if _CACHE is None:
+            max_bytes = int(os.getenv("CASSANDRA_CACHE_BYTES", DEFAULT_MAX_BYTES))
+            _CACHE = DiskCache(cache_dir("files"), max_bytes=max_bytes)
+        return _CACHE
@@ -0,0 +1,144 @@
+# src/cache/memory.py
+
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+import numpy as np
+
+DEFAULT_IMAGE_CACHE_BYTES = 256 * 1024**2
+
+
+def sizeof(value: Any) -> int:
+    """Bytes held by a cached value (payload only, not Python overhead)."""
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return len(value)
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if hasattr(value, "getbands") and hasattr(value, "size"):  # PIL image
+        w, h = value.size
+        return w * h * len(value.getbands())
+    if isinstance(value, tuple):
+        return sum(sizeof(v) for v in value)
+    raise TypeError(f"no size for {type(value).__name__}")
+
+
+class MemoryCache:
+    """
+    Thread-safe in-process LRU with a byte budget.
+
+    Every entry is accounted by its payload size (:func:`sizeof` unless
+    given); least recently used entries are evicted until the total fits
+    ``max_bytes``, and an entry larger than the budget is not kept.
+    :meth:`get_or_compute` lets one thread compute a missing entry while
+    others asking for the same key wait for it, so concurrent sessions
+    never decode the same payload twice.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        *,
+        sizer: Callable[[Any], int] = sizeof,
+    ):
+        self._max_bytes = max_bytes
+        self._sizer = sizer
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+        self._inflight: Dict[Hashable, threading.Lock] = {}
+        self._bytes = 0
+        self.hits = self.misses = self.evictions = 0
+
+    def _lookup(self, key: Hashable) -> Optional[Tuple[Any, int]]:
+        """Entry for ``key`` with hit/miss accounting (lock held)."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._lookup(key)
+        return None if entry is None else entry[0]
+
+    def put(self, key: Hashable, value: Any, size: Optional[int] = None) -> None:
+        size = self._sizer(value) if size is None else size
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            if size > self._max_bytes:
+                return
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while self._bytes > self._max_bytes:
+                _, (_, victim) = self._entries.popitem(last=False)
+                self._bytes -= victim
+                self.evictions += 1
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                return self._lookup(key)[0]
+            gate = self._inflight.setdefault(key, threading.Lock())
+        with gate:
+            with self._lock:  # computed by another thread while we waited?
+                entry = self._lookup(key)
+            if entry is not None:
+                return entry[0]
+            try:
+                value = compute()
+                self.put(key, value)
+            finally:
+                with self._lock:
+                    self._inflight.pop(key, None)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "bytes_stored": self._bytes,
+                "evictions": self.evictions,
+                "max_bytes": self._max_bytes,
+            }
+
+
+_IMAGES: Optional[MemoryCache] = None
+_IMAGES_LOCK = threading.Lock()
+
+
+def get_image_cache() -> MemoryCache:
+    """
+    Process-wide cache of decoded frames shared by every session; budget
+    from ``$CASSANDRA_IMAGE_CACHE_BYTES``.
+    """
+    global _IMAGES
+    with _IMAGES_LOCK:
+        if _IMAGES is None:
+            max_bytes = int(
+                os.getenv("CASSANDRA_IMAGE_CACHE_BYTES", DEFAULT_IMAGE_CACHE_BYTES)
+            )
+            _IMAGES = MemoryCache(max_bytes)
+        return _IMAGES
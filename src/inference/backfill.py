@@ -0,0 +1,230 @@
+# src/inference/backfill.py
+#
+# Rerun a model over an archived time range, e.g. after retraining:
+#
+#     PYTHONPATH=src python -m inference.backfill --station ExperimentalG4 \
+#         --start 2025-04-01 --end 2025-05-01 --model "1-D CNN" --weights cnn.npz
+#
+# The WAVs of the range are taken from the catalogs, cut into shards and
+# scored in a process pool (one model per worker, files memory-mapped by
+# the worker itself). Every finished file is recorded in the detection
+# store, which is the checkpoint: rerunning the same command after an
+# interruption only scores what is left.
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from cache.disk import local_key
+from inference.models import MODELS, Model, load_model
+from inference.pipeline import InferencePipeline, WavJob
+from inference.service import station_roots, wav_rows
+from inference.store import Detection, DetectionStore, default_path
+
+log = logging.getLogger("cassandra.backfill")
+
+SHARD_FILES = 16
+
+
+def backfill_jobs(
+    base: str,
+    station: Optional[str],
+    start: Optional[datetime],
+    end: Optional[datetime],
+) -> List[WavJob]:
+    """
+    Every WAV of ``station`` in ``[start, end]`` under ``base`` and its
+    mirrors, oldest first.
+    """
+    jobs = []
+    for root, key in station_roots(base, station):
+        for name, row in wav_rows(root, key, station, start, end):
+            try:
+                version = local_key(row["path"])
+            except FileNotFoundError:
+                continue
+            jobs.append(WavJob(name, row["timestamp"], row["filename"],
+                               row["path"], version))
+    jobs.sort(key=lambda j: j.start)
+    return jobs
+
+
+def shards(jobs: Sequence[WavJob], size: int = SHARD_FILES) -> List[List[WavJob]]:
+    return [list(jobs[i:i + size]) for i in range(0, len(jobs), size)]
+
+
+# ----------------------------------------------------------------------#
+# workers
+# ----------------------------------------------------------------------#
+class _Collected:
+    """Store stand-in in a worker: the parent records what it collects."""
+
+    def __init__(self):
+        self.files: List[Tuple[str, List[Detection]]] = []
+
+    def add(self, model: str, version: str, detections: Sequence[Detection]) -> None:
+        self.files.append((version, list(detections)))
+
+
+_MODEL: Optional[Model] = None
+_OPTIONS: Dict = {}
+
+
+def _init_worker(model: str, weights: Optional[str], options: Dict) -> None:
+    global _MODEL, _OPTIONS
+    _MODEL, _OPTIONS = load_model(model, weights), options
+
+
+def _score_shard(
+    jobs: List[WavJob],
+) -> Tuple[List[Tuple[str, List[Detection]]], Dict]:
+    collected = _Collected()
+    pipeline = InferencePipeline(_MODEL, collected, **_OPTIONS)
+    pipeline.run(jobs)
+    return collected.files, pipeline.stats
+
+
+# ----------------------------------------------------------------------#
+# driver
+# ----------------------------------------------------------------------#
+class Progress:
+    """Files/s and audio-seconds/s of a backfill, for the log."""
+
+    def __init__(self, total: int):
+        self.total = total
+        self.files = 0
+        self.audio = 0.0
+        self.detections = 0
+        self.errors = 0
+        self._t0 = time.perf_counter()
+
+    def add(self, stats: Dict) -> None:
+        self.files += stats["files"]
+        self.audio += stats["audio_seconds"]
+        self.detections += stats["detections"]
+        self.errors += stats["errors"]
+
+    def line(self) -> str:
+        dt = max(time.perf_counter() - self._t0, 1e-9)
+        rate = self.files / dt
+        eta = (self.total - self.files) / rate if rate else float("inf")
+        return (f"{self.files}/{self.total} files, {self.detections} detections · "
+                f"{rate:.1f} files/s, {self.audio / dt:,.0f} audio-s/s · "
+                f"ETA {eta / 60:.0f} min")
+
+
+def backfill(
+    jobs: Sequence[WavJob],
+    model: str,
+    store: DetectionStore,
+    *,
+    weights: Optional[str] = None,
+    workers: Optional[int] = None,
+    shard_files: int = SHARD_FILES,
+    **options,
+) -> Progress:
+    """
+    Score the ``jobs`` not yet recorded in ``store`` for this model and
+    weights, ``shard_files`` files per task on ``workers`` processes;
+    ``options`` go to each worker's :class:`InferencePipeline`. Results
+    are recorded as shards complete, so an interrupted backfill resumes
+    where it stopped. A shard that fails as a whole (e.g. a crashed
+    worker) is logged and counted in ``errors``; the next run retries it.
+    """
+    label = load_model(model, weights).label
+    recorded = store.done(label)
+    todo = [j for j in jobs if j.version not in recorded]
+    progress = Progress(len(todo))
+    if len(todo) < len(jobs):
+        log.info("%s: %d of %d files already done",
+                 label, len(jobs) - len(todo), len(jobs))
+    if not todo:
+        return progress
+
+    pool = ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(model, weights, options),
+    )
+    try:
+        running = {
+            pool.submit(_score_shard, shard): shard
+            for shard in shards(todo, shard_files)
+        }
+        while running:
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                shard = running.pop(fut)
+                try:
+                    files, stats = fut.result()
+                except Exception:
+                    log.exception("%s: shard of %d files from %s failed",
+                                  label, len(shard), shard[0].source)
+                    progress.errors += len(shard)
+                    continue
+                for version, detections in files:
+                    store.add(label, version, detections)
+                progress.add(stats)
+                log.info("%s: %s", label, progress.line())
+    finally:
+        # Ctrl-C: drop queued shards, keep what is recorded
+        pool.shutdown(wait=True, cancel_futures=True)
+    return progress
+
+
+def _utc(text: str) -> datetime:
+    ts = datetime.fromisoformat(text)
+    return ts if ts.tzinfo else ts.replace(tzinfo=timezone.utc)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser(
+        prog="cassandra-backfill",
+        description="Rerun a detector over archived WAVs of a station "
+                    "and time range.",
+    )
+    ap.add_argument("--root", default=os.getenv("CASSANDRA_MIRROR_DIR", "VLF"),
+                    help="archive root; its station mirrors are included "
+                         "(default: VLF)")
+    ap.add_argument("--station", help="station name (default: every station)")
+    ap.add_argument("--start", type=_utc, help="ISO date/time, UTC")
+    ap.add_argument("--end", type=_utc, help="ISO date/time, UTC")
+    ap.add_argument("--model", choices=list(MODELS), required=True)
+    ap.add_argument("--weights", help="model weights (.npz)")
+    ap.add_argument("--store", help="detections file "
+                                    "(default: <root>/.cassandra/detections.sqlite)")
+    ap.add_argument("--workers", type=int, default=os.cpu_count(), help="processes")
+    ap.add_argument("--shard", type=int, default=SHARD_FILES, help="files per task")
+    ap.add_argument("--batch", type=int, default=32, help="chunks per model call")
+    ap.add_argument("--threshold", type=float,
+                    help="detection score (default: the model's)")
+    args = ap.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    jobs = backfill_jobs(args.root, args.station, args.start, args.end)
+    log.info("%d WAV files in range", len(jobs))
+    try:
+        progress = backfill(
+            jobs,
+            args.model,
+            DetectionStore(args.store or default_path(args.root)),
+            weights=args.weights,
+            workers=args.workers,
+            shard_files=args.shard,
+            batch_size=args.batch,
+            threshold=args.threshold,
+        )
+    except KeyboardInterrupt:
+        log.info("interrupted: rerun the same command to resume")
+        return
+    log.info("done: %s", progress.line())
+
+
+if __name__ == "__main__":
+    main()
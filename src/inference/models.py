@@ -0,0 +1,183 @@
+# src/inference/models.py
+
+from __future__ import annotations
+
+import abc
+import hashlib
+import zlib
+from typing import Dict, Mapping, Optional, Type
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from media.features import DEFAULT as FEATURES, FeatureParams, normalise
+
+
+def _sigmoid(x: np.ndarray) -> np.ndarray:
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+class Model(abc.ABC):
+    """
+    A detector scoring fixed-length audio chunks.
+
+    :meth:`predict` takes a batch of chunks as log band energies
+    (:mod:`media.features` with :attr:`features`), shape
+    ``(n, chunk_frames, bands)``, and returns one score in [0, 1] per
+    chunk. Rows are independent, so any batch size gives the same
+    scores. Weights are a dict of arrays (``.npz`` on disk); without
+    them a model starts from fixed seeded weights, which keeps the
+    pipeline runnable end to end before a trained model exists.
+    """
+
+    name = "model"
+    version = "seeded"  # which weights: part of the label detections are stored under
+    features: FeatureParams = FEATURES
+    chunk_seconds = 2.0
+    hop_seconds = 1.0
+    threshold = 0.5
+
+    def __init__(self, weights: Optional[Mapping[str, np.ndarray]] = None):
+        init = self.init_weights(np.random.default_rng(zlib.crc32(self.name.encode())))
+        if weights is not None:
+            unknown = set(weights) - set(init)
+            if unknown:
+                raise ValueError(f"{self.name}: unknown weights {sorted(unknown)}")
+            init.update({k: np.asarray(v, np.float32) for k, v in weights.items()})
+        self.weights = init
+
+    @property
+    def label(self) -> str:
+        """``name``, plus the weights digest once trained weights are loaded."""
+        if self.version == Model.version:
+            return self.name
+        return f"{self.name}@{self.version}"
+
+    @property
+    def n_bands(self) -> int:
+        return self.features.n_bands
+
+    @abc.abstractmethod
+    def init_weights(self, rng: np.random.Generator) -> Dict[str, np.ndarray]:
+        """Seeded starting weights; also the set of weight names accepted."""
+
+    @abc.abstractmethod
+    def predict(self, batch: np.ndarray) -> np.ndarray:
+        """``(n, chunk_frames, bands)`` features → ``(n,)`` scores."""
+
+
+MODELS: Dict[str, Type[Model]] = {}
+
+
+def register(cls: Type[Model]) -> Type[Model]:
+    MODELS[cls.name] = cls
+    return cls
+
+
+def load_model(name: str, weights_path: Optional[str] = None) -> Model:
+    """
+    Instance of the registered model ``name``, with weights from an
+    ``.npz``; its :attr:`Model.version` is then a digest of that file, so
+    detections of retrained weights are told apart from earlier ones.
+    """
+    try:
+        cls = MODELS[name]
+    except KeyError:
+        known = ", ".join(MODELS)
+        raise ValueError(f"unknown model {name!r} (have: {known})") from None
+    if weights_path is None:
+        return cls()
+    with open(weights_path, "rb") as f:
+        digest = hashlib.sha256(f.read()).hexdigest()[:10]
+    with np.load(weights_path) as z:
+        model = cls({k: z[k] for k in z.files})
+    model.version = digest
+    return model
+
+
+def _normal(rng: np.random.Generator, *shape: int) -> np.ndarray:
+    return (rng.standard_normal(shape) / np.sqrt(shape[0])).astype(np.float32)
+
+
+# ----------------------------------------------------------------------#
+# models (the choices of the waveform tab)
+# ----------------------------------------------------------------------#
+@register
+class Conv1D(Model):
+    """Two 1-D convolutions over time (bands as channels), global max pooling."""
+
+    name = "1-D CNN"
+    KERNEL = 5
+
+    def init_weights(self, rng):
+        k, b, c = self.KERNEL, self.n_bands, 8
+        return {
+            "conv1": _normal(rng, k * b, c), "b1": np.zeros(c, np.float32),
+            "conv2": _normal(rng, k * c, c), "b2": np.zeros(c, np.float32),
+            "out": _normal(rng, c), "b_out": np.zeros(1, np.float32),
+        }
+
+    def _conv(self, x: np.ndarray, w: np.ndarray, b: np.ndarray) -> np.ndarray:
+        win = sliding_window_view(x, self.KERNEL, axis=1)  # (n, T', ch, k)
+        return np.maximum(win.reshape(*win.shape[:2], -1) @ w + b, 0)
+
+    def predict(self, batch):
+        w = self.weights
+        h = self._conv(normalise(batch), w["conv1"], w["b1"])
+        h = self._conv(h, w["conv2"], w["b2"])
+        return _sigmoid(h.max(axis=1) @ w["out"] + w["b_out"][0])
+
+
+@register
+class SimpleRNN(Model):
+    """Elman RNN over the energy frames (one step per frame, whole batch at once)."""
+
+    name = "Simple RNN"
+    HIDDEN = 16
+
+    def init_weights(self, rng):
+        h = self.HIDDEN
+        return {
+            "w_in": _normal(rng, self.n_bands, h), "w_rec": _normal(rng, h, h) * 0.5,
+            "b": np.zeros(h, np.float32),
+            "out": _normal(rng, h), "b_out": np.zeros(1, np.float32),
+        }
+
+    def predict(self, batch):
+        w = self.weights
+        inputs = normalise(batch) @ w["w_in"] + w["b"]  # (n, T, h)
+        h = np.zeros((len(batch), self.HIDDEN), np.float32)
+        for t in range(inputs.shape[1]):
+            h = np.tanh(inputs[:, t] + h @ w["w_rec"])
+        return _sigmoid(h @ w["out"] + w["b_out"][0])
+
+
+@register
+class Transformer(Model):
+    """One self-attention block over the feature frames, mean pooled."""
+
+    name = "Transformer"
+    DIM = 16
+
+    def init_weights(self, rng):
+        d = self.DIM
+        return {
+            "embed": _normal(rng, self.n_bands, d),
+            "q": _normal(rng, d, d), "k": _normal(rng, d, d), "v": _normal(rng, d, d),
+            "out": _normal(rng, d), "b_out": np.zeros(1, np.float32),
+        }
+
+    def _positions(self, t: int) -> np.ndarray:
+        d = self.DIM
+        pos = np.arange(t)[:, None] / 10_000 ** (np.arange(d)[None, :] / d)
+        return np.where(np.arange(d) % 2, np.cos(pos), np.sin(pos)).astype(np.float32)
+
+    def predict(self, batch):
+        w = self.weights
+        x = normalise(batch) @ w["embed"] + self._positions(batch.shape[1])  # (n, T, d)
+        q, k, v = x @ w["q"], x @ w["k"], x @ w["v"]
+        att = q @ k.transpose(0, 2, 1) / np.sqrt(self.DIM)
+        att = np.exp(att - att.max(axis=2, keepdims=True))
+        att /= att.sum(axis=2, keepdims=True)
+        h = (x + att @ v).mean(axis=1)
+        return _sigmoid(h @ w["out"] + w["b_out"][0])
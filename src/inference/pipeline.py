@@ -0,0 +1,293 @@
+# src/inference/pipeline.py
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Union
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from inference.models import Model
+from inference.store import Detection, DetectionStore
+from media.features import FLOOR, band_energies, features_for
+from media.wav import MappedWav, WavFile, open_local
+
+log = logging.getLogger("cassandra.inference")
+
+Reader = Union[MappedWav, WavFile]
+
+
+class WavJob(NamedTuple):
+    station: str
+    start: datetime   # UTC time of the first sample
+    source: str       # file name
+    path: str         # what ``opener`` is given
+    version: str      # identifies this version of the file in the store
+
+
+def chunk_starts(n_frames: int, size: int, hop: int) -> np.ndarray:
+    """
+    First frame of every ``size``-frame chunk, ``hop`` frames apart; the
+    last chunk is aligned to the end so the whole file is covered. A file
+    shorter than one chunk gives one chunk (padded with silence).
+    """
+    if n_frames <= 0:
+        return np.empty(0, np.int64)
+    if n_frames <= size:
+        return np.zeros(1, np.int64)
+    starts = np.arange(0, n_frames - size + 1, hop, dtype=np.int64)
+    if starts[-1] + size < n_frames:
+        starts = np.append(starts, n_frames - size)
+    return starts
+
+
+def events(
+    scores: np.ndarray, starts: np.ndarray, size: int, threshold: float
+) -> List[tuple]:
+    """
+    Runs of consecutive chunks scoring ``>= threshold`` as
+    ``(first_frame, end_frame, max_score)``.
+    """
+    hit = scores >= threshold
+    if not hit.any():
+        return []
+    edges = np.flatnonzero(np.diff(np.concatenate([[0], hit.astype(np.int8), [0]])))
+    return [
+        (int(starts[a]), int(starts[b - 1]) + size, float(scores[a:b].max()))
+        for a, b in zip(edges[::2], edges[1::2])
+    ]
+
+
+class Batch(NamedTuple):
+    data: np.ndarray   # (rows, frames, bands) float32 chunk features
+    job: np.ndarray    # index into the run's jobs, per row
+    start: np.ndarray  # first feature frame, per row
+    last: np.ndarray   # row is the last chunk of its file
+    empty: List[int]   # jobs without any chunk (nothing to score)
+
+
+_END = object()
+
+
+class InferencePipeline:
+    """
+    Streams WAV files through a model in fixed-size overlapping chunks.
+
+    A reader thread gets each file's features (:func:`features_for`:
+    computed once per file and shared with the other consumers), cuts
+    them into chunks of the model's length (strided views copied straight
+    into the batch buffer) and fills batches of ``batch_size`` rows
+    *across* files, so a backlog of many short
+    recordings still runs the model on full batches. Batches wait in a
+    queue of at most ``max_pending``: when the model is the bottleneck
+    the reader blocks, so memory stays at a few batches whatever the
+    backlog. Once the last chunk of a file is scored, its detections are
+    written to the store and the file is marked done.
+    """
+
+    def __init__(
+        self,
+        model: Model,
+        store: Optional[DetectionStore] = None,
+        *,
+        batch_size: int = 32,
+        max_pending: int = 4,
+        chunk_seconds: Optional[float] = None,
+        hop_seconds: Optional[float] = None,
+        threshold: Optional[float] = None,
+        opener: Callable[[str], Reader] = open_local,
+    ):
+        """
+        model          scores the chunks
+        store          where detections and finished files are recorded
+        batch_size     chunks per model call
+        max_pending    batches read ahead of the model (backpressure)
+        chunk_seconds  chunk length (default: the model's)
+        hop_seconds    chunk spacing (default: the model's)
+        threshold      score of a detection (default: the model's)
+        opener         path → frame reader (default: local memory map)
+        """
+        self.model = model
+        self.store = store
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        step = model.features.hop_seconds
+        self.chunk_frames = max(1, round((chunk_seconds or model.chunk_seconds) / step))
+        self.hop_frames = max(1, round((hop_seconds or model.hop_seconds) / step))
+        self.threshold = model.threshold if threshold is None else threshold
+        self._opener = opener
+        self.stats: Dict[str, float] = {
+            "files": 0, "chunks": 0, "batches": 0, "detections": 0,
+            "audio_seconds": 0.0, "errors": 0, "peak_pending": 0,
+        }
+
+    # ------------------------------------------------------------------#
+    # reader thread
+    # ------------------------------------------------------------------#
+    def _features(self, job: WavJob):
+        """(features, sample rate, samples) of one file."""
+        wav = self._opener(job.path)
+        info = wav.info
+        if isinstance(wav, MappedWav):  # shared per-file cache
+            feats = features_for(wav.path, self.model.features)
+        else:
+            feats = band_energies(wav.frames(0, info.n_frames), info.sample_rate,
+                                  self.model.features)
+        return feats, info.sample_rate, info.n_frames
+
+    def _produce(self, jobs: Sequence[WavJob], out: "queue.Queue", files: Dict,
+                 abort: threading.Event, stop: Optional[threading.Event]) -> None:
+        size, hop = self.chunk_frames, self.hop_frames
+        buf: Optional[np.ndarray] = None
+        meta: List[np.ndarray] = []
+        fill = 0
+        empty: List[int] = []
+
+        def put(item) -> bool:
+            while not abort.is_set():
+                try:
+                    out.put(item, timeout=0.2)
+                except queue.Full:
+                    continue
+                peak = max(self.stats["peak_pending"], out.qsize())
+                self.stats["peak_pending"] = peak
+                return True
+            return False
+
+        def flush() -> bool:
+            nonlocal buf, fill, meta, empty
+            if not fill and not empty:
+                return True
+            if meta:
+                rows = np.concatenate(meta, axis=1)
+            else:
+                rows = np.empty((3, 0), np.int64)
+            if buf is not None:
+                data = buf[:fill]
+            else:
+                data = np.empty((0, size, self.model.n_bands))
+            batch = Batch(data, rows[0], rows[1], rows[2].astype(bool), empty)
+            buf, fill, meta, empty = None, 0, [], []
+            return put(batch)
+
+        try:
+            for j, job in enumerate(jobs):
+                if abort.is_set() or (stop is not None and stop.is_set()):
+                    break
+                try:
+                    feats, sr, n_samples = self._features(job)
+                except (OSError, ValueError) as exc:
+                    self.stats["errors"] += 1
+                    log.warning("%s: cannot read: %s", job.source, exc)
+                    continue
+                files[j] = (sr, n_samples)
+                starts = chunk_starts(len(feats), size, hop)
+                if not len(starts):
+                    empty.append(j)
+                    continue
+                if len(feats) < size:  # pad with silence
+                    pad = np.full((size - len(feats), feats.shape[1]), FLOOR,
+                                  np.float32)
+                    feats = np.concatenate([feats, pad])
+                windows = sliding_window_view(feats, size, axis=0)  # (n, bands, size)
+
+                i = 0
+                while i < len(starts):
+                    if buf is None:
+                        shape = (self.batch_size, size, feats.shape[1])
+                        buf = np.empty(shape, np.float32)
+                    m = min(self.batch_size - fill, len(starts) - i)
+                    part = starts[i:i + m]
+                    buf[fill:fill + m] = windows[part].transpose(0, 2, 1)
+                    last = np.zeros(m, np.int64)
+                    if i + m == len(starts):
+                        last[-1] = 1
+                    meta.append(np.stack([np.full(m, j, np.int64), part, last]))
+                    fill += m
+                    i += m
+                    if fill == self.batch_size and not flush():
+                        return
+            flush()
+        finally:
+            put(_END)
+
+    # ------------------------------------------------------------------#
+    # model side
+    # ------------------------------------------------------------------#
+    def run(
+        self, jobs: Sequence[WavJob], stop: Optional[threading.Event] = None
+    ) -> List[Detection]:
+        """
+        Score every job and record the finished files; returns the
+        detections found. Setting ``stop`` ends the run after the batches
+        already read (unfinished files are left for the next run).
+        """
+        jobs = list(jobs)
+        if not jobs:
+            return []
+        pending: "queue.Queue" = queue.Queue(maxsize=self.max_pending)
+        files: Dict[int, tuple] = {}
+        abort = threading.Event()
+        reader = threading.Thread(
+            target=self._produce, args=(jobs, pending, files, abort, stop),
+            name="inference-reader", daemon=True,
+        )
+        reader.start()
+
+        found: List[Detection] = []
+        scores: Dict[int, List[np.ndarray]] = {}
+        starts: Dict[int, List[np.ndarray]] = {}
+        try:
+            while True:
+                batch = pending.get()
+                if batch is _END:
+                    break
+                for j in batch.empty:
+                    found.extend(self._finish(jobs[j], *files[j],
+                                              np.empty(0), np.empty(0, np.int64)))
+                if not len(batch.data):
+                    continue
+                s = np.asarray(self.model.predict(batch.data), np.float64)
+                self.stats["batches"] += 1
+                self.stats["chunks"] += len(s)
+                for j in np.unique(batch.job):
+                    rows = batch.job == j
+                    scores.setdefault(j, []).append(s[rows])
+                    starts.setdefault(j, []).append(batch.start[rows])
+                    if batch.last[rows].any():
+                        found.extend(self._finish(
+                            jobs[j], *files[j],
+                            np.concatenate(scores.pop(j)),
+                            np.concatenate(starts.pop(j)),
+                        ))
+        finally:
+            abort.set()
+            reader.join()
+        return found
+
+    def _finish(self, job: WavJob, sr: int, n_samples: int,
+                scores: np.ndarray, starts: np.ndarray) -> List[Detection]:
+        params = self.model.features
+        hop, frame = params.hop(sr), params.frame(sr)
+        dets = [
+            Detection(
+                job.station,
+                job.start + timedelta(seconds=a * hop / sr),
+                job.start
+                + timedelta(seconds=min((b - 1) * hop + frame, n_samples) / sr),
+                self.model.label,
+                score,
+                job.source,
+            )
+            for a, b, score in events(scores, starts, self.chunk_frames, self.threshold)
+        ]
+        if self.store is not None:
+            self.store.add(self.model.label, job.version, dets)
+        self.stats["files"] += 1
+        self.stats["detections"] += len(dets)
+        self.stats["audio_seconds"] += n_samples / sr
+        return dets
@@ -0,0 +1,202 @@
+# src/inference/service.py
+#
+# Continuous inference over the WAVs arriving in the local archive and
+# in the station mirrors:
+#
+#     PYTHONPATH=src python -m inference.service --root VLF --model "1-D CNN"
+#
+# Every poll, the catalogs of VLF/Wav and VLF/<station>/Wav are refreshed
+# and the files the model has not scored yet are streamed through it,
+# newest first; detections go to VLF/.cassandra/detections.sqlite.
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import threading
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from cache.disk import local_key
+from inference.models import MODELS, Model, load_model
+from inference.pipeline import InferencePipeline, WavJob
+from inference.store import DetectionStore, default_path
+from parser.catalog import Catalog
+
+log = logging.getLogger("cassandra.inference")
+
+
+def wav_roots(base: str) -> List[str]:
+    """``base`` and every mirror under it (``base/<station>``) with a ``Wav`` folder."""
+    roots = [base] if os.path.isdir(os.path.join(base, "Wav")) else []
+    try:
+        entries = sorted(os.scandir(base), key=lambda e: e.name)
+    except FileNotFoundError:
+        return roots
+    roots += [
+        e.path for e in entries
+        if e.is_dir() and not e.name.startswith(".")
+        and os.path.isdir(os.path.join(e.path, "Wav"))
+    ]
+    return roots
+
+
+def station_roots(
+    base: str, station: Optional[str] = None
+) -> List[Tuple[str, Optional[str]]]:
+    """
+    ``(root, key)`` for every root of :func:`wav_roots`, where ``key`` is
+    the station name detections are stored under: a mirror's folder
+    name, which is its stations.yml key and the name the UI selects, or
+    ``None`` for ``base`` itself, whose files are keyed by their name
+    prefix (the local station). ``station`` keeps only its roots.
+    """
+    pairs = [
+        (root, None if root == base else os.path.basename(root))
+        for root in wav_roots(base)
+    ]
+    if station is None:
+        return pairs
+    return [(root, key) for root, key in pairs if key in (None, station)]
+
+
+def wav_rows(root: str, key: Optional[str], station: Optional[str] = None,
+             start=None, end=None) -> Iterator[Tuple[str, Dict]]:
+    """
+    ``(station key, catalog row)`` of the WAVs under one root of
+    :func:`station_roots`.
+    """
+    catalog = Catalog(root)
+    catalog.refresh()
+    # in a mirror every file is the mirrored station's, whatever its prefix
+    rows = catalog.table(station if key is None else None, "Wav", start, end)
+    for row in rows:
+        yield key or row["station"], row
+
+
+def pending_jobs(
+    base: str, store: DetectionStore, model: str, settle: float = 5.0
+) -> List[WavJob]:
+    """
+    WAVs under ``base`` and its mirrors that ``model`` has not scored
+    yet, newest first. Files modified in the last ``settle`` seconds may
+    still be being written and wait for the next poll.
+    """
+    now = time.time()
+    done = store.done(model)
+    jobs = []
+    for root, key in station_roots(base):
+        for station, row in wav_rows(root, key):
+            path = row["path"]
+            try:
+                if now - os.path.getmtime(path) < settle:
+                    continue
+                version = local_key(path)
+            except FileNotFoundError:
+                continue
+            if version not in done:
+                jobs.append(WavJob(station, row["timestamp"], row["filename"],
+                                   path, version))
+    jobs.sort(key=lambda j: j.start, reverse=True)
+    return jobs
+
+
+class InferenceService:
+    """
+    Keeps ``store`` up to date with ``model``'s detections on the WAVs of
+    ``base`` and its mirrors (looked up every poll, so a station mirrored
+    later is picked up).
+    """
+
+    def __init__(
+        self,
+        model: Model,
+        base: str,
+        store: DetectionStore,
+        *,
+        settle: float = 5.0,
+        **pipeline,
+    ):
+        self.model = model
+        self.base = base
+        self.store = store
+        self.settle = settle
+        self.pipeline = InferencePipeline(model, store, **pipeline)
+
+    def run_once(self, stop: Optional[threading.Event] = None) -> int:
+        """Score every pending file (the whole backlog); returns the count."""
+        jobs = pending_jobs(self.base, self.store, self.model.label, self.settle)
+        if not jobs:
+            return 0
+        stats = self.pipeline.stats
+        files, audio = stats["files"], stats["audio_seconds"]
+        t = time.perf_counter()
+        found = self.pipeline.run(jobs, stop)
+        dt = max(time.perf_counter() - t, 1e-9)
+        files, audio = stats["files"] - files, stats["audio_seconds"] - audio
+        log.info(
+            "%s: %d files, %d detections in %.1f s (%.1f files/s, %.0fx real time)",
+            self.model.label, files, len(found), dt, files / dt, audio / dt,
+        )
+        return files
+
+    def run(self, stop: threading.Event, interval: float) -> None:
+        """Poll until ``stop`` is set."""
+        while not stop.is_set():
+            try:
+                self.run_once(stop)
+            except Exception:
+                self.pipeline.stats["errors"] += 1
+                log.exception("inference cycle failed")
+            stop.wait(interval)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser(
+        prog="cassandra-infer",
+        description="Run a detector continuously over new WAV files.",
+    )
+    ap.add_argument("--root", default=os.getenv("CASSANDRA_MIRROR_DIR", "VLF"),
+                    help="archive root; its station mirrors are included "
+                         "(default: VLF)")
+    ap.add_argument("--model", choices=list(MODELS), default=next(iter(MODELS)))
+    ap.add_argument("--weights", help="model weights (.npz)")
+    ap.add_argument("--store", help="detections file "
+                                    "(default: <root>/.cassandra/detections.sqlite)")
+    ap.add_argument("--batch", type=int, default=32, help="chunks per model call")
+    ap.add_argument("--max-pending", type=int, default=4,
+                    help="batches read ahead of the model")
+    ap.add_argument("--threshold", type=float,
+                    help="detection score (default: the model's)")
+    ap.add_argument("--interval", type=float, default=30.0,
+                    help="poll period, s")
+    ap.add_argument("--once", action="store_true",
+                    help="drain the backlog, then exit")
+    args = ap.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s %(threadName)s %(message)s"
+    )
+    service = InferenceService(
+        load_model(args.model, args.weights),
+        args.root,
+        DetectionStore(args.store or default_path(args.root)),
+        batch_size=args.batch,
+        max_pending=args.max_pending,
+        threshold=args.threshold,
+    )
+    log.info("%s on %s", args.model, ", ".join(wav_roots(args.root)) or args.root)
+    if args.once:
+        service.run_once()
+        return
+    stop = threading.Event()
+    try:
+        service.run(stop, args.interval)
+    except KeyboardInterrupt:
+        log.info("stopping…")
+        stop.set()
+
+
+if __name__ == "__main__":
+    main()
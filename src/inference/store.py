@@ -0,0 +1,308 @@
+# src/inference/store.py
+
+from __future__ import annotations
+
+import os
+import sqlite3
+from contextlib import closing
+from datetime import datetime, timezone
+from typing import List, NamedTuple, Optional, Sequence, Set, Tuple
+
+from parser.catalog import CATALOG_DIRNAME
+
+DETECTIONS_FILENAME = "detections.sqlite"
+# bump whenever the schema changes: older stores are rebuilt
+STORE_VERSION = 2
+# widths of the pre-aggregated timeline bins, seconds
+BIN_WIDTHS = {"hour": 3600, "day": 86400}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS detections (
+    station  TEXT    NOT NULL,
+    start_ms INTEGER NOT NULL,
+    end_ms   INTEGER NOT NULL,
+    model    TEXT    NOT NULL,
+    score    REAL    NOT NULL,
+    source   TEXT    NOT NULL,
+    version  TEXT    NOT NULL
+);
+CREATE INDEX IF NOT EXISTS detections_by_time
+    ON detections (station, start_ms);
+CREATE INDEX IF NOT EXISTS detections_by_score
+    ON detections (score);
+CREATE INDEX IF NOT EXISTS detections_by_file
+    ON detections (model, version);
+CREATE TABLE IF NOT EXISTS files (
+    model   TEXT NOT NULL,
+    version TEXT NOT NULL,
+    PRIMARY KEY (model, version)
+);
+CREATE TABLE IF NOT EXISTS bins (
+    station   TEXT    NOT NULL,
+    model     TEXT    NOT NULL,
+    width     INTEGER NOT NULL,
+    bin_start INTEGER NOT NULL,
+    count     INTEGER NOT NULL,
+    max_score REAL    NOT NULL,
+    PRIMARY KEY (width, station, bin_start, model)
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT    PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+class Detection(NamedTuple):
+    station: str
+    start: datetime   # UTC
+    end: datetime     # UTC
+    model: str
+    score: float
+    source: str       # WAV file name
+
+
+def default_path(src_folder: str) -> str:
+    """``<src_folder>/.cassandra/detections.sqlite``, next to the catalog."""
+    return os.path.join(src_folder, CATALOG_DIRNAME, DETECTIONS_FILENAME)
+
+
+def _ms(ts: datetime) -> int:
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return round(ts.timestamp() * 1000)
+
+
+def _utc(ms: int) -> datetime:
+    return datetime.fromtimestamp(ms / 1000, tz=timezone.utc)
+
+
+class DetectionStore:
+    """
+    Persistent SQLite store of detections, indexed by station and start
+    time (window overlays) and by score (top-N listings), with per-hour
+    and per-day counts kept up to date on every write (timelines).
+
+    Each processed file version is recorded with its detections in one
+    transaction, so a crash never leaves a file half-recorded: on
+    restart it is simply processed again, and recording it again
+    replaces its earlier detections. :meth:`processed` tells a service
+    which (model, file version) pairs are already done. The database is
+    in WAL mode: the UI reads while the service and backfills write.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with closing(self._connect()) as con, con:
+            (version,) = con.execute("PRAGMA user_version").fetchone()
+            if version not in (STORE_VERSION, 1):
+                con.executescript(
+                    "DROP TABLE IF EXISTS detections; DROP TABLE IF EXISTS files;"
+                    "DROP TABLE IF EXISTS bins; DROP TABLE IF EXISTS meta;"
+                )
+            con.executescript(_SCHEMA)
+            if version == 1:  # same detections, bins added: aggregate them once
+                self._rebin(con, None)
+            con.execute(f"PRAGMA user_version = {STORE_VERSION}")
+        with closing(self._connect()) as con:
+            con.execute("PRAGMA journal_mode = WAL")
+
+    def _connect(self) -> sqlite3.Connection:
+        # writers (service, backfill, UI) queue on the lock instead of failing
+        return sqlite3.connect(self.path, timeout=30.0)
+
+    # ------------------------------------------------------------------#
+    # processed files
+    # ------------------------------------------------------------------#
+    def processed(self, model: str, version: str) -> bool:
+        with closing(self._connect()) as con:
+            return con.execute(
+                "SELECT 1 FROM files WHERE model = ? AND version = ?", (model, version)
+            ).fetchone() is not None
+
+    def done(self, model: str) -> Set[str]:
+        """Every file version ``model`` has processed (one query per poll)."""
+        with closing(self._connect()) as con:
+            rows = con.execute("SELECT version FROM files WHERE model = ?", (model,))
+            return {v for (v,) in rows}
+
+    def add(self, model: str, version: str, detections: Sequence[Detection]) -> None:
+        """Record ``detections`` of one file version (possibly none) as done."""
+        rows = [
+            (d.station, _ms(d.start), _ms(d.end), d.model,
+             round(float(d.score), 4), d.source, version)
+            for d in detections
+        ]
+        span = max((r[2] - r[1] for r in rows), default=0)
+        with closing(self._connect()) as con, con:
+            touched = {(r[0], r[3], r[1]) for r in rows}
+            touched.update(con.execute(
+                "SELECT station, model, start_ms FROM detections "
+                "WHERE model = ? AND version = ?",
+                (model, version),
+            ))
+            con.execute(
+                "DELETE FROM detections WHERE model = ? AND version = ?",
+                (model, version),
+            )
+            con.executemany(
+                "INSERT INTO detections "
+                "(station, start_ms, end_ms, model, score, source, version) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            con.execute(
+                "INSERT OR IGNORE INTO files (model, version) VALUES (?, ?)",
+                (model, version),
+            )
+            # longest event so far: bounds the index scan of window queries
+            con.execute(
+                "INSERT INTO meta (key, value) VALUES ('max_span_ms', ?) "
+                "ON CONFLICT (key) DO UPDATE SET value = MAX(value, excluded.value)",
+                (span,),
+            )
+            self._rebin(con, touched)
+
+    def _rebin(self, con: sqlite3.Connection, touched) -> None:
+        """
+        Recount the timeline bins holding the ``(station, model, start_ms)``
+        events in ``touched`` (every bin when ``None``). An event counts in
+        the bin of its start.
+        """
+        for width in BIN_WIDTHS.values():
+            w = width * 1000
+            if touched is None:
+                con.execute("DELETE FROM bins WHERE width = ?", (width,))
+                keys = con.execute(
+                    "SELECT DISTINCT station, model, start_ms / ? * ? "
+                    "FROM detections",
+                    (w, w),
+                ).fetchall()
+            else:
+                keys = {(st, m, t // w * w) for st, m, t in touched}
+            for station, model, b0 in keys:
+                count, best = con.execute(
+                    "SELECT COUNT(*), MAX(score) FROM detections "
+                    "WHERE station = ? AND start_ms >= ? AND start_ms < ? "
+                    "AND model = ?",
+                    (station, b0, b0 + w, model),
+                ).fetchone()
+                if count:
+                    con.execute(
+                        "INSERT OR REPLACE INTO bins VALUES (?, ?, ?, ?, ?, ?)",
+                        (station, model, width, b0 // 1000, count, best),
+                    )
+                else:
+                    con.execute(
+                        "DELETE FROM bins WHERE width = ? AND station = ? "
+                        "AND bin_start = ? AND model = ?",
+                        (width, station, b0 // 1000, model),
+                    )
+
+    # ------------------------------------------------------------------#
+    # queries
+    # ------------------------------------------------------------------#
+    def _select(
+        self,
+        station: Optional[str],
+        start: Optional[datetime],
+        end: Optional[datetime],
+        model: Optional[str],
+        min_score: Optional[float],
+        order: str,
+        limit: Optional[int] = None,
+    ) -> List[Detection]:
+        sql = ("SELECT station, start_ms, end_ms, model, score, source "
+               "FROM detections WHERE 1")
+        args: list = []
+        with closing(self._connect()) as con:
+            if station is not None:
+                sql += " AND station = ?"
+                args.append(station)
+            if start is not None:
+                # overlap test on the (station, start) index: no event
+                # starts earlier than the longest one recorded
+                (span,) = con.execute(
+                    "SELECT COALESCE(MAX(value), 0) FROM meta WHERE key = 'max_span_ms'"
+                ).fetchone()
+                sql += " AND start_ms >= ? AND end_ms > ?"
+                args += [_ms(start) - span, _ms(start)]
+            if end is not None:
+                sql += " AND start_ms < ?"
+                args.append(_ms(end))
+            if model is not None:
+                sql += " AND model = ?"
+                args.append(model)
+            if min_score is not None:
+                sql += " AND score >= ?"
+                args.append(min_score)
+            sql += f" ORDER BY {order}"
+            if limit is not None:
+                sql += " LIMIT ?"
+                args.append(limit)
+            rows = con.execute(sql, args).fetchall()
+        return [
+            Detection(s, _utc(t0), _utc(t1), m, sc, src)
+            for s, t0, t1, m, sc, src in rows
+        ]
+
+    def detections(
+        self,
+        station: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        *,
+        model: Optional[str] = None,
+        min_score: Optional[float] = None,
+    ) -> List[Detection]:
+        """
+        Detections overlapping ``[start, end)`` (either bound optional),
+        by start time. ``station=None`` returns every station.
+        """
+        return self._select(station, start, end, model, min_score, "start_ms, station")
+
+    def top(
+        self,
+        n: int,
+        station: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        *,
+        model: Optional[str] = None,
+    ) -> List[Detection]:
+        """The ``n`` highest-scoring detections overlapping ``[start, end)``."""
+        return self._select(station, start, end, model, None, "score DESC, start_ms", n)
+
+    def bins(
+        self,
+        width: str,
+        station: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        *,
+        model: Optional[str] = None,
+    ) -> List[Tuple[datetime, int, float]]:
+        """
+        ``(bin start, detections, best score)`` per ``width`` bin
+        (``"hour"`` or ``"day"``, UTC) starting in ``[start, end)`` that
+        holds any detection, read from the pre-aggregated table.
+        """
+        sql = "SELECT bin_start, SUM(count), MAX(max_score) FROM bins WHERE width = ?"
+        args: list = [BIN_WIDTHS[width]]
+        if station is not None:
+            sql += " AND station = ?"
+            args.append(station)
+        if start is not None:
+            sql += " AND bin_start >= ?"
+            args.append(_ms(start) // 1000)
+        if end is not None:
+            sql += " AND bin_start < ?"
+            args.append(_ms(end) // 1000)
+        if model is not None:
+            sql += " AND model = ?"
+            args.append(model)
+        sql += " GROUP BY bin_start ORDER BY bin_start"
+        with closing(self._connect()) as con:
+            rows = con.execute(sql, args).fetchall()
+        return [(_utc(t * 1000), n, best) for t, n, best in rows]
@@ -0,0 +1,199 @@
+# src/media/envelope.py
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import os
+import tempfile
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+
+from cache.disk import cache_dir
+from media.wav import MappedWav, WavFile, open_local
+
+DEFAULT_MAX_POINTS = 2000
+
+Points = Tuple[np.ndarray, np.ndarray]  # (sample positions, values)
+
+
+def _mono(samples: np.ndarray) -> np.ndarray:
+    return samples[:, 0] if samples.ndim > 1 else samples
+
+
+def _interleave(x: np.ndarray, lo: np.ndarray, hi: np.ndarray) -> Points:
+    """Two points per bin (min then max) so the trace draws each bin's span."""
+    return np.repeat(x, 2), np.column_stack([lo, hi]).ravel()
+
+
+def minmax_points(
+    samples: np.ndarray, offset: int = 0, max_points: int = DEFAULT_MAX_POINTS
+) -> Points:
+    """
+    At most ~``max_points`` points tracing ``samples`` (which start at
+    sample ``offset``): the samples themselves when few enough, else the
+    min and max of equal bins.
+    """
+    samples = _mono(samples)
+    n = len(samples)
+    if n <= max_points:
+        return offset + np.arange(n, dtype=np.float64), samples
+    step = -(-n // (max_points // 2))  # ceil
+    pad = (-n) % step
+    padded = np.concatenate([samples, np.repeat(samples[-1:], pad)])
+    bins = padded.reshape(-1, step)
+    x = offset + np.arange(len(bins), dtype=np.float64) * step
+    return _interleave(x, bins.min(axis=1), bins.max(axis=1))
+
+
+class Envelope:
+    """
+    Min/max pyramid of a signal.
+
+    Level ``k`` holds the min and max of consecutive bins of
+    ``base * factor**k`` samples, down to a few hundred bins at the top,
+    so any window can be drawn from the finest level that gives at most
+    ``max_points`` points: the cost of a plot depends on the screen,
+    not on the recording length.
+    """
+
+    def __init__(
+        self,
+        mins: List[np.ndarray],
+        maxs: List[np.ndarray],
+        *,
+        n_samples: int,
+        base: int,
+        factor: int,
+    ):
+        self.mins = mins
+        self.maxs = maxs
+        self.n_samples = n_samples
+        self.base = base
+        self.factor = factor
+
+    @classmethod
+    def build(
+        cls,
+        samples: np.ndarray,
+        *,
+        base: int = 16,
+        factor: int = 4,
+        top_bins: int = 256,
+    ) -> "Envelope":
+        samples = _mono(samples)
+        n = len(samples)
+        mins, maxs = [], []
+        lo = hi = samples
+        step = base
+        while True:
+            m = len(lo)
+            full = m - m % step
+            blo = lo[:full].reshape(-1, step).min(axis=1)
+            bhi = hi[:full].reshape(-1, step).max(axis=1)
+            if full < m:  # partial last bin
+                blo = np.append(blo, lo[full:].min())
+                bhi = np.append(bhi, hi[full:].max())
+            mins.append(blo)
+            maxs.append(bhi)
+            if len(blo) <= top_bins:
+                break
+            lo, hi, step = blo, bhi, factor
+        return cls(mins, maxs, n_samples=n, base=base, factor=factor)
+
+    def bin_size(self, level: int) -> int:
+        return self.base * self.factor**level
+
+    def points(
+        self, start: int, stop: int, max_points: int = DEFAULT_MAX_POINTS
+    ) -> Optional[Points]:
+        """
+        Envelope points for samples ``[start, stop)``, or ``None`` when the
+        window is small enough to draw the raw samples.
+        """
+        start, stop = max(0, start), min(self.n_samples, stop)
+        if stop - start <= max_points:
+            return None
+        budget = max(1, max_points // 2)
+        level = len(self.mins) - 1
+        for k in range(len(self.mins)):
+            if -(-(stop - start) // self.bin_size(k)) <= budget:
+                level = k
+                break
+        size = self.bin_size(level)
+        b0, b1 = start // size, -(-stop // size)
+        x = np.arange(b0, b1, dtype=np.float64) * size
+        return _interleave(x, self.mins[level][b0:b1], self.maxs[level][b0:b1])
+
+    # ------------------------------------------------------------------#
+    # persistence
+    # ------------------------------------------------------------------#
+    def save(self, path: str) -> None:
+        arrays = {f"min{k}": a for k, a in enumerate(self.mins)}
+        arrays.update({f"max{k}": a for k, a in enumerate(self.maxs)})
+        meta = np.array([self.n_samples, self.base, self.factor, len(self.mins)])
+        fd, tmp = tempfile.mkstemp(prefix=".", suffix=".npz", dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, meta=meta, **arrays)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+    @classmethod
+    def load(cls, path: str) -> "Envelope":
+        with np.load(path) as z:
+            n_samples, base, factor, levels = (int(v) for v in z["meta"])
+            return cls(
+                [z[f"min{k}"] for k in range(levels)],
+                [z[f"max{k}"] for k in range(levels)],
+                n_samples=n_samples,
+                base=base,
+                factor=factor,
+            )
+
+
+@functools.lru_cache(maxsize=64)
+def _envelope(path: str, mtime_ns: int, size: int) -> Envelope:
+    raw = f"{path}\0{mtime_ns}\0{size}".encode()
+    name = hashlib.sha256(raw).hexdigest() + ".npz"
+    cached = os.path.join(cache_dir("envelopes"), name)
+    try:
+        return Envelope.load(cached)
+    except (OSError, KeyError, ValueError):
+        pass
+    env = Envelope.build(open_local(path).samples)
+    env.save(cached)
+    return env
+
+
+def envelope_for(path: str) -> Envelope:
+    """
+    Pyramid of a local WAV: built once from its memory map, persisted
+    under ``cache_dir("envelopes")`` and kept in memory; a file changed on
+    disk gets a new one.
+    """
+    st = os.stat(path)
+    return _envelope(os.path.abspath(path), st.st_mtime_ns, st.st_size)
+
+
+def lod_points(
+    wav: Union[MappedWav, WavFile],
+    start: int,
+    stop: int,
+    max_points: int = DEFAULT_MAX_POINTS,
+) -> Points:
+    """
+    Plot points for frames ``[start, stop)`` of ``wav``, never more than
+    ~``max_points``: raw samples when the window is small, the persisted
+    pyramid for local files, otherwise a min/max reduction of the window
+    read for display (remote files keep their ranged reads).
+    """
+    if isinstance(wav, MappedWav) and stop - start > max_points:
+        pts = envelope_for(wav.path).points(start, stop, max_points)
+        if pts is not None:
+            return pts
+    return minmax_points(wav.frames(start, stop), start, max_points)
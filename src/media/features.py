@@ -0,0 +1,150 @@
+# src/media/features.py
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import os
+import tempfile
+from typing import NamedTuple, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from cache.disk import cache_dir
+from media.wav import open_local
+
+
+class FeatureParams(NamedTuple):
+    """Framing and bands, in seconds and Hz so any sample rate gives the same grid."""
+
+    frame_seconds: float = 0.0625
+    hop_seconds: float = 0.03125
+    band_edges: Tuple[float, ...] = (
+        0, 2_000, 4_000, 7_000, 10_000, 14_000, 18_000, 24_000
+    )
+
+    def frame(self, sample_rate: int) -> int:
+        return max(2, int(round(self.frame_seconds * sample_rate)))
+
+    def hop(self, sample_rate: int) -> int:
+        return max(1, int(round(self.hop_seconds * sample_rate)))
+
+    @property
+    def n_bands(self) -> int:
+        return len(self.band_edges) - 1
+
+    def labels(self) -> list:
+        e = self.band_edges
+        return [f"{e[i] / 1e3:g}–{e[i + 1] / 1e3:g} kHz" for i in range(self.n_bands)]
+
+    def key(self) -> str:
+        return hashlib.sha256(repr(tuple(self)).encode()).hexdigest()[:16]
+
+
+DEFAULT = FeatureParams()
+FLOOR = -12.0  # log10 power of silence
+
+
+@functools.lru_cache(maxsize=16)
+def _band_matrix(n_bins: int, sample_rate: int, edges: Tuple[float, ...]) -> np.ndarray:
+    """``(n_bins, n_bands)`` 0/1 matrix summing rFFT bins into bands."""
+    f = np.fft.rfftfreq(2 * (n_bins - 1), 1.0 / sample_rate)
+    m = np.zeros((n_bins, len(edges) - 1), np.float32)
+    for b in range(len(edges) - 1):
+        m[(f >= edges[b]) & (f < edges[b + 1]), b] = 1.0
+    return m
+
+
+def _scale(dtype: np.dtype) -> Tuple[float, float]:
+    if dtype.kind == "f":
+        return 0.0, 1.0
+    half = 2.0 ** (8 * dtype.itemsize - 1)
+    return (half if dtype.kind == "u" else 0.0), 1.0 / half
+
+
+def _band_energies(frames: np.ndarray, sample_rate: int, params: FeatureParams,
+                   chunk: int = 4096) -> np.ndarray:
+    """``(n, frame)`` raw sample frames → ``(n, bands)`` log10 band power."""
+    n, size = frames.shape
+    offset, scale = _scale(frames.dtype)
+    window = np.hanning(size).astype(np.float32) * scale
+    m = _band_matrix(size // 2 + 1, sample_rate, params.band_edges)
+    out = np.empty((n, params.n_bands), np.float32)
+    for c0 in range(0, n, chunk):  # bounded temporaries for long files
+        block = (frames[c0:c0 + chunk] - np.float32(offset)) * window
+        power = np.abs(np.fft.rfft(block, axis=1)) ** 2 / size
+        out[c0:c0 + chunk] = np.log10(power @ m + 1e-12)
+    return np.maximum(out, FLOOR)
+
+
+def band_energies(samples: np.ndarray, sample_rate: int,
+                  params: FeatureParams = DEFAULT) -> np.ndarray:
+    """
+    Log band powers of a recording, shape ``(frames, bands)``: frame
+    ``i`` covers samples ``[i * hop, i * hop + frame)``. Frames are
+    strided views over ``samples`` (no copy of the signal).
+    """
+    if samples.ndim > 1:
+        samples = samples[:, 0]
+    frame, hop = params.frame(sample_rate), params.hop(sample_rate)
+    if len(samples) < frame:
+        return np.empty((0, params.n_bands), np.float32)
+    frames = sliding_window_view(samples, frame)[::hop]
+    return _band_energies(frames, sample_rate, params)
+
+
+def normalise(features: np.ndarray, axis: int = -2) -> np.ndarray:
+    """Zero mean, unit variance along ``axis`` (time, by default) per band."""
+    mean = features.mean(axis=axis, keepdims=True)
+    std = features.std(axis=axis, keepdims=True)
+    return ((features - mean) / (std + 1e-6)).astype(np.float32)
+
+
+def frame_times(
+    n_frames: int, sample_rate: int, params: FeatureParams = DEFAULT
+) -> np.ndarray:
+    """Centre of every frame, in seconds from the start of the file."""
+    frame, hop = params.frame(sample_rate), params.hop(sample_rate)
+    return (np.arange(n_frames) * hop + frame / 2) / sample_rate
+
+
+# ----------------------------------------------------------------------#
+# per-file cache
+# ----------------------------------------------------------------------#
+def _save(path: str, arr: np.ndarray) -> None:
+    fd, tmp = tempfile.mkstemp(prefix=".", suffix=".npy", dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, arr)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+@functools.lru_cache(maxsize=64)
+def _features(path: str, mtime_ns: int, size: int, params: FeatureParams) -> np.ndarray:
+    raw = f"{path}\0{mtime_ns}\0{size}\0{params.key()}".encode()
+    name = hashlib.sha256(raw).hexdigest() + ".npy"
+    cached = os.path.join(cache_dir("features"), name)
+    try:
+        return np.load(cached, mmap_mode="r")
+    except (OSError, ValueError):
+        pass
+    wav = open_local(path)
+    feats = band_energies(wav.samples, wav.info.sample_rate, params)
+    _save(cached, feats)
+    return feats
+
+
+def features_for(path: str, params: FeatureParams = DEFAULT) -> np.ndarray:
+    """
+    Band energies of a local WAV for ``params``, computed once per file
+    version and parameter set, persisted under ``cache_dir("features")``
+    and shared by every consumer (inference, backfill workers, the
+    waveform overlay).
+    """
+    st = os.stat(path)
+    return _features(os.path.abspath(path), st.st_mtime_ns, st.st_size, params)
@@ -0,0 +1,145 @@
+# src/media/remote_file.py
+
+from __future__ import annotations
+
+import io
+import os
+import threading
+from typing import Dict, List, Optional
+
+from cache.memory import MemoryCache
+from ssh.fetcher_remote import RemoteVLFClient
+
+DEFAULT_BLOCK_SIZE = 64 * 1024
+DEFAULT_BLOCK_CACHE_BYTES = 128 * 1024**2
+
+
+class BlockCache(MemoryCache):
+    """Thread-safe LRU of file blocks with a byte budget."""
+
+    def __init__(self, max_bytes: int = DEFAULT_BLOCK_CACHE_BYTES):
+        super().__init__(max_bytes, sizer=len)
+
+
+_BLOCKS: Optional[BlockCache] = None
+_BLOCKS_LOCK = threading.Lock()
+
+
+def get_block_cache() -> BlockCache:
+    """Process-wide block cache shared by every :class:`RemoteFile`."""
+    global _BLOCKS
+    with _BLOCKS_LOCK:
+        if _BLOCKS is None:
+            _BLOCKS = BlockCache()
+        return _BLOCKS
+
+
+class RemoteFile(io.RawIOBase):
+    """
+    Read-only, seekable file object over a remote file.
+
+    Reads are rounded out to ``block_size`` blocks; blocks not in the
+    :class:`BlockCache` are fetched together in one pipelined ranged read,
+    so parsing a header and then a slice of samples transfers only those
+    blocks, and re-reading them (same or later rerun) costs nothing.
+    Blocks are keyed by the file's size and mtime, so a changed file is
+    never served stale.
+    """
+
+    def __init__(
+        self,
+        client: RemoteVLFClient,
+        remote_path: str,
+        *,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        cache: Optional[BlockCache] = None,
+    ):
+        super().__init__()
+        self._client = client
+        self._path = remote_path
+        self._block_size = block_size
+        self._cache = cache if cache is not None else get_block_cache()
+        self._size = client.stat(remote_path)[0]
+        self._key = client.version_key(remote_path)
+        self._pos = 0
+        self.transferred = 0  # bytes requested from the client (block misses)
+
+    @property
+    def name(self) -> str:
+        return self._path
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        if whence == os.SEEK_SET:
+            pos = offset
+        elif whence == os.SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == os.SEEK_END:
+            pos = self._size + offset
+        else:
+            raise ValueError(f"invalid whence: {whence}")
+        if pos < 0:
+            raise ValueError("negative seek position")
+        self._pos = pos
+        return pos
+
+    def readinto(self, b) -> int:
+        n = min(len(b), self._size - self._pos)
+        if n <= 0:
+            return 0
+        bs = self._block_size
+        first, last = self._pos // bs, (self._pos + n - 1) // bs
+        data = b"".join(self._blocks(first, last))
+        skip = self._pos - first * bs
+        chunk = data[skip:skip + n]  # short when the file shrank since opening
+        b[:len(chunk)] = chunk
+        self._pos += len(chunk)
+        return len(chunk)
+
+    def _blocks(self, first: int, last: int) -> List[bytes]:
+        bs = self._block_size
+        found: Dict[int, bytes] = {}
+        missing = []
+        for i in range(first, last + 1):
+            block = self._cache.get((self._key, i))
+            if block is None:
+                missing.append(i)
+            else:
+                found[i] = block
+        if not missing:
+            return [found[i] for i in range(first, last + 1)]
+
+        ranges = [(i * bs, min(bs, self._size - i * bs)) for i in missing]
+        fetched = self._client.read_ranges(self._path, ranges)
+        for i, (_, length), block in zip(missing, ranges, fetched):
+            found[i] = block
+            self.transferred += len(block)
+            if len(block) == length:  # never cache a block cut short
+                self._cache.put((self._key, i), block)
+        return self._contiguous(found, first, last)
+
+    def _contiguous(
+        self, found: Dict[int, bytes], first: int, last: int
+    ) -> List[bytes]:
+        """Blocks ``first..last`` up to the first missing or short one."""
+        out = []
+        for i in range(first, last + 1):
+            block = found.get(i)
+            if block is None:
+                break
+            out.append(block)
+            if len(block) < self._block_size:
+                break
+        return out
@@ -0,0 +1,334 @@
+# src/media/spectrogram.py
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import io
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from cache.disk import cache_dir
+from media.remote_file import RemoteFile
+from media.wav import WavFile, open_local
+from parser.frame_index import FrameIndex
+
+NFFT = 1024
+HOP = 512
+TILE_COLS = 256   # time columns per tile
+FACTOR = 4        # columns merged per zoom level
+MAX_LEVEL = 8
+FLOOR_DB = -120.0
+
+
+# ----------------------------------------------------------------------#
+# STFT
+# ----------------------------------------------------------------------#
+def stft_db(
+    samples: np.ndarray, nfft: int = NFFT, hop: int = HOP, chunk: int = 2048
+) -> np.ndarray:
+    """
+    Power spectrogram in dB, shape ``(frames, nfft // 2 + 1)``.
+
+    Frames are strided views over ``samples`` (no copy); they are
+    windowed and transformed ``chunk`` frames at a time, so memory stays
+    bounded whatever the recording length.
+    """
+    if samples.ndim > 1:
+        samples = samples[:, 0]
+    if len(samples) < nfft:
+        return np.empty((0, nfft // 2 + 1), np.float32)
+    frames = sliding_window_view(samples, nfft)[::hop]
+    window = np.hanning(nfft).astype(np.float32)
+    scale = 1.0 / (np.iinfo(samples.dtype).max if samples.dtype.kind in "iu" else 1.0)
+    out = np.empty((len(frames), nfft // 2 + 1), np.float32)
+    for c0 in range(0, len(frames), chunk):
+        block = frames[c0:c0 + chunk].astype(np.float32) * (window * scale)
+        power = np.abs(np.fft.rfft(block, axis=1)) ** 2
+        out[c0:c0 + chunk] = 10.0 * np.log10(power + 1e-20)
+    return np.maximum(out, FLOOR_DB)
+
+
+def freqs(sample_rate: int, nfft: int = NFFT) -> np.ndarray:
+    return np.fft.rfftfreq(nfft, 1.0 / sample_rate)
+
+
+# ----------------------------------------------------------------------#
+# per-file spectrograms (disk cache)
+# ----------------------------------------------------------------------#
+def _cache_path(version: str) -> str:
+    raw = f"{version}\0{NFFT}\0{HOP}".encode()
+    name = hashlib.sha256(raw).hexdigest() + ".npy"
+    return os.path.join(cache_dir("spectrogram", "files"), name)
+
+
+def _save(path: str, arr: np.ndarray) -> None:
+    fd, tmp = tempfile.mkstemp(prefix=".", suffix=".npy", dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, arr)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def local_version(path: str) -> str:
+    st = os.stat(path)
+    return f"{os.path.abspath(path)}\0{st.st_mtime_ns}\0{st.st_size}"
+
+
+def _compute_local(path: str) -> str:
+    """Worker: STFT of one local WAV into the disk cache (returns its path)."""
+    out = _cache_path(local_version(path))
+    if not os.path.exists(out):
+        _save(out, stft_db(open_local(path).samples).astype(np.float16))
+    return out
+
+
+def precompute(paths: Sequence[str], workers: Optional[int] = None) -> int:
+    """
+    Compute the spectrograms of local WAVs in parallel processes (one
+    file per task). Returns the number of files processed.
+    """
+    if not paths:
+        return 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return sum(1 for _ in pool.map(_compute_local, paths, chunksize=4))
+
+
+class LocalWavs:
+    """WAV access for :class:`TileStore` on local disk (``path`` rows)."""
+
+    def version(self, row: Mapping) -> str:
+        return local_version(row["path"])
+
+    def sample_rate(self, row: Mapping) -> int:
+        return open_local(row["path"]).info.sample_rate
+
+    def samples(self, row: Mapping) -> Tuple[np.ndarray, int]:
+        wav = open_local(row["path"])
+        return wav.samples, wav.info.sample_rate
+
+    def precompute(self, rows: Sequence[Mapping], workers: Optional[int] = None) -> int:
+        return precompute([r["path"] for r in rows], workers)
+
+
+class RemoteWavs:
+    """WAV access for :class:`TileStore` through a ``RemoteVLFClient``."""
+
+    def __init__(self, client):
+        self._client = client
+
+    def version(self, row: Mapping) -> str:
+        return self._client.version_key(row["remote_path"])
+
+    def sample_rate(self, row: Mapping) -> int:
+        # header blocks only
+        return WavFile(RemoteFile(self._client, row["remote_path"])).info.sample_rate
+
+    def samples(self, row: Mapping) -> Tuple[np.ndarray, int]:
+        wav = WavFile(io.BytesIO(self._client.fetch_wav_bytes(row["remote_path"])))
+        return wav.frames(0, wav.info.n_frames), wav.info.sample_rate
+
+    def precompute(self, rows: Sequence[Mapping], workers: Optional[int] = None) -> int:
+        return 0  # network-bound: computed on demand
+
+
+@functools.lru_cache(maxsize=32)
+def _load_file_spec(cache_path: str) -> np.ndarray:
+    return np.load(cache_path, mmap_mode="r")
+
+
+# assembled tiles shared by every TileStore in the process
+_TILES: "OrderedDict[str, np.ndarray]" = OrderedDict()
+_TILES_LOCK = threading.Lock()
+MEMORY_TILES = 128
+
+
+# ----------------------------------------------------------------------#
+# tiles
+# ----------------------------------------------------------------------#
+class TileStore:
+    """
+    Multi-resolution spectrogram tiles over a station's WAV index.
+
+    Level ``L`` has columns of ``HOP * 4**L`` samples aligned on the UTC
+    epoch; a tile is ``TILE_COLS`` consecutive columns (≈3 s at level 0,
+    ≈3.4 h at level 6). A tile is assembled from the per-file STFTs that
+    overlap it (max-pooled into its columns) and stored on disk under a
+    key that includes the versions of those files, so panning or zooming
+    to a seen region is a file read and new recordings invalidate only
+    the tiles they touch. Columns without audio are NaN.
+
+    File versions are looked up once per index: the catalogs rebuild
+    the index when their stamp changes, and :meth:`use` with the new
+    one drops the versions seen so far. A store can therefore live as
+    long as the session's station (e.g. in ``st.cache_resource``).
+    """
+
+    def __init__(
+        self,
+        wavs: FrameIndex,
+        source,
+        *,
+        sample_rate: Optional[int] = None,
+        max_file_seconds: float = 120.0,
+    ):
+        """
+        wavs              time index of the station's WAVs
+        source            :class:`LocalWavs` or :class:`RemoteWavs`
+        sample_rate       taken from the first WAV when omitted; files
+                          at another rate are left out
+        max_file_seconds  longest recording, to find files that started
+                          before a tile but overlap it
+        """
+        self._wavs = wavs
+        self._source = source
+        if sample_rate is None:
+            sample_rate = source.sample_rate(wavs[0]) if len(wavs) else 44_100
+        self.sample_rate = sample_rate
+        self._max_file_seconds = max_file_seconds
+        self._versions: Dict[str, str] = {}
+        self.stats = {"memory": 0, "disk": 0, "computed": 0}
+
+    def use(self, wavs: FrameIndex) -> None:
+        """Serve ``wavs`` from now on; a new index means new versions."""
+        if wavs is not self._wavs:
+            self._wavs, self._versions = wavs, {}
+
+    # ------------------------------------------------------------------#
+    # geometry
+    # ------------------------------------------------------------------#
+    def col_seconds(self, level: int) -> float:
+        return HOP * FACTOR**level / self.sample_rate
+
+    def tile_seconds(self, level: int) -> float:
+        return TILE_COLS * self.col_seconds(level)
+
+    def level_for(self, seconds: float, max_cols: int) -> int:
+        """Finest level that shows ``seconds`` in at most ``max_cols`` columns."""
+        for level in range(MAX_LEVEL + 1):
+            if seconds / self.col_seconds(level) <= max_cols:
+                return level
+        return MAX_LEVEL
+
+    def freqs(self) -> np.ndarray:
+        return freqs(self.sample_rate)
+
+    # ------------------------------------------------------------------#
+    # tiles
+    # ------------------------------------------------------------------#
+    def _sources(self, t0: float, t1: float) -> List[Mapping]:
+        lo = datetime.fromtimestamp(t0 - self._max_file_seconds, tz=timezone.utc)
+        hi = datetime.fromtimestamp(t1, tz=timezone.utc)
+        return list(self._wavs.window(lo, hi, include_end=False))
+
+    def _version(self, row: Mapping) -> str:
+        versions = self._versions
+        version = versions.get(row["filename"])
+        if version is None:
+            version = versions[row["filename"]] = self._source.version(row)
+        return version
+
+    def tile(self, level: int, index: int) -> np.ndarray:
+        """Tile ``index`` of ``level``: float16 dB, ``(TILE_COLS, nfreq)``."""
+        t0 = index * self.tile_seconds(level)
+        rows = self._sources(t0, t0 + self.tile_seconds(level))
+        versions = [self._version(r) for r in rows]
+        key = hashlib.sha256(
+            f"{level}\0{index}\0{NFFT}\0{HOP}\0{self.sample_rate}\0".encode()
+            + "\0".join(versions).encode()
+        ).hexdigest()
+
+        with _TILES_LOCK:
+            tile = _TILES.get(key)
+            if tile is not None:
+                _TILES.move_to_end(key)
+                self.stats["memory"] += 1
+                return tile
+
+        path = os.path.join(cache_dir("spectrogram", "tiles"), key + ".npy")
+        try:
+            tile = np.load(path)
+            self.stats["disk"] += 1
+        except (OSError, ValueError):
+            tile = self._assemble(level, t0, rows, versions)
+            _save(path, tile)
+            self.stats["computed"] += 1
+
+        with _TILES_LOCK:
+            _TILES[key] = tile
+            while len(_TILES) > MEMORY_TILES:
+                _TILES.popitem(last=False)
+        return tile
+
+    def _file_spec(self, row: Mapping, version: str) -> Optional[np.ndarray]:
+        path = _cache_path(version)
+        if not os.path.exists(path):
+            samples, sr = self._source.samples(row)
+            if sr != self.sample_rate:
+                return None
+            _save(path, stft_db(samples).astype(np.float16))
+        return _load_file_spec(path)
+
+    def _assemble(
+        self, level: int, t0: float, rows: Sequence[Mapping], versions: Sequence[str]
+    ) -> np.ndarray:
+        nfreq = NFFT // 2 + 1
+        tile = np.full((TILE_COLS, nfreq), -np.inf, np.float32)
+        col = self.col_seconds(level)
+        for row, version in zip(rows, versions):
+            spec = self._file_spec(row, version)
+            if spec is None or not len(spec):
+                continue
+            start = row["timestamp"].timestamp()
+            centres = start + (np.arange(len(spec)) * HOP + NFFT / 2) / self.sample_rate
+            target = np.floor((centres - t0) / col).astype(np.int64)
+            inside = (target >= 0) & (target < TILE_COLS)
+            if not inside.any():
+                continue
+            target, values = target[inside], np.asarray(spec[inside], np.float32)
+            # targets are non-decreasing: pool each run of equal columns
+            starts = np.flatnonzero(np.r_[True, target[1:] != target[:-1]])
+            pooled = np.maximum.reduceat(values, starts, axis=0)
+            cols = target[starts]
+            tile[cols] = np.maximum(tile[cols], pooled)
+        tile[np.isneginf(tile)] = np.nan
+        return tile.astype(np.float16)
+
+    def window(
+        self, start: datetime, end: datetime, max_cols: int = 768
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (column start times as ``datetime64[ms]``, dB values of shape
+        ``(cols, nfreq)``) for ``[start, end)`` at the finest level that
+        fits ``max_cols`` columns.
+        """
+        t0, t1 = start.timestamp(), end.timestamp()
+        level = self.level_for(t1 - t0, max_cols)
+        col, span = self.col_seconds(level), self.tile_seconds(level)
+        first, last = int(t0 // span), int(np.ceil(t1 / span))
+        data = np.concatenate([self.tile(level, i) for i in range(first, last)])
+        c0 = int((t0 - first * span) // col)
+        c1 = int(np.ceil((t1 - first * span) / col))
+        values = data[c0:c1]
+        secs = first * span + np.arange(c0, c0 + len(values)) * col
+        times = (secs * 1000).astype("int64").astype("datetime64[ms]")
+        return times, values
+
+    def precompute(
+        self, start: datetime, end: datetime, workers: Optional[int] = None
+    ) -> int:
+        """Compute the per-file spectrograms for ``[start, end)`` in parallel."""
+        rows = self._sources(start.timestamp(), end.timestamp())
+        return self._source.precompute(rows, workers)
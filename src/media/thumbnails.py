@@ -0,0 +1,194 @@
+# src/media/thumbnails.py
+
+from __future__ import annotations
+
+import hashlib
+import io
+import multiprocessing
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+from PIL import Image
+
+from cache.disk import DiskCache, cache_dir, local_key
+
+SIZES = (320, 640)  # longest edge in px: grid cell, wide cell
+QUALITY = 85
+DEFAULT_MAX_BYTES = 256 * 1024**2
+
+Source = Union[str, bytes]  # local path or encoded image
+
+
+def fit(size: Tuple[int, int], edge: int) -> Tuple[int, int]:
+    """``size`` scaled down so that its longest side is at most ``edge``."""
+    w, h = size
+    scale = min(1.0, edge / max(w, h))
+    return max(1, round(w * scale)), max(1, round(h * scale))
+
+
+def _open(src: Source) -> Image.Image:
+    return Image.open(io.BytesIO(src) if isinstance(src, bytes) else src)
+
+
+def decode_reduced(src: Source, edge: int) -> Image.Image:
+    """
+    Decode ``src`` at about ``edge`` px on its longest side. JPEGs are
+    scaled by the decoder itself (``Image.draft``: 1/2, 1/4 or 1/8 DCT
+    scaling), so a large frame is never decoded at full resolution just
+    to be shrunk.
+    """
+    im = _open(src)
+    target = fit(im.size, edge)
+    im.draft(im.mode, target)  # no-op for formats without reduced decoding
+    im = im.convert("RGB") if im.mode not in ("RGB", "L") else im
+    return im.resize(target, Image.Resampling.LANCZOS)
+
+
+def make_thumbnail(src: Source, edge: int) -> bytes:
+    """JPEG-encoded preview of ``src`` at ``edge`` px."""
+    out = io.BytesIO()
+    decode_reduced(src, edge).save(out, "JPEG", quality=QUALITY, optimize=True)
+    return out.getvalue()
+
+
+def _render(src: Source, sizes: Sequence[int]) -> Dict[int, bytes]:
+    """Worker: every size of one image, decoded once at the largest."""
+    size = _open(src).size  # header only
+    im = decode_reduced(src, max(sizes))
+    out = {}
+    for edge in sizes:
+        small = im.resize(fit(size, edge), Image.Resampling.LANCZOS)
+        buf = io.BytesIO()
+        small.save(buf, "JPEG", quality=QUALITY, optimize=True)
+        out[edge] = buf.getvalue()
+    return out
+
+
+def render_pool(workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """
+    Process pool for :meth:`Thumbnails.generate`, meant to be kept for the
+    life of the server. Workers are started by a fork server (spawned where
+    there is none) so they never inherit the server's threads and sockets.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    ctx = multiprocessing.get_context("forkserver" if "forkserver" in methods
+                                      else "spawn")
+    return ProcessPoolExecutor(max_workers=workers, mp_context=ctx)
+
+
+_CACHE: Optional[DiskCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_thumbnail_cache() -> DiskCache:
+    """Process-wide thumbnail store under ``cache_dir("thumbnails")``."""
+    global _CACHE
+    with _CACHE_LOCK:
+        if _CACHE is None:
+            _CACHE = DiskCache(cache_dir("thumbnails"), max_bytes=DEFAULT_MAX_BYTES)
+        return _CACHE
+
+
+class Thumbnails:
+    """
+    Grid-sized previews of spectrogram frames.
+
+    Previews are cached on disk by source version (path, size and mtime;
+    the remote version for SSH rows), so a replaced frame gets new ones.
+    :meth:`generate` fills the cache for many frames at once in a process
+    pool (see :func:`render_pool`); :meth:`thumbnail` makes a missing one
+    in-process with reduced JPEG decoding.
+    """
+
+    def __init__(self, client=None, *, cache: Optional[DiskCache] = None):
+        """
+        client  ``RemoteVLFClient`` for rows with ``remote_path``; local
+                rows are read from ``full_path``
+        cache   defaults to :func:`get_thumbnail_cache`
+        """
+        self._client = client
+        self._cache = cache if cache is not None else get_thumbnail_cache()
+
+    def _is_remote(self, row: Mapping) -> bool:
+        return self._client is not None and "remote_path" in row
+
+    def _version(self, row: Mapping) -> str:
+        if self._is_remote(row):
+            return self._client.version_key(row["remote_path"])
+        return local_key(row["full_path"])
+
+    @staticmethod
+    def _key(version: str, edge: int) -> str:
+        return hashlib.sha256(f"{version}\0{edge}".encode()).hexdigest()
+
+    def thumbnail(
+        self, row: Mapping, edge: int = SIZES[0], raw: Optional[bytes] = None
+    ) -> bytes:
+        """
+        Preview of ``row``, made (and cached) now when missing; ``raw`` are
+        the frame's bytes when the caller already has them.
+        """
+        key = self._key(self._version(row), edge)
+        data = self._cache.get(key)
+        if data is None:
+            if raw is None:
+                raw = (self._client.fetch_image_bytes(row["remote_path"])
+                       if self._is_remote(row) else None)
+            data = make_thumbnail(raw if raw is not None else row["full_path"], edge)
+            self._cache.put(key, data)
+        return data
+
+    def missing(
+        self, rows: Sequence[Mapping], sizes: Sequence[int] = SIZES
+    ) -> List[Mapping]:
+        """Rows lacking at least one of ``sizes``."""
+        return [
+            r for r in rows
+            if any(self._key(self._version(r), e) not in self._cache for e in sizes)
+        ]
+
+    def generate(
+        self,
+        rows: Sequence[Mapping],
+        pool: Executor,
+        sizes: Sequence[int] = SIZES,
+    ) -> int:
+        """
+        Make every size of every row that lacks one, one image per task
+        in ``pool`` (remote frames are fetched concurrently first).
+        Returns the number of frames processed.
+        """
+        todo = self.missing(rows, sizes)
+        if not todo:
+            return 0
+        if self._client is not None and "remote_path" in todo[0]:
+            fetched = self._client.fetch_many([r["remote_path"] for r in todo])
+            data = {res.remote_path: res.data for res in fetched if res.error is None}
+            todo = [r for r in todo if r["remote_path"] in data]
+            sources: List[Source] = [data[r["remote_path"]] for r in todo]
+        else:
+            sources = [r["full_path"] for r in todo]
+
+        sizes = list(sizes)
+        rendered = pool.map(_render, sources, [sizes] * len(sources), chunksize=4)
+        for row, thumbs in zip(todo, rendered):
+            self._store(row, thumbs)
+        return len(todo)
+
+    def make(self, row: Mapping, sizes: Sequence[int] = SIZES) -> bool:
+        """
+        Every size of one row, in this process (for background warm-up);
+        ``False`` when they were all cached already.
+        """
+        if not self.missing([row], sizes):
+            return False
+        raw = (self._client.fetch_image_bytes(row["remote_path"])
+               if self._is_remote(row) else None)
+        self._store(row, _render(raw if raw is not None else row["full_path"], sizes))
+        return True
+
+    def _store(self, row: Mapping, thumbs: Dict[int, bytes]) -> None:
+        version = self._version(row)
+        for edge, data in thumbs.items():
+            self._cache.put(self._key(version, edge), data)
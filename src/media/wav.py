@@ -0,0 +1,175 @@
+# src/media/wav.py
+
+from __future__ import annotations
+
+import os
+import struct
+import threading
+from collections import OrderedDict
+from typing import BinaryIO, NamedTuple, Tuple
+
+import numpy as np
+
+_PCM = 1
+_FLOAT = 3
+_EXTENSIBLE = 0xFFFE
+
+_DTYPES = {
+    (_PCM, 1): np.dtype("u1"),
+    (_PCM, 2): np.dtype("<i2"),
+    (_PCM, 4): np.dtype("<i4"),
+    (_FLOAT, 4): np.dtype("<f4"),
+    (_FLOAT, 8): np.dtype("<f8"),
+}
+
+
+class WavInfo(NamedTuple):
+    """Layout of a WAV file, enough to read any frame range directly."""
+
+    sample_rate: int
+    channels: int
+    dtype: np.dtype
+    data_offset: int  # byte offset of the first frame
+    n_frames: int     # frames actually present in the file
+
+    @property
+    def frame_bytes(self) -> int:
+        return self.channels * self.dtype.itemsize
+
+    @property
+    def duration(self) -> float:
+        return self.n_frames / self.sample_rate
+
+
+def read_info(f: BinaryIO) -> WavInfo:
+    """
+    Parse the RIFF header of a seekable WAV file object.
+
+    Only the header chunks are read. The frame count is capped by the
+    real file size, so recordings whose ``data`` chunk claims more bytes
+    than were written (the station's files are a few bytes short) still
+    open.
+    """
+    f.seek(0)
+    riff = f.read(12)
+    if len(riff) < 12 or riff[:4] != b"RIFF" or riff[8:12] != b"WAVE":
+        raise ValueError("not a RIFF/WAVE file")
+
+    fmt = None
+    while True:
+        head = f.read(8)
+        if len(head) < 8:
+            raise ValueError("no data chunk")
+        chunk_id, chunk_size = head[:4], struct.unpack("<I", head[4:])[0]
+        if chunk_id == b"fmt ":
+            body = f.read(chunk_size + (chunk_size & 1))
+            tag, channels, rate, _, _, bits = struct.unpack("<HHIIHH", body[:16])
+            if tag == _EXTENSIBLE and len(body) >= 26:
+                tag = struct.unpack("<H", body[24:26])[0]
+            fmt = (tag, channels, rate, bits)
+        elif chunk_id == b"data":
+            data_offset = f.tell()
+            break
+        else:
+            f.seek(chunk_size + (chunk_size & 1), os.SEEK_CUR)
+
+    if fmt is None:
+        raise ValueError("data chunk before fmt chunk")
+    tag, channels, rate, bits = fmt
+    dtype = _DTYPES.get((tag, bits // 8))
+    if dtype is None:
+        raise ValueError(f"unsupported WAV format {tag} with {bits}-bit samples")
+
+    file_size = f.seek(0, os.SEEK_END)
+    available = min(chunk_size, file_size - data_offset)
+    n_frames = max(0, available) // (channels * dtype.itemsize)
+    return WavInfo(rate, channels, dtype, data_offset, n_frames)
+
+
+def read_frames(f: BinaryIO, info: WavInfo, start: int, stop: int) -> np.ndarray:
+    """
+    Frames ``[start, stop)`` (clipped to the file) as an array of shape
+    ``(n,)`` for mono or ``(n, channels)``. Only those bytes are read.
+    """
+    start = min(max(0, start), info.n_frames)
+    stop = min(max(start, stop), info.n_frames)
+    f.seek(info.data_offset + start * info.frame_bytes)
+    raw = f.read((stop - start) * info.frame_bytes)
+    usable = len(raw) - len(raw) % info.frame_bytes
+    data = np.frombuffer(raw[:usable], dtype=info.dtype)
+    if info.channels > 1:
+        data = data.reshape(-1, info.channels)
+    return data
+
+
+# ----------------------------------------------------------------------#
+# readers
+# ----------------------------------------------------------------------#
+class WavFile:
+    """Frames of a WAV on any seekable file object, read on demand."""
+
+    def __init__(self, f: BinaryIO):
+        self.file = f
+        self.info = read_info(f)
+
+    def frames(self, start: int, stop: int) -> np.ndarray:
+        return read_frames(self.file, self.info, start, stop)
+
+
+class MappedWav:
+    """
+    Read-only memory map over the samples of a local WAV.
+
+    :attr:`samples` and :meth:`frames` are zero-copy NumPy views: pages
+    are loaded by the OS on first touch and shared by every session and
+    process mapping the same file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self.info = read_info(f)
+        info = self.info
+        if info.n_frames == 0:
+            samples = np.empty(0, dtype=info.dtype)
+        else:
+            samples = np.memmap(
+                path,
+                dtype=info.dtype,
+                mode="r",
+                offset=info.data_offset,
+                shape=(info.n_frames * info.channels,),
+            )
+        if info.channels > 1:
+            samples = samples.reshape(-1, info.channels)
+        self.samples = samples
+
+    def frames(self, start: int, stop: int) -> np.ndarray:
+        start = min(max(0, start), self.info.n_frames)
+        return np.asarray(self.samples[start:max(start, stop)])  # plain view
+
+
+_MAPPED: "OrderedDict[Tuple[str, int, int], MappedWav]" = OrderedDict()
+_MAPPED_LOCK = threading.Lock()
+MAX_MAPPED = 32
+
+
+def open_local(path: str) -> MappedWav:
+    """
+    Mapped view of a local WAV from a small per-process LRU of handles,
+    so reruns and concurrent sessions reuse one mapping per file. A file
+    rewritten on disk (new size or mtime) is mapped afresh.
+    """
+    st = os.stat(path)
+    key = (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+    with _MAPPED_LOCK:
+        wav = _MAPPED.get(key)
+        if wav is not None:
+            _MAPPED.move_to_end(key)
+            return wav
+    wav = MappedWav(path)
+    with _MAPPED_LOCK:
+        wav = _MAPPED.setdefault(key, wav)
+        while len(_MAPPED) > MAX_MAPPED:
+            _MAPPED.popitem(last=False)  # the map closes with its last view
+    return wav
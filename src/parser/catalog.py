@@ -0,0 +1,236 @@
+# src/parser/catalog.py
+
+from __future__ import annotations
+
+import os
+import sqlite3
+from contextlib import closing
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from parser.frame_table import FrameTable, Resolution
+from parser.parse_filenames import parse_filenames_bulk
+
+CATALOG_DIRNAME = ".cassandra"
+CATALOG_FILENAME = "catalog.sqlite"
+# bump whenever parsing changes what gets stored: older catalogs are rebuilt
+CATALOG_VERSION = 2
+
+# sub-folders of a source folder and the extension indexed in each
+FOLDERS = {
+    "LoRes": ".jpg",
+    "HiRes": ".jpg",
+    "Wav": ".wav",
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS frames (
+    station    TEXT    NOT NULL,
+    resolution TEXT    NOT NULL,
+    ts         INTEGER NOT NULL,
+    filename   TEXT    NOT NULL,
+    PRIMARY KEY (resolution, filename)
+);
+CREATE INDEX IF NOT EXISTS frames_by_time
+    ON frames (station, resolution, ts);
+CREATE TABLE IF NOT EXISTS folders (
+    resolution TEXT    PRIMARY KEY,
+    mtime_ns   INTEGER NOT NULL
+);
+"""
+
+
+def _epoch(ts: datetime) -> int:
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return int(ts.timestamp())
+
+
+class Catalog:
+    """
+    Persistent SQLite index of the frames under a source folder
+    (``<src_folder>/LoRes``, ``HiRes`` and ``Wav``).
+
+    The database lives in ``<src_folder>/.cassandra/catalog.sqlite``.
+    :meth:`refresh` only lists a sub-folder when its mtime changed since
+    the last refresh and only parses names it has not seen before, so a
+    rerun costs three ``stat`` calls plus an indexed range query.
+    """
+
+    def __init__(self, src_folder: str, db_path: Optional[str] = None):
+        self._src_folder = src_folder
+        self._db_path = db_path or os.path.join(
+            src_folder, CATALOG_DIRNAME, CATALOG_FILENAME
+        )
+        os.makedirs(os.path.dirname(self._db_path), exist_ok=True)
+        with closing(self._connect()) as con, con:
+            (version,) = con.execute("PRAGMA user_version").fetchone()
+            if version != CATALOG_VERSION:
+                con.executescript(
+                    "DROP TABLE IF EXISTS frames; DROP TABLE IF EXISTS folders;"
+                )
+            con.executescript(_SCHEMA)
+            con.execute(f"PRAGMA user_version = {CATALOG_VERSION}")
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self._db_path)
+
+    # ------------------------------------------------------------------#
+    # incremental update
+    # ------------------------------------------------------------------#
+    def refresh(self) -> int:
+        """
+        Bring the catalog up to date with the folders on disk.
+        Returns the number of rows added or removed.
+        """
+        changed = 0
+        with closing(self._connect()) as con, con:
+            for resolution in FOLDERS:
+                changed += self._refresh_folder(con, resolution)
+        return changed
+
+    def _refresh_folder(self, con: sqlite3.Connection, resolution: str) -> int:
+        directory = os.path.join(self._src_folder, resolution)
+        try:
+            mtime_ns = os.stat(directory).st_mtime_ns
+        except FileNotFoundError:
+            mtime_ns = None
+
+        row = con.execute(
+            "SELECT mtime_ns FROM folders WHERE resolution = ?", (resolution,)
+        ).fetchone()
+        if row is not None and row[0] == mtime_ns:
+            return 0
+
+        ext = FOLDERS[resolution]
+        on_disk = set()
+        if mtime_ns is not None:
+            on_disk = {
+                fn for fn in os.listdir(directory) if fn.lower().endswith(ext)
+            }
+        known = {
+            fn
+            for (fn,) in con.execute(
+                "SELECT filename FROM frames WHERE resolution = ?", (resolution,)
+            )
+        }
+
+        gone = known - on_disk
+        con.executemany(
+            "DELETE FROM frames WHERE resolution = ? AND filename = ?",
+            ((resolution, fn) for fn in gone),
+        )
+        rows = list(self._parse_new(directory, resolution, on_disk - known))
+        con.executemany(
+            "INSERT OR REPLACE INTO frames (station, resolution, ts, filename) "
+            "VALUES (?, ?, ?, ?)",
+            rows,
+        )
+
+        if mtime_ns is None:
+            con.execute("DELETE FROM folders WHERE resolution = ?", (resolution,))
+        else:
+            con.execute(
+                "INSERT OR REPLACE INTO folders (resolution, mtime_ns) "
+                "VALUES (?, ?)",
+                (resolution, mtime_ns),
+            )
+        return len(gone) + len(rows)
+
+    @staticmethod
+    def _parse_new(directory: str, resolution: str, names: Iterable[str]):
+        names = sorted(names)
+        if not names:
+            return
+        expected = Resolution.parse(resolution)
+
+        reference = None
+        if expected == Resolution.WAV:
+            # WAV names carry only the day of month: anchor them on the mtime
+            mtimes = [
+                int(os.path.getmtime(os.path.join(directory, fn))) for fn in names
+            ]
+            reference = np.array(mtimes, dtype="datetime64[s]")
+
+        parsed = parse_filenames_bulk(names, reference=reference)
+        ok = parsed.valid & (parsed.resolution == expected)
+        epochs = parsed.timestamp.astype(np.int64)
+
+        for i, fn in enumerate(names):
+            if ok[i]:
+                yield str(parsed.station[i]), resolution, int(epochs[i]), fn
+            elif reference is not None:
+                # unrecognised WAV name: keep the file mtime
+                yield fn.split("_", 1)[0], resolution, int(mtimes[i]), fn
+
+    def stamp(self) -> tuple:
+        """Folder mtimes as of the last refresh; changes whenever rows do."""
+        with closing(self._connect()) as con:
+            return tuple(
+                con.execute(
+                    "SELECT resolution, mtime_ns FROM folders ORDER BY resolution"
+                ).fetchall()
+            )
+
+    # ------------------------------------------------------------------#
+    # queries
+    # ------------------------------------------------------------------#
+    def table(
+        self,
+        station: Optional[str],
+        resolution: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> FrameTable:
+        """
+        Frames for ``station``/``resolution`` with
+        ``start <= timestamp <= end`` (either bound optional) as a
+        time-sorted :class:`FrameTable`. ``station=None`` returns every
+        station in the folder (e.g. a mirror of one remote station).
+
+        Image rows carry ``full_path`` like :func:`index_local_images`,
+        WAV rows carry ``path`` and ``filename`` like the local WAV loader.
+        """
+        sql = "SELECT ts, filename, station FROM frames WHERE resolution = ?"
+        args: list = [resolution]
+        if station is not None:
+            sql += " AND station = ?"
+            args.append(station)
+        if start is not None:
+            sql += " AND ts >= ?"
+            args.append(_epoch(start))
+        if end is not None:
+            sql += " AND ts <= ?"
+            args.append(_epoch(end))
+        sql += " ORDER BY ts, filename"
+
+        with closing(self._connect()) as con:
+            rows = con.execute(sql, args).fetchall()
+
+        table = FrameTable.from_columns(
+            station=station or "",
+            resolution=Resolution.parse(resolution),
+            folder=os.path.join(self._src_folder, resolution, ""),
+            ts=np.fromiter((r[0] for r in rows), dtype=np.int64, count=len(rows)),
+            names=[r[1] for r in rows],
+            path_key="path" if resolution == "Wav" else "full_path",
+        )
+        if station is None and rows:
+            stations, codes = np.unique(
+                np.array([r[2] for r in rows], dtype=str), return_inverse=True
+            )
+            table.stations = tuple(str(s) for s in stations)
+            table.station = codes.astype(np.uint16)
+        return table
+
+    def query(
+        self,
+        station: Optional[str],
+        resolution: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> List[Dict]:
+        """Same as :meth:`table` but as a list of plain dicts."""
+        return [dict(row) for row in self.table(station, resolution, start, end)]
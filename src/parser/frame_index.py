@@ -0,0 +1,166 @@
+# src/parser/frame_index.py
+
+from __future__ import annotations
+
+from datetime import date, datetime, time, timezone
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+from parser.frame_table import FrameRow, FrameTable
+
+_HOUR = np.timedelta64(1, "h")
+_DAY = np.timedelta64(1, "D")
+
+
+def to_datetime64(ts: datetime) -> np.datetime64:
+    """UTC ``datetime`` (naive means UTC) → ``datetime64[s]``."""
+    if ts.tzinfo is not None:
+        ts = ts.astimezone(timezone.utc).replace(tzinfo=None)
+    return np.datetime64(ts, "s")
+
+
+def from_datetime64(ts: np.datetime64) -> datetime:
+    """``datetime64`` → UTC-aware ``datetime``."""
+    secs = int(ts.astype("datetime64[s]").astype(np.int64))
+    return datetime.fromtimestamp(secs, tz=timezone.utc)
+
+
+class FrameIndex:
+    """
+    Frames sorted by time: a :class:`FrameTable` whose ``ts`` column is
+    viewed as a ``datetime64[s]`` array.
+
+    Every time query is a ``searchsorted`` on the timestamp array, so
+    selecting a window, an hour or the nearest frame costs O(log n)
+    whatever the size of the archive. Iterating or indexing yields
+    dict-like :class:`FrameRow` views, so an index can stand in for the
+    sorted lists the tabs used to receive.
+    """
+
+    def __init__(self, table: FrameTable):
+        """``table`` must already be sorted by ``ts``."""
+        self._table = table
+        self._ts = table.ts.view("datetime64[s]")
+        self._days: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_table(cls, table: FrameTable) -> "FrameIndex":
+        """Build from a table in any order."""
+        if len(table) and np.any(table.ts[1:] < table.ts[:-1]):
+            table = table.take(np.argsort(table.ts, kind="stable"))
+        return cls(table)
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict]) -> "FrameIndex":
+        """Build from dicts with a ``timestamp`` key (any order)."""
+        return cls.from_table(FrameTable.from_records(records))
+
+    # ------------------------------------------------------------------#
+    # sequence protocol
+    # ------------------------------------------------------------------#
+    def __len__(self) -> int:
+        return len(self._ts)
+
+    def __iter__(self) -> Iterator[FrameRow]:
+        return iter(self._table)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):  # contiguous pages, e.g. for grids
+            lo, hi, step = i.indices(len(self))
+            if step != 1:
+                raise ValueError("FrameIndex slices must be contiguous")
+            return self._slice(lo, max(lo, hi))
+        return self._table[i]
+
+    def __getstate__(self):
+        return {"table": self._table}
+
+    def __setstate__(self, state):
+        self.__init__(state["table"])
+
+    @property
+    def table(self) -> FrameTable:
+        return self._table
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        return self._ts
+
+    def _slice(self, lo: int, hi: int) -> "FrameIndex":
+        return FrameIndex(self._table.take(slice(lo, hi)))
+
+    # ------------------------------------------------------------------#
+    # time queries
+    # ------------------------------------------------------------------#
+    def window(
+        self, start: datetime, end: datetime, *, include_end: bool = True
+    ) -> "FrameIndex":
+        """Frames with ``start <= ts <= end`` (``< end`` if not ``include_end``)."""
+        lo = np.searchsorted(self._ts, to_datetime64(start), side="left")
+        side = "right" if include_end else "left"
+        hi = np.searchsorted(self._ts, to_datetime64(end), side=side)
+        return self._slice(int(lo), int(max(lo, hi)))
+
+    def nearest(self, ts: datetime) -> Optional[FrameRow]:
+        """The frame closest in time to ``ts`` (earlier one on ties)."""
+        if not len(self):
+            return None
+        t = to_datetime64(ts)
+        i = int(np.searchsorted(self._ts, t, side="left"))
+        if i == len(self):
+            return self._table[i - 1]
+        if i > 0 and t - self._ts[i - 1] <= self._ts[i] - t:
+            return self._table[i - 1]
+        return self._table[i]
+
+    def hour(self, ts: datetime) -> Optional[FrameRow]:
+        """First frame inside the UTC hour that contains ``ts``."""
+        h0 = to_datetime64(ts).astype("datetime64[h]")
+        i = int(np.searchsorted(self._ts, h0, side="left"))
+        if i < len(self) and self._ts[i] < h0 + _HOUR:
+            return self._table[i]
+        return None
+
+    def days(self) -> List[date]:
+        """Sorted distinct UTC dates that have at least one frame."""
+        if self._days is None:
+            self._days = np.unique(self._ts.astype("datetime64[D]"))
+        return [d.item() for d in self._days]
+
+    def day(self, day: date) -> "FrameIndex":
+        """Frames on the given UTC date."""
+        d0 = np.datetime64(day, "D")
+        lo = np.searchsorted(self._ts, d0, side="left")
+        hi = np.searchsorted(self._ts, d0 + _DAY, side="left")
+        return self._slice(int(lo), int(hi))
+
+    def hours(self, day: date) -> List[datetime]:
+        """Sorted distinct UTC hour starts with a frame on ``day``."""
+        hrs = np.unique(self.day(day).timestamps.astype("datetime64[h]"))
+        return [from_datetime64(h) for h in hrs]
+
+    def span(self) -> Optional[tuple[datetime, datetime]]:
+        """(first, last) timestamp, or ``None`` when empty."""
+        if not len(self):
+            return None
+        return from_datetime64(self._ts[0]), from_datetime64(self._ts[-1])
+
+
+def merged_days(indexes: Iterable[FrameIndex]) -> List[date]:
+    """Sorted union of :meth:`FrameIndex.days` over several indexes."""
+    out: set = set()
+    for ix in indexes:
+        out.update(ix.days())
+    return sorted(out)
+
+
+def day_bounds(indexes: Iterable[FrameIndex], day: date) -> Optional[tuple[time, time]]:
+    """Earliest and latest time of day with a frame on ``day``, if any."""
+    spans = [ix.day(day).span() for ix in indexes]
+    spans = [s for s in spans if s is not None]
+    if not spans:
+        return None
+    first = min(s[0] for s in spans)
+    last = max(s[1] for s in spans)
+    return first.time(), last.time()
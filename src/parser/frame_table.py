@@ -0,0 +1,290 @@
+# src/parser/frame_table.py
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from datetime import datetime, timezone
+from enum import IntEnum
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+PATH_KEYS = ("full_path", "remote_path", "path")
+_COLUMNS = ("station", "resolution", "ts", "folder", "name_off", "name_len")
+
+
+class Resolution(IntEnum):
+    LORES = 0
+    HIRES = 1
+    WAV = 2
+
+    @property
+    def label(self) -> str:
+        return _LABELS[self]
+
+    @classmethod
+    def parse(cls, label: str) -> "Resolution":
+        return _BY_LABEL[label]
+
+
+_LABELS = {Resolution.LORES: "LoRes", Resolution.HIRES: "HiRes", Resolution.WAV: "Wav"}
+_BY_LABEL = {v: k for k, v in _LABELS.items()}
+
+
+def _split_path(path: str) -> Tuple[str, str]:
+    """(directory incl. trailing separator, basename) for ``/`` or ``\\``."""
+    cut = max(path.rfind("/"), path.rfind("\\")) + 1
+    return path[:cut], path[cut:]
+
+
+def _epoch(ts: datetime) -> int:
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return int(ts.timestamp())
+
+
+class FrameTable:
+    """
+    Struct-of-arrays store for frame metadata.
+
+    One row per file, held in parallel NumPy columns:
+
+    ``station``     uint16 code into :attr:`stations`
+    ``resolution``  uint8 :class:`Resolution`
+    ``ts``          int64 epoch seconds (UTC)
+    ``folder``      uint16 code into :attr:`folders` (directory prefix)
+    ``name_off``    int64 offset of the file name in the shared ``pool``
+    ``name_len``    uint16 length of the file name in ``pool``
+
+    File names live once in a single UTF-8 byte pool, so a row costs
+    ~20 bytes plus its name instead of a dict, a ``datetime`` and three
+    strings. Pickling a table is a handful of buffer copies.
+    Rows are exposed through :class:`FrameRow`, a read-only mapping with
+    the keys of the old per-file dicts.
+    """
+
+    def __init__(
+        self,
+        *,
+        stations: Sequence[str],
+        folders: Sequence[str],
+        pool: bytes,
+        path_key: str,
+        station: np.ndarray,
+        resolution: np.ndarray,
+        ts: np.ndarray,
+        folder: np.ndarray,
+        name_off: np.ndarray,
+        name_len: np.ndarray,
+    ):
+        self.stations = tuple(stations)
+        self.folders = tuple(folders)
+        self.pool = pool
+        self.path_key = path_key
+        self.station = np.asarray(station, dtype=np.uint16)
+        self.resolution = np.asarray(resolution, dtype=np.uint8)
+        self.ts = np.asarray(ts, dtype=np.int64)
+        self.folder = np.asarray(folder, dtype=np.uint16)
+        self.name_off = np.asarray(name_off, dtype=np.int64)
+        self.name_len = np.asarray(name_len, dtype=np.uint16)
+
+    # ------------------------------------------------------------------#
+    # construction
+    # ------------------------------------------------------------------#
+    @classmethod
+    def empty(cls, path_key: str = "full_path") -> "FrameTable":
+        return cls.from_columns(
+            station="", resolution=Resolution.LORES, folder="",
+            ts=np.empty(0, np.int64), names=[], path_key=path_key,
+        )
+
+    @classmethod
+    def from_columns(
+        cls,
+        *,
+        station: str,
+        resolution: Resolution,
+        folder: str,
+        ts: np.ndarray,
+        names: Sequence[str],
+        path_key: str = "full_path",
+    ) -> "FrameTable":
+        """
+        Single station / resolution / folder fast path: ``folder`` is the
+        directory prefix (with trailing separator) shared by all ``names``.
+        """
+        n = len(names)
+        encoded = [nm.encode("utf-8") for nm in names]
+        lens = np.fromiter((len(b) for b in encoded), dtype=np.int64, count=n)
+        offs = np.zeros(n, dtype=np.int64)
+        if n:
+            np.cumsum(lens[:-1], out=offs[1:])
+        return cls(
+            stations=[station],
+            folders=[folder],
+            pool=b"".join(encoded),
+            path_key=path_key,
+            station=np.zeros(n, np.uint16),
+            resolution=np.full(n, int(resolution), np.uint8),
+            ts=np.asarray(ts, dtype=np.int64),
+            folder=np.zeros(n, np.uint16),
+            name_off=offs,
+            name_len=lens,
+        )
+
+    @classmethod
+    def from_records(
+        cls, records: Iterable[Dict], path_key: Optional[str] = None
+    ) -> "FrameTable":
+        """
+        Pack the per-file dicts produced by the listers. Station and
+        resolution default to the filename prefix and ``Wav``.
+        """
+        records = list(records)
+        if path_key is None:
+            first = records[0] if records else {}
+            path_key = next((k for k in PATH_KEYS if k in first), "full_path")
+
+        stations: Dict[str, int] = {}
+        folders: Dict[str, int] = {}
+        codes, res, ts, fcodes, names = [], [], [], [], []
+        for rec in records:
+            folder, name = _split_path(rec.get(path_key, ""))
+            if not name:
+                name = rec.get("original_filename") or rec.get("filename", "")
+            stn = rec.get("station") or name.split("_", 1)[0]
+            codes.append(stations.setdefault(stn, len(stations)))
+            fcodes.append(folders.setdefault(folder, len(folders)))
+            res.append(Resolution.parse(rec.get("resolution", "Wav")))
+            ts.append(_epoch(rec["timestamp"]))
+            names.append(name)
+
+        table = cls.from_columns(
+            station="", resolution=Resolution.LORES, folder="",
+            ts=np.asarray(ts, np.int64), names=names, path_key=path_key,
+        )
+        table.stations = tuple(stations)
+        table.folders = tuple(folders)
+        table.station = np.asarray(codes, np.uint16)
+        table.resolution = np.asarray(res, np.uint8)
+        table.folder = np.asarray(fcodes, np.uint16)
+        return table
+
+    @classmethod
+    def concat(cls, tables: Sequence["FrameTable"]) -> "FrameTable":
+        """Stack tables (same ``path_key``), remapping station/folder codes."""
+        if not tables:
+            return cls.empty()
+        stations: Dict[str, int] = {}
+        folders: Dict[str, int] = {}
+        cols: Dict[str, List[np.ndarray]] = {k: [] for k in _COLUMNS}
+        pools, base = [], 0
+        for t in tables:
+            smap = np.array(
+                [stations.setdefault(s, len(stations)) for s in t.stations] or [0],
+                np.uint16,
+            )
+            fmap = np.array(
+                [folders.setdefault(f, len(folders)) for f in t.folders] or [0],
+                np.uint16,
+            )
+            cols["station"].append(smap[t.station])
+            cols["folder"].append(fmap[t.folder])
+            cols["resolution"].append(t.resolution)
+            cols["ts"].append(t.ts)
+            cols["name_off"].append(t.name_off + base)
+            cols["name_len"].append(t.name_len)
+            pools.append(t.pool)
+            base += len(t.pool)
+        return cls(
+            stations=list(stations),
+            folders=list(folders),
+            pool=b"".join(pools),
+            path_key=tables[0].path_key,
+            **{k: np.concatenate(v) for k, v in cols.items()},
+        )
+
+    # ------------------------------------------------------------------#
+    # row access
+    # ------------------------------------------------------------------#
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    def __iter__(self) -> Iterator["FrameRow"]:
+        for i in range(len(self)):
+            yield FrameRow(self, i)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return self.take(np.arange(len(self))[i])
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError(i)
+        return FrameRow(self, i)
+
+    def take(self, idx) -> "FrameTable":
+        """Rows at ``idx`` (index array, mask or slice); pool is shared."""
+        return FrameTable(
+            stations=self.stations,
+            folders=self.folders,
+            pool=self.pool,
+            path_key=self.path_key,
+            **{c: getattr(self, c)[idx] for c in _COLUMNS},
+        )
+
+    def name(self, i: int) -> str:
+        off = int(self.name_off[i])
+        return self.pool[off:off + int(self.name_len[i])].decode("utf-8")
+
+    def path(self, i: int) -> str:
+        return self.folders[self.folder[i]] + self.name(i)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate in-memory footprint of the columns and pools."""
+        return (
+            sum(getattr(self, c).nbytes for c in _COLUMNS)
+            + len(self.pool)
+            + sum(len(s) for s in self.stations + self.folders)
+        )
+
+
+class FrameRow(Mapping):
+    """Read-only dict view of one :class:`FrameTable` row."""
+
+    __slots__ = ("_table", "_i")
+
+    def __init__(self, table: FrameTable, i: int):
+        self._table = table
+        self._i = i
+
+    def _keys(self) -> Tuple[str, ...]:
+        t = self._table
+        if t.resolution[self._i] == Resolution.WAV:
+            return ("station", "timestamp", "filename", t.path_key)
+        return ("station", "resolution", "timestamp", "original_filename", t.path_key)
+
+    def __getitem__(self, key: str):
+        t, i = self._table, self._i
+        if key == "timestamp":
+            return datetime.fromtimestamp(int(t.ts[i]), tz=timezone.utc)
+        if key == "station":
+            return t.stations[t.station[i]]
+        if key == "resolution" and t.resolution[i] != Resolution.WAV:
+            return Resolution(int(t.resolution[i])).label
+        if key in ("original_filename", "filename") and key in self._keys():
+            return t.name(i)
+        if key == t.path_key:
+            return t.path(i)
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys())
+
+    def __len__(self) -> int:
+        return len(self._keys())
+
+    def __repr__(self) -> str:
+        return f"FrameRow({dict(self)!r})"
@@ -3,7 +3,17 @@
 import os
 import re
 from datetime import datetime, timezone
-from typing import Dict, Optional
+from typing import Dict, NamedTuple, Optional, Sequence, Union
+
+import numpy as np
+
+from parser.frame_table import Resolution
+
+# 1) station = alphanumeric (e.g. ExperimentalG4)
+# 2) resolution = LoRes or HiRes
+# 3) literal 't'
+# 4) underscore + dt_str (6-digit date + 'UTC' + 4–6 digit time)
+_PATTERN = re.compile(r"^([A-Za-z0-9]+)_(LoRes|HiRes)t_(\d{6}UTC\d{4,6})\.jpg$")
 
 
 def parse_filename(filename: str) -> Optional[Dict]:
@@ -22,12 +32,7 @@ def parse_filename(filename: str) -> Optional[Dict]:
     or None if it doesn't match.
     """
     base = os.path.basename(filename)
-    # 1) station = alphanumeric (e.g. ExperimentalG4)
-    # 2) resolution = LoRes or HiRes
-    # 3) literal 't'
-    # 4) underscore + dt_str (6-digit date + 'UTC' + 4–6 digit time)
-    pat = r"^([A-Za-z0-9]+)_(LoRes|HiRes)t_(\d{6}UTC\d{4,6})\.jpg$"
-    m = re.match(pat, base)
+    m = _PATTERN.match(base)
     if not m:
         return None
 
@@ -67,3 +72,188 @@ def parse_filename(filename: str) -> Optional[Dict]:
         "timestamp": ts,
         "original_filename": base,
     }
+
+
+# ─────────────────────────────────────────────────────────────────────
+# bulk parsing
+# ─────────────────────────────────────────────────────────────────────
+# Everything after the first "_" has a fixed width per naming scheme,
+# so a listing can be parsed as a character matrix: literals are
+# compared column-wise and digits are read from fixed columns.
+#   "D" day, "M" month, "Y" year, "h" hour, "m" minute, "S" second
+# (letters that never occur in the literal parts)
+# Image times are 4 or 6 digits in either resolution, like _PATTERN;
+# anything else _PATTERN accepts is left to parse_filename.
+_LAYOUTS = (
+    (Resolution.HIRES, "HiRest_DDMMYYUTChhmmSS.jpg"),
+    (Resolution.HIRES, "HiRest_DDMMYYUTChhmm.jpg"),
+    (Resolution.LORES, "LoRest_DDMMYYUTChhmm.jpg"),
+    (Resolution.LORES, "LoRest_DDMMYYUTChhmmSS.jpg"),
+    (Resolution.WAV, "Audio_DDUTChhmmSS.wav"),
+)
+_FIELDS = "DMYhmS"
+# WAV names only carry the day of month; a file must not be dated
+# later than its reference time by more than this
+_WAV_SLACK = np.timedelta64(1, "h")
+
+
+class ParsedNames(NamedTuple):
+    """Column-wise result of :func:`parse_filenames_bulk`."""
+
+    station: np.ndarray  # str, "" where rejected
+    resolution: np.ndarray  # uint8 Resolution codes
+    timestamp: np.ndarray  # datetime64[s] UTC, NaT where rejected
+    valid: np.ndarray  # bool
+
+    @property
+    def rejected(self) -> np.ndarray:
+        return ~self.valid
+
+
+def _digits(mat: np.ndarray, layout: str, field: str) -> Optional[np.ndarray]:
+    cols = [i for i, c in enumerate(layout) if c == field]
+    if not cols:
+        return None
+    out = np.zeros(len(mat), dtype=np.int64)
+    for c in cols:
+        out = out * 10 + (mat[:, c].astype(np.int64) - ord("0"))
+    return out
+
+
+def _month_start(year: np.ndarray, month: np.ndarray) -> np.ndarray:
+    return ((year - 1970) * 12 + month - 1).astype("datetime64[M]")
+
+
+def _days_in_month(months: np.ndarray) -> np.ndarray:
+    days = (months + 1).astype("datetime64[D]") - months.astype("datetime64[D]")
+    return days.astype(np.int64)
+
+
+def _wav_dates(
+    day: np.ndarray, clock: np.ndarray, reference: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Latest date with day-of-month ``day`` not after ``reference`` (plus
+    slack). Returns (timestamp, ok).
+    """
+    months = reference.astype("datetime64[M]")
+    ts = np.full(len(day), np.datetime64("NaT"), dtype="datetime64[s]")
+    ok = np.zeros(len(day), dtype=bool)
+    # a day-of-month like 31 may need to look back more than one month
+    for _ in range(3):
+        fits = ~ok & (day <= _days_in_month(months))
+        cand = months.astype("datetime64[D]") + (day - 1) + clock
+        hit = fits & (cand <= reference + _WAV_SLACK)
+        ts[hit] = cand[hit]
+        ok |= hit
+        months = months - 1
+    return ts, ok
+
+
+def parse_filenames_bulk(
+    names: Sequence[str],
+    reference: Union[None, datetime, np.ndarray] = None,
+) -> ParsedNames:
+    """
+    Vectorised :func:`parse_filename` for a whole directory listing.
+
+    Understands the LoRes/HiRes JPEG names and the audio names
+    ``<station>_Audio_DDUTChhmmss.wav``. WAV names carry only the day of
+    month, so month and year come from ``reference`` (one datetime, or
+    an array aligned with ``names`` such as the file mtimes; default
+    now): the latest matching date not after it.
+
+    Names may include a directory. Image names the fixed layouts do not
+    cover go through :func:`parse_filename`, so both parsers always
+    agree. Names that do not match, or encode an impossible date, are
+    flagged in ``rejected``.
+    """
+    if any("/" in nm or "\\" in nm for nm in names):
+        names = [nm[max(nm.rfind("/"), nm.rfind("\\")) + 1:] for nm in names]
+    n = len(names)
+    if not n:
+        return ParsedNames(
+            np.empty(0, dtype=str),
+            np.empty(0, dtype=np.uint8),
+            np.empty(0, dtype="datetime64[s]"),
+            np.empty(0, dtype=bool),
+        )
+    try:
+        arr = np.array(names, dtype="S")
+    except UnicodeEncodeError:
+        # non-ASCII names can never match; "?" keeps them rejected
+        arr = np.array([nm.encode("ascii", "replace") for nm in names], dtype="S")
+    # one row of bytes per name, NUL-padded on the right
+    full = arr.dtype.itemsize
+    chars = arr.view(np.uint8).reshape(n, full)
+    sep = np.char.find(arr, b"_")
+    lengths = np.char.str_len(arr)
+
+    if reference is None:
+        reference = datetime.now(timezone.utc)
+    if isinstance(reference, datetime):
+        if reference.tzinfo is not None:
+            reference = reference.astimezone(timezone.utc).replace(tzinfo=None)
+        reference = np.full(n, np.datetime64(reference, "s"))
+    reference = np.asarray(reference, dtype="datetime64[s]")
+
+    station = np.zeros(n, dtype=f"U{max(int(sep.max()), 1)}")
+    timestamp = np.full(n, np.datetime64("NaT"), dtype="datetime64[s]")
+    resolution = np.zeros(n, dtype=np.uint8)
+    valid = np.zeros(n, dtype=bool)
+
+    # a listing holds few distinct station-name lengths: within each
+    # group every field sits at a fixed column
+    for head_len in np.flatnonzero(np.bincount(sep[sep > 0], minlength=1)):
+        in_group = sep == head_len
+        for res, layout in _LAYOUTS:
+            rows = np.flatnonzero(in_group & (lengths == head_len + 1 + len(layout)))
+            if not len(rows):
+                continue
+            head = chars[rows, :head_len]
+            sub = chars[rows, head_len + 1:head_len + 1 + len(layout)]
+
+            # literals must match, fields are digits, station is [A-Za-z0-9]+
+            is_field = np.array([c in _FIELDS for c in layout])
+            literal = "".join(c for c in layout if c not in _FIELDS).encode()
+            lits = np.ascontiguousarray(sub[:, ~is_field]).view(f"S{len(literal)}")
+            ok = lits.ravel() == literal
+            # uint8 arithmetic wraps around below "0" / "A"
+            ok &= (sub[:, is_field] - ord("0")).max(axis=1) < 10
+            upper = head & 0xDF  # ASCII letters folded to upper case
+            bad = ((head - ord("0")) >= 10) & ((upper - ord("A")) >= 26)
+            ok &= bad.view(np.uint8).max(axis=1) == 0
+            rows, head, sub = rows[ok], head[ok], sub[ok]
+
+            f = {c: _digits(sub, layout, c) for c in _FIELDS}
+            ss = f["S"] if f["S"] is not None else np.zeros(len(rows), np.int64)
+            ok = (f["h"] < 24) & (f["m"] < 60) & (ss < 60) & (f["D"] >= 1)
+            clock = (f["h"] * 3600 + f["m"] * 60 + ss).astype("timedelta64[s]")
+
+            if res == Resolution.WAV:
+                ts, hit = _wav_dates(f["D"], clock, reference[rows])
+                ok &= hit
+            else:
+                month = np.clip(f["M"], 1, 12)
+                months = _month_start(2000 + f["Y"], month)
+                ok &= (f["M"] >= 1) & (f["M"] <= 12)
+                ok &= f["D"] <= _days_in_month(months)
+                ts = months.astype("datetime64[D]") + (f["D"] - 1) + clock
+
+            rows = rows[ok]
+            station[rows] = np.ascontiguousarray(head[ok]).view(f"S{head_len}").ravel()
+            timestamp[rows] = ts[ok]
+            resolution[rows] = res
+            valid[rows] = True
+
+    # the rare image names outside the layouts: one regex each
+    for i in np.flatnonzero(~valid):
+        single = parse_filename(names[i])
+        if single is None:
+            continue
+        station[i] = single["station"]
+        resolution[i] = Resolution.parse(single["resolution"])
+        timestamp[i] = np.datetime64(single["timestamp"].replace(tzinfo=None), "s")
+        valid[i] = True
+
+    return ParsedNames(station, resolution, timestamp, valid)
@@ -0,0 +1,154 @@
+# src/perf/trace.py
+
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class Span(NamedTuple):
+    name: str
+    start: float      # seconds since the rerun started
+    duration: float   # seconds
+    depth: int        # nesting level within the rerun
+    thread: str
+    attrs: Dict[str, Any]
+
+
+class Recorder:
+    """Spans and counters of one rerun."""
+
+    def __init__(self, label: str = "rerun"):
+        self.run_id = uuid.uuid4().hex[:12]
+        self.label = label
+        self.started_at = datetime.now(timezone.utc)
+        self.t0 = time.perf_counter()
+        self.duration: Optional[float] = None
+        self.spans: List[Span] = []
+        self.counters: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def add(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def count(self, name: str, n: float = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def totals(self) -> Dict[str, Dict[str, float]]:
+        """Per span name: calls, total and max seconds."""
+        out: Dict[str, Dict[str, float]] = {}
+        for s in self.spans:
+            t = out.setdefault(s.name, {"calls": 0, "total": 0.0, "max": 0.0})
+            t["calls"] += 1
+            t["total"] += s.duration
+            t["max"] = max(t["max"], s.duration)
+        return out
+
+    def records(self) -> Iterator[Dict[str, Any]]:
+        """One JSON-ready dict per span, then one for the rerun itself."""
+        base = {"run": self.run_id, "label": self.label,
+                "started_at": self.started_at.isoformat()}
+        for s in self.spans:
+            yield {**base, "type": "span", "name": s.name, "start": round(s.start, 6),
+                   "duration": round(s.duration, 6), "depth": s.depth,
+                   "thread": s.thread, **({"attrs": s.attrs} if s.attrs else {})}
+        yield {**base, "type": "rerun", "duration": self.duration,
+               "counters": self.counters}
+
+    def to_jsonl(self) -> str:
+        return "".join(json.dumps(r, default=str) + "\n" for r in self.records())
+
+
+_RECORDER: contextvars.ContextVar[Optional[Recorder]] = contextvars.ContextVar(
+    "perf_recorder", default=None
+)
+_DEPTH: contextvars.ContextVar[int] = contextvars.ContextVar("perf_depth", default=0)
+
+
+def current() -> Optional[Recorder]:
+    return _RECORDER.get()
+
+
+def start(label: str = "rerun") -> Recorder:
+    """Record the spans of the calling context from now on."""
+    rec = Recorder(label)
+    _RECORDER.set(rec)
+    _DEPTH.set(0)
+    return rec
+
+
+def finish(log_path: Optional[str] = None) -> Optional[Recorder]:
+    """
+    Stop recording and return the rerun, appending it as JSON lines to
+    ``log_path`` (default ``$CASSANDRA_PERF_LOG``) when set.
+    """
+    rec = _RECORDER.get()
+    if rec is None:
+        return None
+    _RECORDER.set(None)
+    rec.duration = time.perf_counter() - rec.t0
+    log_path = log_path or os.getenv("CASSANDRA_PERF_LOG")
+    if log_path:
+        with open(log_path, "a", encoding="utf-8") as f:
+            f.write(rec.to_jsonl())
+    return rec
+
+
+@contextlib.contextmanager
+def _timed(rec: Recorder, name: str, attrs: Dict[str, Any]) -> Iterator[None]:
+    depth = _DEPTH.get()
+    token = _DEPTH.set(depth + 1)
+    t = time.perf_counter()
+    try:
+        yield
+    finally:
+        end = time.perf_counter()
+        _DEPTH.reset(token)
+        rec.add(Span(name, t - rec.t0, end - t, depth,
+                     threading.current_thread().name, attrs))
+
+
+_OFF = contextlib.nullcontext()
+
+
+def span(name: str, **attrs: Any):
+    """
+    ``with span("ssh.fetch", path=p):`` times the block. Costs one
+    context-variable lookup when nothing is being recorded.
+    """
+    rec = _RECORDER.get()
+    if rec is None:
+        return _OFF
+    return _timed(rec, name, attrs)
+
+
+def traced(name: str) -> Callable[[F], F]:
+    """Decorator form of :func:`span`."""
+    def wrap(fn: F) -> F:
+        @functools.wraps(fn)
+        def inner(*args, **kwargs):
+            rec = _RECORDER.get()
+            if rec is None:
+                return fn(*args, **kwargs)
+            with _timed(rec, name, {}):
+                return fn(*args, **kwargs)
+        return inner  # type: ignore[return-value]
+    return wrap
+
+
+def count(name: str, n: float = 1) -> None:
+    rec = _RECORDER.get()
+    if rec is not None:
+        rec.count(name, n)
@@ -0,0 +1,206 @@
+# src/ssh/async_client.py
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import time
+import weakref
+from concurrent.futures import Executor, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import (
+    Awaitable, Callable, Coroutine, Dict, List, Mapping, Optional, Sequence, Tuple,
+    TypeVar, Union,
+)
+
+from parser.frame_index import FrameIndex
+from ssh.fetcher_remote import FetchResult, RemoteVLFClient
+from ssh.pool import CONNECTION_ERRORS
+
+T = TypeVar("T")
+
+
+class _PerLoopSemaphore:
+    """
+    An ``asyncio.Semaphore`` per running event loop. Streamlit drives each
+    rerun with a fresh loop, and asyncio primitives must not cross loops.
+    """
+
+    def __init__(self, value: int):
+        self._value = value
+        # event loop -> its semaphore
+        self._sems: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    def get(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        sem = self._sems.get(loop)
+        if sem is None:
+            sem = self._sems[loop] = asyncio.Semaphore(self._value)
+        return sem
+
+
+class AsyncVLFClient:
+    """
+    ``async`` version of :class:`RemoteVLFClient` for one station.
+
+    Each call runs the blocking paramiko code on a worker thread
+    (``run_in_executor``) once it holds a slot of the station's semaphore
+    (``max_concurrency``) and of the optional fleet-wide ``global_limit``.
+    """
+
+    def __init__(
+        self,
+        client: RemoteVLFClient,
+        *,
+        max_concurrency: int = 4,
+        global_limit: Optional[_PerLoopSemaphore] = None,
+        executor: Optional[Executor] = None,
+    ):
+        self.client = client
+        self._station_limit = _PerLoopSemaphore(max_concurrency)
+        self._global_limit = global_limit
+        self._executor = executor
+
+    async def _call(self, fn: Callable[..., T], *args) -> T:
+        async with self._station_limit.get():
+            if self._global_limit is None:
+                return await self._run(fn, *args)
+            async with self._global_limit.get():
+                return await self._run(fn, *args)
+
+    async def _run(self, fn: Callable[..., T], *args) -> T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(fn, *args))
+
+    # ------------------------------------------------------------------#
+    # RemoteVLFClient interface
+    # ------------------------------------------------------------------#
+    async def list_images(self, resolution: str) -> List[Dict]:
+        return await self._call(self.client.list_images, resolution)
+
+    async def list_wavs(self) -> List[Dict]:
+        return await self._call(self.client.list_wavs)
+
+    async def fetch_image_bytes(self, remote_path: str) -> bytes:
+        return await self._call(self.client.fetch_image_bytes, remote_path)
+
+    async def fetch_wav_bytes(self, remote_path: str) -> bytes:
+        return await self._call(self.client.fetch_wav_bytes, remote_path)
+
+    async def fetch(self, remote_path: str) -> FetchResult:
+        """One file as a :class:`FetchResult` (errors captured, not raised)."""
+        t0 = time.perf_counter()
+        try:
+            data = await self._call(self.client.fetch_image_bytes, remote_path)
+            return FetchResult(remote_path, data, time.perf_counter() - t0)
+        except (OSError, *CONNECTION_ERRORS) as exc:  # missing files too
+            return FetchResult(remote_path, None, time.perf_counter() - t0, exc)
+
+    async def fetch_many(self, remote_paths: Sequence[str]) -> List[FetchResult]:
+        """Fetch several files concurrently (bounded by the semaphores)."""
+        paths = list(dict.fromkeys(remote_paths))
+        return list(await asyncio.gather(*(self.fetch(p) for p in paths)))
+
+    # ------------------------------------------------------------------#
+    # time lookups
+    # ------------------------------------------------------------------#
+    async def nearest(self, resolution: str, when: datetime) -> Optional[Mapping]:
+        """Frame of ``resolution`` closest to ``when`` on this station."""
+        listing = self.client.listing
+        if listing is not None:
+            await self._call(listing.refresh)
+            return await self._call(listing.nearest, resolution, when)
+        records = await (
+            self.list_wavs() if resolution == "Wav" else self.list_images(resolution)
+        )
+        return FrameIndex.from_records(records).nearest(when)
+
+    async def frame_at(
+        self,
+        when: datetime,
+        resolution: str = "HiRes",
+        tolerance: Optional[timedelta] = None,
+    ) -> Optional[Tuple[Mapping, FetchResult]]:
+        """
+        The frame nearest ``when`` and its bytes, or ``None`` when the
+        station has none within ``tolerance``.
+        """
+        row = await self.nearest(resolution, when)
+        if row is None:
+            return None
+        if tolerance is not None and abs(row["timestamp"] - when) > tolerance:
+            return None
+        return row, await self.fetch(row["remote_path"])
+
+
+class MultiStationClient:
+    """
+    Concurrent access to several stations: every station gets its own
+    :class:`AsyncVLFClient` (``per_station`` slots) and all of them share
+    one executor and one ``global_limit``.
+
+    The coroutine methods can be awaited from async code; :meth:`run`
+    drives one to completion from synchronous code such as a Streamlit
+    script.
+    """
+
+    def __init__(
+        self,
+        clients: Mapping[str, RemoteVLFClient],
+        *,
+        per_station: int = 4,
+        global_limit: int = 16,
+    ):
+        self._executor = ThreadPoolExecutor(
+            max_workers=global_limit, thread_name_prefix="station-io"
+        )
+        shared = _PerLoopSemaphore(global_limit)
+        self.stations: Dict[str, AsyncVLFClient] = {
+            name: AsyncVLFClient(
+                client,
+                max_concurrency=per_station,
+                global_limit=shared,
+                executor=self._executor,
+            )
+            for name, client in clients.items()
+        }
+
+    def run(self, coro: Coroutine[object, object, T]) -> T:
+        return asyncio.run(coro)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def each(
+        self, fn: Callable[[AsyncVLFClient], Awaitable[T]]
+    ) -> Dict[str, Union[T, BaseException]]:
+        """Run ``fn`` on every station concurrently; failures are returned."""
+        names = list(self.stations)
+        results = await asyncio.gather(
+            *(fn(self.stations[n]) for n in names), return_exceptions=True
+        )
+        return dict(zip(names, results))
+
+    async def list_images(
+        self, resolution: str
+    ) -> Dict[str, Union[List[Dict], BaseException]]:
+        return await self.each(lambda c: c.list_images(resolution))
+
+    async def fetch_many(
+        self, remote_paths: Mapping[str, Sequence[str]]
+    ) -> Dict[str, List[FetchResult]]:
+        """``{station: paths}`` → ``{station: results}``, all concurrently."""
+        names = [n for n in remote_paths if n in self.stations]
+        results = await asyncio.gather(
+            *(self.stations[n].fetch_many(remote_paths[n]) for n in names)
+        )
+        return dict(zip(names, results))
+
+    async def frames_at(
+        self,
+        when: datetime,
+        resolution: str = "HiRes",
+        tolerance: Optional[timedelta] = timedelta(minutes=10),
+    ) -> Dict[str, Union[Optional[Tuple[Mapping, FetchResult]], BaseException]]:
+        """The frame nearest ``when`` from every station, fetched in parallel."""
+        return await self.each(lambda c: c.frame_at(when, resolution, tolerance))
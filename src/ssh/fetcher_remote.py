@@ -2,13 +2,99 @@
 
 from __future__ import annotations
 
+import contextvars
 import io
 import os
+import re
+import shlex
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
-from typing import Dict, List
+from typing import (
+    TYPE_CHECKING, Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence,
+    Tuple, TypeVar,
+)
 
+import numpy as np
 import paramiko
-from parser.parse_filenames import parse_filename
+from cache.disk import DiskCache, file_key
+from parser.frame_index import from_datetime64
+from parser.parse_filenames import ParsedNames, parse_filenames_bulk
+from perf.trace import count, span, traced
+from ssh.pool import CONNECTION_ERRORS, PoolKey, SSHPool, get_pool
+
+if TYPE_CHECKING:
+    from ssh.remote_catalog import RemoteCatalog
+
+T = TypeVar("T")
+
+_WINDOWS_PATH = re.compile(r"^[A-Za-z]:/")
+
+
+def _read_all(sftp: paramiko.SFTPClient, remote_path: str) -> bytes:
+    buf = io.BytesIO()
+    sftp.getfo(remote_path, buf)
+    return buf.getvalue()
+
+
+def _parse_entries(entries: List[paramiko.SFTPAttributes]) -> ParsedNames:
+    """Bulk-parse a listing, anchoring WAV dates on the entries' mtimes."""
+    mtimes = np.array([int(e.st_mtime) for e in entries], dtype="datetime64[s]")
+    return parse_filenames_bulk([e.filename for e in entries], reference=mtimes)
+
+
+class RemoteEntry(NamedTuple):
+    """A directory entry from a remote listing command (``SFTPAttributes``-like)."""
+
+    filename: str
+    st_size: int
+    st_mtime: int
+
+
+def _newer_command(remote_dir: str, ext: str, since: int) -> str:
+    """
+    Shell command printing ``name|size|mtime`` for every ``*<ext>`` file in
+    ``remote_dir`` modified after epoch second ``since``: PowerShell for
+    Windows stations (``C:/…`` bases), GNU ``find`` otherwise.
+    """
+    if _WINDOWS_PATH.match(remote_dir):
+        literal = remote_dir.replace("'", "''")
+        script = (
+            f"Get-ChildItem -LiteralPath '{literal}' -Filter '*{ext}' -File"
+            " | Where-Object { $_.LastWriteTimeUtc -gt"
+            f" [DateTimeOffset]::FromUnixTimeSeconds({int(since)}).UtcDateTime }}"
+            " | ForEach-Object { '{0}|{1}|{2}' -f $_.Name, $_.Length,"
+            " ([DateTimeOffset]$_.LastWriteTimeUtc).ToUnixTimeSeconds() }"
+        )
+        return f'powershell -NoProfile -NonInteractive -Command "{script}"'
+    return (
+        f"find {shlex.quote(remote_dir)} -maxdepth 1 -type f"
+        f" -iname {shlex.quote('*' + ext)} -newermt @{int(since)}"
+        " -printf '%f|%s|%T@\\n'"
+    )
+
+
+def _parse_listing(text: str) -> List[RemoteEntry]:
+    """Parse the ``name|size|mtime`` lines printed by :func:`_newer_command`."""
+    entries = []
+    for line in text.splitlines():
+        parts = line.rstrip("\r").rsplit("|", 2)
+        if len(parts) != 3 or not parts[0]:
+            continue
+        try:
+            entries.append(RemoteEntry(parts[0], int(parts[1]), int(float(parts[2]))))
+        except ValueError:
+            continue
+    return entries
+
+
+class FetchResult(NamedTuple):
+    """One file from :meth:`RemoteVLFClient.fetch_many`."""
+
+    remote_path: str
+    data: Optional[bytes]
+    latency: float  # seconds from request to last byte
+    error: Optional[BaseException] = None
 
 
 class RemoteVLFClient:
@@ -19,6 +105,9 @@ class RemoteVLFClient:
         username: str,
         key_path: str,
         remote_base: str,
+        pool: Optional[SSHPool] = None,
+        cache: Optional[DiskCache] = None,
+        station: Optional[str] = None,
     ):
         """
         host         remote SSH host
@@ -26,6 +115,9 @@ class RemoteVLFClient:
         username     SSH user
         key_path     path to an *Ed25519* private key
         remote_base  root folder on the remote (e.g. ``C:/htdocs/VLF``)
+        pool         SSH pool to draw from (default: the process-wide one)
+        cache        optional read-through disk cache for fetched files
+        station      station name used in cache keys (default: ``host``)
         """
         self._host = host
         self._port = port
@@ -34,40 +126,167 @@ class RemoteVLFClient:
         # always use forward slashes for SFTP paths
         self._remote_base = remote_base.replace("\\", "/")
 
-        self._client: paramiko.SSHClient | None = None
-        self._sftp: paramiko.SFTPClient | None = None
+        self._pool = pool if pool is not None else get_pool()
+        self._cache = cache
+        self._station = station or host
+        # remote_path → (size, mtime) from the last listing, for cache keys
+        self._attrs: Dict[str, Tuple[int, int]] = {}
+        # persistent incremental listing, attached by the caller if wanted
+        self.listing: Optional[RemoteCatalog] = None
+
+    @property
+    def pool_key(self) -> PoolKey:
+        return (self._host, self._port, self._username)
+
+    @property
+    def remote_base(self) -> str:
+        return self._remote_base
+
+    @property
+    def station(self) -> str:
+        return self._station
 
     # ------------------------------------------------------------------#
     # connection helpers
     # ------------------------------------------------------------------#
     def connect(self) -> None:
-        """Open SSH + SFTP the first time they're needed."""
-        if self._client:
-            return
+        """Make sure the pooled transport is up (handshake only once)."""
+        self._pool.client(self.pool_key, self._key_path)
 
-        key = paramiko.Ed25519Key.from_private_key_file(self._key_path)
-
-        client = paramiko.SSHClient()
-        client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-        client.connect(
-            hostname=self._host,
-            port=self._port,
-            username=self._username,
-            pkey=key,  # use our key
-            allow_agent=True,
-            look_for_keys=True,
+    def close(self) -> None:
+        """
+        Release this client. The transport stays in the shared pool for
+        other clients; it is closed when idle or at interpreter exit.
+        """
+
+    def _sftp_call(self, fn: Callable[[paramiko.SFTPClient], T]) -> T:
+        """
+        Run ``fn`` on a pooled SFTP channel, reconnecting and retrying
+        once if the transport died underneath us.
+        """
+        try:
+            with self._pool.sftp(self.pool_key, self._key_path) as sftp:
+                return fn(sftp)
+        except CONNECTION_ERRORS:
+            if self._pool.alive(self.pool_key):
+                raise  # the channel failed, the transport is fine
+            self._pool.invalidate(self.pool_key)
+            with self._pool.sftp(self.pool_key, self._key_path) as sftp:
+                return fn(sftp)
+
+    @traced("ssh.exec")
+    def _exec(self, command: str, timeout: float = 60.0) -> Optional[str]:
+        """
+        Run ``command`` on the station over the pooled transport.
+        Returns its stdout, or ``None`` if it exited non-zero.
+        """
+        def run() -> Optional[bytes]:
+            client = self._pool.client(self.pool_key, self._key_path)
+            _, stdout, _ = client.exec_command(command, timeout=timeout)
+            out = stdout.read()
+            return out if stdout.channel.recv_exit_status() == 0 else None
+
+        try:
+            out = run()
+        except CONNECTION_ERRORS:
+            if self._pool.alive(self.pool_key):
+                return None
+            self._pool.invalidate(self.pool_key)
+            out = run()
+        return None if out is None else out.decode("utf-8", "replace")
+
+    # ------------------------------------------------------------------#
+    # listings
+    # ------------------------------------------------------------------#
+    @traced("ssh.list")
+    def _list(self, remote_dir: str, ext: str) -> List[paramiko.SFTPAttributes]:
+        entries = [
+            e for e in self._sftp_call(lambda sftp: sftp.listdir_attr(remote_dir))
+            if e.filename.lower().endswith(ext)
+        ]
+        for e in entries:
+            self._attrs[f"{remote_dir}/{e.filename}"] = (e.st_size, int(e.st_mtime))
+        return entries
+
+    def list_entries(self, resolution: str, ext: str) -> List[paramiko.SFTPAttributes]:
+        """Full SFTP listing of ``*<ext>`` under ``<remote_base>/<resolution>``."""
+        return self._list(f"{self._remote_base}/{resolution}", ext)
+
+    def list_newer(
+        self, resolution: str, ext: str, since: int
+    ) -> Optional[List[RemoteEntry]]:
+        """
+        Only the ``*<ext>`` entries of ``<remote_base>/<resolution>`` modified
+        after epoch second ``since``, listed by a command on the station so
+        old entries never cross the wire. ``None`` if the station cannot
+        run the command (caller should fall back to :meth:`list_entries`).
+        """
+        remote_dir = f"{self._remote_base}/{resolution}"
+        out = self._exec(_newer_command(remote_dir, ext, since))
+        if out is None:
+            return None
+        entries = _parse_listing(out)
+        for e in entries:
+            self._attrs[f"{remote_dir}/{e.filename}"] = (e.st_size, e.st_mtime)
+        return entries
+
+    def stat(self, remote_path: str) -> Tuple[int, int]:
+        """(size, mtime) of a remote file, from the last listing if possible."""
+        attrs = self._attrs.get(remote_path)
+        if attrs is None and self.listing is not None:
+            attrs = self.listing.attrs(remote_path)
+        if attrs is None:
+            with span("ssh.stat"):
+                st = self._sftp_call(lambda sftp: sftp.stat(remote_path))
+            attrs = (st.st_size, int(st.st_mtime))
+        self._attrs[remote_path] = attrs
+        return attrs
+
+    def version_key(self, remote_path: str) -> str:
+        """Cache key of the current version of a remote file."""
+        return file_key(self._station, remote_path, *self.stat(remote_path))
+
+    def _download_bytes(self, remote_path: str) -> bytes:
+        with span("ssh.read"):
+            data = self._sftp_call(lambda sftp: _read_all(sftp, remote_path))
+        count("ssh.bytes", len(data))
+        return data
+
+    @traced("ssh.fetch")
+    def _fetch(self, remote_path: str) -> bytes:
+        """Whole-file read, served from the disk cache when possible."""
+        if self._cache is None:
+            return self._download_bytes(remote_path)
+        return self._cache.get_or_fetch(
+            self.version_key(remote_path),
+            lambda: self._download_bytes(remote_path),
         )
 
-        self._client = client
-        self._sftp = client.open_sftp()
+    def read_ranges(
+        self, remote_path: str, ranges: Sequence[Tuple[int, int]]
+    ) -> List[bytes]:
+        """
+        Read several ``(offset, length)`` ranges of a remote file in one
+        pipelined ``readv`` on a single handle. Served from the disk cache
+        when the whole file is already there.
+        """
+        if not ranges:
+            return []
+        if self._cache is not None:
+            key = self.version_key(remote_path)
+            if key in self._cache:
+                data = self._cache.get(key)
+                if data is not None:
+                    return [data[off:off + n] for off, n in ranges]
 
-    def close(self) -> None:
-        """Close both channels."""
-        if self._sftp:
-            self._sftp.close()
-        if self._client:
-            self._client.close()
-        self._sftp = self._client = None
+        def run(sftp: paramiko.SFTPClient) -> List[bytes]:
+            with sftp.open(remote_path, "rb") as f:
+                return list(f.readv(list(ranges)))
+
+        with span("ssh.read_ranges", ranges=len(ranges)):
+            blocks = self._sftp_call(run)
+        count("ssh.bytes", sum(len(b) for b in blocks))
+        return blocks
 
     # ------------------------------------------------------------------#
     # images
@@ -79,21 +298,21 @@ class RemoteVLFClient:
 
         All ``timestamp`` fields are **UTC-aware** ``datetime`` objects.
         """
-        self.connect()
         remote_dir = f"{self._remote_base}/{resolution}"
         images: list[Dict] = []
 
-        for entry in self._sftp.listdir_attr(remote_dir):
-            if not entry.filename.lower().endswith(".jpg"):
-                continue
+        entries = self._list(remote_dir, ".jpg")
+        parsed = _parse_entries(entries)
 
+        for i, entry in enumerate(entries):
             # 1) try parsing from the filename
-            info = parse_filename(entry.filename)
-            if info and info["timestamp"].tzinfo is None:
-                info["timestamp"] = info["timestamp"].replace(tzinfo=timezone.utc)
-
+            if parsed.valid[i]:
+                info = {
+                    "station": str(parsed.station[i]),
+                    "timestamp": from_datetime64(parsed.timestamp[i]),
+                }
             # 2) if parsing failed, fall back to the mtime
-            if info is None:
+            else:
                 info = {
                     "station": "UNKNOWN",
                     "timestamp": datetime.fromtimestamp(
@@ -112,10 +331,91 @@ class RemoteVLFClient:
 
     def fetch_image_bytes(self, remote_path: str) -> bytes:
         """Read a remote image into memory."""
-        self.connect()
-        buf = io.BytesIO()
-        self._sftp.getfo(remote_path, buf)
-        return buf.getvalue()
+        return self._fetch(remote_path)
+
+    def fetch_many(
+        self, remote_paths: Sequence[str], max_concurrency: int = 8
+    ) -> Iterator[FetchResult]:
+        """
+        Fetch several files concurrently, yielding a :class:`FetchResult`
+        per file *as it completes* (not in input order).
+
+        Each worker reads on its own pooled SFTP channel over the shared
+        transport, and every read is pipelined (``getfo`` prefetch), so a
+        batch costs a few round-trips instead of one per file. Cached
+        files are served from disk. Failures are reported in
+        ``FetchResult.error`` rather than raised.
+        """
+        paths = list(dict.fromkeys(remote_paths))
+        if not paths:
+            return
+
+        def work(path: str) -> FetchResult:
+            t0 = time.perf_counter()
+            try:
+                data = self._fetch(path)
+                return FetchResult(path, data, time.perf_counter() - t0)
+            except (OSError, *CONNECTION_ERRORS) as exc:  # missing files too
+                return FetchResult(path, None, time.perf_counter() - t0, exc)
+
+        pool = ThreadPoolExecutor(
+            max_workers=max(1, min(max_concurrency, len(paths))),
+            thread_name_prefix="sftp-fetch",
+        )
+        try:
+            # each worker records its spans into the caller's rerun
+            futures = [
+                pool.submit(contextvars.copy_context().run, work, p) for p in paths
+            ]
+            for fut in as_completed(futures):
+                yield fut.result()
+        finally:
+            # a consumer that stops early should not wait for the rest
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    @traced("ssh.download")
+    def download(
+        self,
+        remote_path: str,
+        local_path: str,
+        *,
+        throttle: Optional[Callable[[int], None]] = None,
+        chunk_size: int = 256 * 1024,
+    ) -> int:
+        """
+        Stream a remote file to ``local_path`` and return its size.
+
+        The file is written to ``<local_path>.part`` and renamed into place
+        once complete; its mtime is set to the remote one. ``throttle(n)``
+        is called before each chunk of ``n`` bytes is read (e.g. a rate
+        limiter); without it reads are pipelined with ``prefetch``.
+        """
+        tmp = local_path + ".part"
+
+        def run(sftp: paramiko.SFTPClient) -> int:
+            st = sftp.stat(remote_path)
+            done = 0
+            with sftp.open(remote_path, "rb") as src, open(tmp, "wb") as dst:
+                if throttle is None:
+                    src.prefetch(st.st_size)
+                while True:
+                    if throttle is not None:
+                        throttle(chunk_size)
+                    buf = src.read(chunk_size)
+                    if not buf:
+                        break
+                    dst.write(buf)
+                    done += len(buf)
+            os.utime(tmp, (st.st_atime or st.st_mtime, st.st_mtime))
+            os.replace(tmp, local_path)
+            self._attrs[remote_path] = (st.st_size, int(st.st_mtime))
+            return done
+
+        try:
+            return self._sftp_call(run)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
 
     # ------------------------------------------------------------------#
     # WAV audio
@@ -124,23 +424,26 @@ class RemoteVLFClient:
         """
         List every ``*.wav`` under ``<remote_base>/Wav``.
 
-        Returns UTC-aware ``timestamp`` fields.
+        Returns UTC-aware ``timestamp`` fields, taken from the
+        ``*_Audio_DDUTChhmmss.wav`` name when it parses.
         """
-        self.connect()
         remote_dir = f"{self._remote_base}/Wav"
         wavs: list[Dict] = []
 
-        for entry in self._sftp.listdir_attr(remote_dir):
-            if not entry.filename.lower().endswith(".wav"):
-                continue
+        entries = self._list(remote_dir, ".wav")
+        parsed = _parse_entries(entries)
 
+        for i, entry in enumerate(entries):
+            # day + time from the name, month/year from the mtime
+            if parsed.valid[i]:
+                ts = from_datetime64(parsed.timestamp[i])
+            else:
+                ts = datetime.fromtimestamp(entry.st_mtime, tz=timezone.utc)
             wavs.append(
                 {
                     "remote_path": f"{remote_dir}/{entry.filename}",
                     "filename": entry.filename,
-                    "timestamp": datetime.fromtimestamp(
-                        entry.st_mtime, tz=timezone.utc
-                    ),
+                    "timestamp": ts,
                 }
             )
 
@@ -148,7 +451,4 @@ class RemoteVLFClient:
 
     def fetch_wav_bytes(self, remote_path: str) -> bytes:
         """Read a remote WAV file into memory."""
-        self.connect()
-        buf = io.BytesIO()
-        self._sftp.getfo(remote_path, buf)
-        return buf.getvalue()
\ No newline at end of file
+        return self._fetch(remote_path)
@@ -0,0 +1,267 @@
+# src/ssh/pool.py
+
+from __future__ import annotations
+
+import atexit
+import os
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import paramiko
+
+PoolKey = Tuple[str, int, str]  # (host, port, username)
+
+# errors of the transport, after which a channel (and maybe the
+# transport) is not reused; file errors (missing file, permission
+# denied) are OSErrors too and are left to the caller
+CONNECTION_ERRORS = (
+    EOFError,
+    paramiko.SSHException,
+    paramiko.ssh_exception.NoValidConnectionsError,
+    ConnectionError,
+    socket.timeout,
+    socket.gaierror,
+)
+
+
+def _default_connect(host: str, port: int, username: str, key_path: str):
+    key = paramiko.Ed25519Key.from_private_key_file(key_path)
+    client = paramiko.SSHClient()
+    client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+    client.connect(
+        hostname=host,
+        port=port,
+        username=username,
+        pkey=key,
+        allow_agent=True,
+        look_for_keys=True,
+    )
+    return client
+
+
+class _Connection:
+    """One authenticated transport plus its idle SFTP channels."""
+
+    def __init__(self, client: paramiko.SSHClient):
+        self.client = client
+        self.idle: List[paramiko.SFTPClient] = []
+        self.in_use = 0
+        self.last_used = time.monotonic()
+
+    def alive(self) -> bool:
+        transport = self.client.get_transport()
+        return bool(
+            transport and transport.is_active() and transport.is_authenticated()
+        )
+
+    def close(self) -> None:
+        for sftp in self.idle:
+            sftp.close()
+        self.idle.clear()
+        self.client.close()
+
+
+class SSHPool:
+    """
+    Process-wide pool of authenticated SSH transports keyed by
+    (host, port, username), each serving several SFTP channels.
+
+    * a transport is opened once and shared by every client, session
+      and rerun; SSH keepalives stop NATs and firewalls dropping it
+    * :meth:`sftp` checks out an idle channel (or opens a new one on the
+      same transport) and returns it on exit, so concurrent callers get
+      separate channels
+    * dead transports are detected before use and reconnected;
+      a channel that raised a connection error is discarded
+    * transports idle for ``idle_timeout`` seconds are closed
+    """
+
+    def __init__(
+        self,
+        *,
+        keepalive: int = 30,
+        idle_timeout: float = 300.0,
+        max_idle_channels: int = 8,
+        connect: Callable[..., paramiko.SSHClient] = _default_connect,
+    ):
+        self._keepalive = keepalive
+        self._idle_timeout = idle_timeout
+        self._max_idle_channels = max_idle_channels
+        self._connect = connect
+        self._conns: Dict[PoolKey, _Connection] = {}
+        self._lock = threading.Lock()
+        self._key_locks: Dict[PoolKey, threading.Lock] = {}
+        self.stats = {
+            "connects": 0, "channels_opened": 0, "checkouts": 0, "evicted": 0
+        }
+
+    # ------------------------------------------------------------------#
+    # transports
+    # ------------------------------------------------------------------#
+    def _connection(
+        self, key: PoolKey, key_path: str, *, hold: bool = False
+    ) -> _Connection:
+        """
+        The live transport for ``key``, connecting if needed. With
+        ``hold`` it is counted in ``in_use`` before the pool lock is
+        released, so the reaper cannot close it before the caller uses it.
+        """
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        # one handshake per key even when many threads ask at once
+        with key_lock:
+            with self._lock:
+                conn = self._conns.get(key)
+                if conn is not None and conn.alive():
+                    if hold:
+                        conn.in_use += 1
+                    conn.last_used = time.monotonic()
+                    return conn
+            if conn is not None:
+                self._drop(key, conn)
+
+            host, port, username = key
+            client = self._connect(host, port, username, os.path.expanduser(key_path))
+            transport = client.get_transport()
+            if transport is not None and self._keepalive:
+                transport.set_keepalive(self._keepalive)
+            conn = _Connection(client)
+            with self._lock:
+                if hold:
+                    conn.in_use += 1
+                self._conns[key] = conn
+                self.stats["connects"] += 1
+            return conn
+
+    def _drop(self, key: PoolKey, conn: _Connection) -> None:
+        with self._lock:
+            if self._conns.get(key) is conn:
+                del self._conns[key]
+        self._close(conn)
+
+    @staticmethod
+    def _close(conn: _Connection) -> None:
+        try:
+            conn.close()
+        except (OSError, *CONNECTION_ERRORS):
+            pass
+
+    def invalidate(self, key: PoolKey) -> None:
+        """Forget the transport for ``key`` (next use reconnects)."""
+        with self._lock:
+            conn = self._conns.get(key)
+            if conn is None or conn.in_use:
+                return
+            del self._conns[key]
+        self._close(conn)
+
+    def alive(self, key: PoolKey) -> bool:
+        """Whether a healthy transport for ``key`` is pooled."""
+        with self._lock:
+            conn = self._conns.get(key)
+        return conn is not None and conn.alive()
+
+    def client(self, key: PoolKey, key_path: str) -> paramiko.SSHClient:
+        """The pooled ``SSHClient`` for ``key`` (e.g. for ``exec_command``)."""
+        return self._connection(key, key_path).client
+
+    # ------------------------------------------------------------------#
+    # SFTP channels
+    # ------------------------------------------------------------------#
+    @contextmanager
+    def sftp(self, key: PoolKey, key_path: str) -> Iterator[paramiko.SFTPClient]:
+        """Check out an SFTP channel on the pooled transport for ``key``."""
+        self.evict_idle()
+        conn = self._connection(key, key_path, hold=True)
+
+        sftp = None
+        ok = False
+        try:
+            with self._lock:
+                while conn.idle and sftp is None:
+                    candidate = conn.idle.pop()
+                    if candidate.get_channel().closed:
+                        candidate.close()
+                    else:
+                        sftp = candidate
+                self.stats["checkouts"] += 1
+            if sftp is None:
+                sftp = conn.client.open_sftp()
+                with self._lock:
+                    self.stats["channels_opened"] += 1
+            yield sftp
+            ok = True
+        finally:
+            with self._lock:
+                conn.in_use -= 1
+                conn.last_used = time.monotonic()
+                keep = (
+                    ok
+                    and sftp is not None
+                    and len(conn.idle) < self._max_idle_channels
+                    and self._conns.get(key) is conn
+                )
+                if keep:
+                    conn.idle.append(sftp)
+            if not keep and sftp is not None:
+                sftp.close()
+            if not ok and not conn.alive():
+                self.invalidate(key)
+
+    # ------------------------------------------------------------------#
+    # housekeeping
+    # ------------------------------------------------------------------#
+    def evict_idle(self) -> int:
+        """Close transports unused for ``idle_timeout`` s; returns the count."""
+        now = time.monotonic()
+        # unlinked under the lock that checkouts take: a transport is
+        # either still pooled and held, or gone before anyone gets it
+        with self._lock:
+            stale = [
+                (k, c)
+                for k, c in self._conns.items()
+                if c.in_use == 0 and now - c.last_used > self._idle_timeout
+            ]
+            for key, _ in stale:
+                del self._conns[key]
+            self.stats["evicted"] += len(stale)
+        for _, conn in stale:
+            self._close(conn)
+        return len(stale)
+
+    def close_all(self) -> None:
+        with self._lock:
+            conns = list(self._conns.items())
+        for key, conn in conns:
+            self._drop(key, conn)
+
+    def __len__(self) -> int:
+        return len(self._conns)
+
+
+_POOL: Optional[SSHPool] = None
+_POOL_LOCK = threading.Lock()
+
+
+def get_pool() -> SSHPool:
+    """The process-wide pool, shared by every Streamlit session."""
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = SSHPool()
+            atexit.register(_POOL.close_all)
+            threading.Thread(
+                target=_reap_forever, args=(_POOL,), daemon=True,
+                name="ssh-pool-reaper",
+            ).start()
+        return _POOL
+
+
+def _reap_forever(pool: SSHPool, every: float = 60.0) -> None:
+    while True:
+        time.sleep(every)
+        pool.evict_idle()
@@ -0,0 +1,268 @@
+# src/ssh/remote_catalog.py
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import time
+from contextlib import closing
+from datetime import datetime, timezone
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from parser.catalog import FOLDERS, _epoch
+from parser.frame_table import FrameTable, Resolution
+from parser.parse_filenames import parse_filenames_bulk
+from ssh.fetcher_remote import RemoteVLFClient
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS frames (
+    resolution TEXT    NOT NULL,
+    filename   TEXT    NOT NULL,
+    size       INTEGER NOT NULL,
+    mtime      INTEGER NOT NULL,
+    station    TEXT    NOT NULL,
+    ts         INTEGER NOT NULL,
+    PRIMARY KEY (resolution, filename)
+);
+CREATE INDEX IF NOT EXISTS frames_by_time ON frames (resolution, ts);
+CREATE TABLE IF NOT EXISTS folders (
+    resolution TEXT    PRIMARY KEY,
+    last_mtime INTEGER NOT NULL,
+    full_at    INTEGER NOT NULL,
+    version    INTEGER NOT NULL
+);
+"""
+
+
+class RemoteCatalog:
+    """
+    Persistent SQLite copy of a remote station's ``LoRes``, ``HiRes`` and
+    ``Wav`` listings.
+
+    The first :meth:`refresh` does one full SFTP listing per folder.
+    Later refreshes ask the station only for entries modified since the
+    newest mtime already known (:meth:`RemoteVLFClient.list_newer`), so a
+    rerun transfers a few new lines instead of the whole folder, and only
+    those names are parsed. A full listing still runs every
+    ``full_every`` seconds to pick up deletions, and whenever the station
+    cannot run the listing command.
+    """
+
+    def __init__(
+        self,
+        client: RemoteVLFClient,
+        db_path: str,
+        *,
+        full_every: float = 24 * 3600,
+        min_interval: float = 30.0,
+        slack: int = 120,
+    ):
+        """
+        client        station client used for listings
+        db_path       SQLite file (created if missing)
+        full_every    seconds between full listings (deletion sweep)
+        min_interval  refreshes closer together than this are skipped
+        slack         seconds subtracted from the last mtime, for files
+                      still being written or clock skew
+        """
+        self._client = client
+        self._db_path = db_path
+        self._full_every = full_every
+        self._min_interval = min_interval
+        self._slack = slack
+        self._last_refresh = float("-inf")
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        with closing(self._connect()) as con, con:
+            con.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self._db_path)
+
+    # ------------------------------------------------------------------#
+    # incremental update
+    # ------------------------------------------------------------------#
+    def refresh(self, force: bool = False) -> int:
+        """
+        Merge new remote entries into the catalog.
+        Returns the number of rows added, changed or removed.
+        """
+        now = time.monotonic()
+        if not force and now - self._last_refresh < self._min_interval:
+            return 0
+        changed = 0
+        with closing(self._connect()) as con, con:
+            for resolution in FOLDERS:
+                changed += self._refresh_folder(con, resolution)
+        self._last_refresh = now
+        return changed
+
+    def _refresh_folder(self, con: sqlite3.Connection, resolution: str) -> int:
+        ext = FOLDERS[resolution]
+        now = int(time.time())
+        row = con.execute(
+            "SELECT last_mtime, full_at, version FROM folders WHERE resolution = ?",
+            (resolution,),
+        ).fetchone()
+        last_mtime, full_at, version = row if row is not None else (0, 0, 0)
+
+        entries = None
+        full = row is None or now - full_at >= self._full_every
+        if not full:
+            entries = self._client.list_newer(resolution, ext, last_mtime - self._slack)
+            full = entries is None
+        if full:
+            entries = self._client.list_entries(resolution, ext)
+            full_at = now
+
+        known = {
+            fn: (size, mtime)
+            for fn, size, mtime in con.execute(
+                "SELECT filename, size, mtime FROM frames WHERE resolution = ?",
+                (resolution,),
+            )
+        }
+        new = [
+            e for e in entries
+            if known.get(e.filename) != (int(e.st_size), int(e.st_mtime))
+        ]
+        gone = set(known) - {e.filename for e in entries} if full else set()
+
+        con.executemany(
+            "DELETE FROM frames WHERE resolution = ? AND filename = ?",
+            ((resolution, fn) for fn in gone),
+        )
+        con.executemany(
+            "INSERT OR REPLACE INTO frames "
+            "(resolution, filename, size, mtime, station, ts) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            self._parse_new(resolution, new),
+        )
+
+        last_mtime = max([last_mtime] + [int(e.st_mtime) for e in entries])
+        if new or gone:
+            version += 1
+        con.execute(
+            "INSERT OR REPLACE INTO folders (resolution, last_mtime, full_at, version) "
+            "VALUES (?, ?, ?, ?)",
+            (resolution, last_mtime, full_at, version),
+        )
+        return len(new) + len(gone)
+
+    @staticmethod
+    def _parse_new(resolution: str, entries: Sequence):
+        if not entries:
+            return
+        mtimes = [int(e.st_mtime) for e in entries]
+        parsed = parse_filenames_bulk(
+            [e.filename for e in entries],
+            reference=np.array(mtimes, dtype="datetime64[s]"),
+        )
+        epochs = parsed.timestamp.astype(np.int64)
+        for i, e in enumerate(entries):
+            # same fallbacks as RemoteVLFClient.list_images / list_wavs
+            if parsed.valid[i]:
+                station, ts = str(parsed.station[i]), int(epochs[i])
+            elif resolution == "Wav":
+                station, ts = e.filename.split("_", 1)[0], mtimes[i]
+            else:
+                station, ts = "UNKNOWN", mtimes[i]
+            yield resolution, e.filename, int(e.st_size), mtimes[i], station, ts
+
+    def stamp(self) -> tuple:
+        """Per-folder versions; changes whenever rows do."""
+        with closing(self._connect()) as con:
+            return tuple(
+                con.execute(
+                    "SELECT resolution, version FROM folders ORDER BY resolution"
+                ).fetchall()
+            )
+
+    # ------------------------------------------------------------------#
+    # queries
+    # ------------------------------------------------------------------#
+    def table(self, resolution: str) -> FrameTable:
+        """
+        Every known frame of ``resolution`` as a time-sorted
+        :class:`FrameTable` with ``remote_path`` rows, like
+        :meth:`RemoteVLFClient.list_images` / ``list_wavs``.
+        """
+        with closing(self._connect()) as con:
+            rows = con.execute(
+                "SELECT station, ts, filename FROM frames WHERE resolution = ? "
+                "ORDER BY ts, filename",
+                (resolution,),
+            ).fetchall()
+
+        table = FrameTable.from_columns(
+            station="",
+            resolution=Resolution.parse(resolution),
+            folder=f"{self._client.remote_base}/{resolution}/",
+            ts=np.fromiter((ts for _, ts, _ in rows), dtype=np.int64, count=len(rows)),
+            names=[fn for _, _, fn in rows],
+            path_key="remote_path",
+        )
+        stations, codes = np.unique(
+            np.array([s for s, _, _ in rows], dtype=object).astype(str),
+            return_inverse=True,
+        )
+        table.stations = tuple(str(s) for s in stations) or ("",)
+        table.station = codes.astype(np.uint16)
+        return table
+
+    def nearest(self, resolution: str, when: datetime) -> Optional[Dict]:
+        """
+        The frame of ``resolution`` closest in time to ``when`` (earlier one
+        on ties) as a ``list_images``/``list_wavs``-style dict; two indexed
+        lookups, no table scan.
+        """
+        t = _epoch(when)
+        with closing(self._connect()) as con:
+            before = con.execute(
+                "SELECT ts, filename, station FROM frames WHERE resolution = ? "
+                "AND ts <= ? ORDER BY ts DESC LIMIT 1",
+                (resolution, t),
+            ).fetchone()
+            after = con.execute(
+                "SELECT ts, filename, station FROM frames WHERE resolution = ? "
+                "AND ts > ? ORDER BY ts ASC LIMIT 1",
+                (resolution, t),
+            ).fetchone()
+        candidates = [r for r in (before, after) if r is not None]
+        if not candidates:
+            return None
+        ts, filename, station = min(candidates, key=lambda r: abs(r[0] - t))
+        row = {
+            "station": station,
+            "timestamp": datetime.fromtimestamp(ts, tz=timezone.utc),
+            "remote_path": f"{self._client.remote_base}/{resolution}/{filename}",
+        }
+        if resolution == "Wav":
+            row["filename"] = filename
+        else:
+            row["resolution"] = resolution
+            row["original_filename"] = filename
+        return row
+
+    def versions(self, resolution: str) -> Dict[str, Tuple[int, int]]:
+        """``{filename: (size, mtime)}`` of every catalogued file of ``resolution``."""
+        with closing(self._connect()) as con:
+            return {
+                fn: (size, mtime)
+                for fn, size, mtime in con.execute(
+                    "SELECT filename, size, mtime FROM frames WHERE resolution = ?",
+                    (resolution,),
+                )
+            }
+
+    def attrs(self, remote_path: str) -> Optional[Tuple[int, int]]:
+        """(size, mtime) of a catalogued file, for disk-cache keys."""
+        head, _, filename = remote_path.rpartition("/")
+        resolution = head.rpartition("/")[2]
+        with closing(self._connect()) as con:
+            row = con.execute(
+                "SELECT size, mtime FROM frames WHERE resolution = ? AND filename = ?",
+                (resolution, filename),
+            ).fetchone()
+        return None if row is None else (row[0], row[1])
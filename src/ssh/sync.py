@@ -0,0 +1,281 @@
+# src/ssh/sync.py
+#
+# Background mirror of the remote stations into the local VLF/ layout:
+#
+#     PYTHONPATH=src python -m ssh.sync --dest VLF --bwlimit 2048
+#
+# Every station in stations.yml is polled on its own thread. New LoRes,
+# HiRes and WAV files are downloaded to VLF/<station>/<resolution>/ and the
+# local catalog is refreshed, so the UI reads the mirror from local disk.
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import random
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, TypeVar
+
+import yaml
+from dotenv import load_dotenv
+
+from cache.disk import cache_dir
+from parser.catalog import FOLDERS, Catalog
+from ssh.fetcher_remote import RemoteVLFClient
+from ssh.pool import CONNECTION_ERRORS
+from ssh.remote_catalog import RemoteCatalog
+
+log = logging.getLogger("cassandra.sync")
+
+T = TypeVar("T")
+
+STATIONS_YML = Path(__file__).with_name("stations.yml")
+DEFAULT_MIRROR_ROOT = "VLF"
+
+
+def mirror_dir(station: str, root: Optional[str] = None) -> str:
+    """Local mirror folder of a remote station (``$CASSANDRA_MIRROR_DIR/<station>``)."""
+    root = root or os.getenv("CASSANDRA_MIRROR_DIR", DEFAULT_MIRROR_ROOT)
+    return os.path.join(root, station)
+
+
+def load_stations(path: Path = STATIONS_YML) -> Dict[str, Dict]:
+    with open(path) as f:
+        return yaml.safe_load(f) or {}
+
+
+def make_client(station: str, cfg: Dict, key_path: str) -> RemoteVLFClient:
+    """Client for one configured station, with its persistent listing."""
+    client = RemoteVLFClient(
+        host=cfg["host"],
+        port=cfg["port"],
+        username=cfg["username"],
+        key_path=key_path,
+        remote_base=cfg["remote_base"],
+        station=station,
+    )
+    client.listing = RemoteCatalog(
+        client,
+        os.path.join(cache_dir("listings"), f"{station}.sqlite"),
+        min_interval=0,
+    )
+    return client
+
+
+# ----------------------------------------------------------------------#
+# bandwidth / retries
+# ----------------------------------------------------------------------#
+class RateLimiter:
+    """
+    Token bucket shared by every download thread. :meth:`consume` blocks
+    until ``n`` bytes fit under ``rate`` bytes/s (``rate <= 0``: unlimited).
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = rate
+        self._capacity = burst if burst is not None else rate
+        self._tokens = self._capacity
+        self._stamp = time.monotonic()
+        self._lock = threading.Lock()
+
+    def consume(self, n: int) -> None:
+        if self.rate <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self._capacity, self._tokens + (now - self._stamp) * self.rate
+            )
+            self._stamp = now
+            self._tokens -= n
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
+
+
+def with_retry(
+    fn: Callable[[], T],
+    *,
+    retries: int = 4,
+    backoff: float = 2.0,
+    max_backoff: float = 120.0,
+    sleep: Callable[[float], None] = time.sleep,
+) -> T:
+    """Call ``fn``, retrying connection errors with jittered exponential backoff."""
+    for attempt in range(retries + 1):
+        try:
+            return fn()
+        except CONNECTION_ERRORS:
+            if attempt == retries:
+                raise
+            sleep(min(max_backoff, backoff * 2**attempt) * random.uniform(0.5, 1.0))
+    raise AssertionError("unreachable")
+
+
+# ----------------------------------------------------------------------#
+# mirroring
+# ----------------------------------------------------------------------#
+class StationMirror:
+    """Keeps ``dest`` (``LoRes``/``HiRes``/``Wav``) in step with one station."""
+
+    def __init__(
+        self,
+        station: str,
+        client: RemoteVLFClient,
+        dest: str,
+        *,
+        limiter: Optional[RateLimiter] = None,
+        retries: int = 4,
+        backoff: float = 2.0,
+    ):
+        self.station = station
+        self._client = client
+        self._dest = dest
+        self._limiter = limiter
+        self._retries = retries
+        self._backoff = backoff
+        self._catalog = Catalog(dest)
+        self.stats = {"cycles": 0, "files": 0, "bytes": 0, "errors": 0}
+
+    def _retry(self, fn: Callable[[], T]) -> T:
+        return with_retry(fn, retries=self._retries, backoff=self._backoff)
+
+    def sync_once(self, stop: Optional[threading.Event] = None) -> int:
+        """
+        Download every remote file missing locally or whose local copy
+        differs from the listing in size or mtime; returns the count.
+        """
+        listing = self._client.listing
+        self._retry(lambda: listing.refresh(force=True))
+        throttle = self._limiter.consume if self._limiter is not None else None
+
+        fetched = 0
+        for resolution in FOLDERS:
+            local_dir = os.path.join(self._dest, resolution)
+            os.makedirs(local_dir, exist_ok=True)
+            # download() gives the copy the remote mtime: a copy whose size
+            # or mtime differs is partial (remote still being written) or stale
+            have = {
+                e.name: (e.stat().st_size, int(e.stat().st_mtime))
+                for e in os.scandir(local_dir)
+                if e.is_file()
+            }
+            remote_versions = listing.versions(resolution)
+            table = listing.table(resolution)
+            # newest first: the UI usually looks at the latest data
+            for i in range(len(table) - 1, -1, -1):
+                if stop is not None and stop.is_set():
+                    break
+                name = table.name(i)
+                if have.get(name) == remote_versions.get(name):
+                    continue
+                remote, local = table.path(i), os.path.join(local_dir, name)
+                try:
+                    size = self._retry(
+                        lambda: self._client.download(remote, local, throttle=throttle)
+                    )
+                except CONNECTION_ERRORS as exc:
+                    # left for the next cycle
+                    self.stats["errors"] += 1
+                    log.warning("%s: %s failed: %s", self.station, remote, exc)
+                    continue
+                except FileNotFoundError:
+                    # removed from the station since the listing (not retried)
+                    log.info("%s: %s is gone", self.station, remote)
+                    continue
+                fetched += 1
+                self.stats["files"] += 1
+                self.stats["bytes"] += size
+
+        if fetched:
+            self._catalog.refresh()
+        self.stats["cycles"] += 1
+        return fetched
+
+    def run(self, stop: threading.Event, interval: float) -> None:
+        """Poll until ``stop`` is set."""
+        while not stop.is_set():
+            try:
+                n = self.sync_once(stop)
+                if n:
+                    log.info("%s: mirrored %d new files", self.station, n)
+            except Exception:
+                self.stats["errors"] += 1
+                log.exception("%s: sync cycle failed", self.station)
+            stop.wait(interval)
+
+
+def run_mirrors(
+    mirrors: Sequence[StationMirror],
+    *,
+    interval: float,
+    stop: Optional[threading.Event] = None,
+) -> None:
+    """Run every mirror on its own thread until ``stop`` is set (or Ctrl-C)."""
+    stop = stop or threading.Event()
+    threads = [
+        threading.Thread(
+            target=m.run, args=(stop, interval), name=f"sync-{m.station}", daemon=True
+        )
+        for m in mirrors
+    ]
+    for t in threads:
+        t.start()
+    try:
+        while any(t.is_alive() for t in threads):
+            for t in threads:
+                t.join(timeout=1.0)
+    except KeyboardInterrupt:
+        log.info("stopping…")
+        stop.set()
+        for t in threads:
+            t.join()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser(
+        prog="cassandra-sync",
+        description="Mirror remote VLF stations into the local VLF/ layout.",
+    )
+    ap.add_argument("--dest",
+                    default=os.getenv("CASSANDRA_MIRROR_DIR", DEFAULT_MIRROR_ROOT),
+                    help="mirror root (default: VLF)")
+    ap.add_argument("--stations", nargs="*", help="subset of stations.yml")
+    ap.add_argument("--interval", type=float, default=60.0, help="poll period, s")
+    ap.add_argument("--bwlimit", type=float, default=0.0,
+                    help="total download limit in KiB/s (0 = unlimited)")
+    ap.add_argument("--retries", type=int, default=4)
+    ap.add_argument("--once", action="store_true", help="one pass, then exit")
+    args = ap.parse_args(argv)
+
+    load_dotenv()
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s %(threadName)s %(message)s"
+    )
+    key_path = os.path.expanduser(os.getenv("SSH_KEY_PATH", "~/.ssh/id_ed25519"))
+    stations = load_stations()
+    names = args.stations or list(stations)
+    limiter = RateLimiter(args.bwlimit * 1024) if args.bwlimit > 0 else None
+
+    mirrors = [
+        StationMirror(
+            name,
+            make_client(name, stations[name], key_path),
+            mirror_dir(name, args.dest),
+            limiter=limiter,
+            retries=args.retries,
+        )
+        for name in names
+    ]
+    if args.once:
+        for m in mirrors:
+            log.info("%s: mirrored %d new files", m.station, m.sync_once())
+        return
+    run_mirrors(mirrors, interval=args.interval)
+
+
+if __name__ == "__main__":
+    main()
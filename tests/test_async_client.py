@@ -0,0 +1,125 @@
+# tests/test_async_client.py
+#
+# Async multi-station engine over fake blocking clients (no network).
+
+import asyncio
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from ssh.async_client import AsyncVLFClient, MultiStationClient, _PerLoopSemaphore
+
+
+class _Blocking:
+    """Stands in for RemoteVLFClient: blocking calls, tracks concurrency."""
+
+    listing = None
+
+    def __init__(self, name, counter, delay=0.05):
+        self.name = name
+        self._counter = counter
+        self._delay = delay
+
+    def _io(self):
+        with self._counter["lock"]:
+            self._counter["now"] += 1
+            self._counter["peak"] = max(self._counter["peak"], self._counter["now"])
+            self._counter.setdefault(self.name, 0)
+            self._counter[self.name] += 1
+            self._counter["peak_" + self.name] = max(
+                self._counter.get("peak_" + self.name, 0), self._counter[self.name]
+            )
+        time.sleep(self._delay)
+        with self._counter["lock"]:
+            self._counter["now"] -= 1
+            self._counter[self.name] -= 1
+
+    def fetch_image_bytes(self, path):
+        self._io()
+        if "missing" in path:
+            raise FileNotFoundError(path)
+        return path.encode()
+
+    def list_images(self, resolution):
+        self._io()
+        base = datetime(2020, 4, 18, 12, tzinfo=timezone.utc)
+        return [
+            {"timestamp": base + timedelta(minutes=m),
+             "remote_path": f"{self.name}/{resolution}/{m}.jpg",
+             "original_filename": f"{self.name}_{m}.jpg",
+             "resolution": resolution}
+            for m in range(0, 60, 10)
+        ]
+
+
+def _counter():
+    return {"lock": threading.Lock(), "now": 0, "peak": 0}
+
+
+def test_per_station_and_global_caps():
+    counter = _counter()
+    fleet = MultiStationClient(
+        {n: _Blocking(n, counter) for n in ("A", "B", "C")},
+        per_station=2, global_limit=4,
+    )
+    paths = {n: [f"{n}/{i}.jpg" for i in range(6)] for n in ("A", "B", "C")}
+    t0 = time.perf_counter()
+    out = fleet.run(fleet.fetch_many(paths))
+    elapsed = time.perf_counter() - t0
+    fleet.close()
+
+    assert {n: len(r) for n, r in out.items()} == {"A": 6, "B": 6, "C": 6}
+    assert counter["peak"] <= 4
+    assert all(counter["peak_" + n] <= 2 for n in ("A", "B", "C"))
+    assert elapsed < 18 * 0.05  # faster than sequential
+
+
+def test_frames_at_fetches_nearest_from_every_station():
+    counter = _counter()
+    fleet = MultiStationClient({n: _Blocking(n, counter) for n in ("A", "B")})
+    when = datetime(2020, 4, 18, 12, 22, tzinfo=timezone.utc)
+    out = fleet.run(fleet.frames_at(when))
+    fleet.close()
+
+    for name in ("A", "B"):
+        frame, fetched = out[name]
+        assert frame["timestamp"].minute == 20
+        assert fetched.data == f"{name}/HiRes/20.jpg".encode()
+
+
+def test_frames_at_respects_tolerance_and_reports_errors():
+    counter = _counter()
+
+    class _Broken(_Blocking):
+        def list_images(self, resolution):
+            raise EOFError("station down")
+
+    fleet = MultiStationClient(
+        {"A": _Blocking("A", counter), "B": _Broken("B", counter)}
+    )
+    far = datetime(2020, 4, 19, tzinfo=timezone.utc)
+    out = fleet.run(fleet.frames_at(far, tolerance=timedelta(minutes=5)))
+    fleet.close()
+
+    assert out["A"] is None
+    assert isinstance(out["B"], EOFError)
+
+
+def test_fetch_errors_are_captured():
+    client = AsyncVLFClient(_Blocking("A", _counter()))
+    res = asyncio.run(client.fetch_many(["A/missing.jpg", "A/ok.jpg", "A/ok.jpg"]))
+    assert len(res) == 2
+    assert isinstance(res[0].error, FileNotFoundError) and res[1].data == b"A/ok.jpg"
+
+
+def test_semaphore_is_per_loop():
+    sem = _PerLoopSemaphore(1)
+
+    async def grab():
+        async with sem.get():
+            await asyncio.sleep(0)
+        return sem.get()
+
+    # a Streamlit rerun uses a new loop: no "bound to a different loop" error
+    first, second = asyncio.run(grab()), asyncio.run(grab())
+    assert first is not second
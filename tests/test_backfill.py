@@ -0,0 +1,115 @@
+# tests/test_backfill.py
+
+import os
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+from scipy.io import wavfile
+
+import inference.backfill
+from inference.backfill import backfill, backfill_jobs, shards
+from inference.models import load_model
+from inference.store import DetectionStore
+
+SR = 1000
+
+
+@pytest.fixture(autouse=True)
+def _cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("CASSANDRA_CACHE_DIR", str(tmp_path / "cache"))
+
+
+def _archive(tmp_path, days=(1, 2, 3)):
+    os.makedirs(tmp_path / "Wav")
+    for day in days:
+        for hour in (0, 12):
+            name = f"ExperimentalG4_Audio_{day:02d}UTC{hour:02d}0000.wav"
+            path = tmp_path / "Wav" / name
+            rng = np.random.default_rng(day * 100 + hour)
+            wavfile.write(str(path), SR, rng.normal(0, 1000, 5 * SR).astype(np.int16))
+            mtime = datetime(2025, 4, day, hour, 0, 5, tzinfo=timezone.utc).timestamp()
+            os.utime(path, (mtime, mtime))
+    return str(tmp_path)
+
+
+def test_jobs_cover_the_range_oldest_first(tmp_path):
+    root = _archive(tmp_path)
+    jobs = backfill_jobs(root, "ExperimentalG4",
+                         datetime(2025, 4, 2, tzinfo=timezone.utc),
+                         datetime(2025, 4, 3, tzinfo=timezone.utc))
+    assert [j.source for j in jobs] == [
+        "ExperimentalG4_Audio_02UTC000000.wav",
+        "ExperimentalG4_Audio_02UTC120000.wav",
+        "ExperimentalG4_Audio_03UTC000000.wav",
+    ]
+    assert backfill_jobs(root, "Duronia", None, None) == []
+    assert [len(s) for s in shards(list(range(7)), 3)] == [3, 3, 1]
+
+
+def test_backfill_resumes_from_the_store(tmp_path):
+    root = _archive(tmp_path)
+    jobs = backfill_jobs(root, None, None, None)
+    store = DetectionStore(os.path.join(root, "det.sqlite"))
+    label = load_model("1-D CNN").label
+
+    # an earlier run got through the first two files
+    for job in jobs[:2]:
+        store.add(label, job.version, [])
+    progress = backfill(jobs, "1-D CNN", store, workers=2, shard_files=2, threshold=0.0)
+    assert progress.total == 4 and progress.files == 4
+    assert progress.detections == 4  # threshold 0: one event per file
+    assert all(store.processed(label, j.version) for j in jobs)
+
+    again = backfill(jobs, "1-D CNN", DetectionStore(store.path), workers=2)
+    assert again.total == 0
+
+
+def test_new_weights_are_a_new_model(tmp_path):
+    root = _archive(tmp_path, days=(1,))
+    jobs = backfill_jobs(root, None, None, None)
+    store = DetectionStore(os.path.join(root, "det.sqlite"))
+    backfill(jobs, "Simple RNN", store, workers=1)
+
+    weights = tmp_path / "rnn.npz"
+    np.savez(weights, b_out=np.array([-50.0], np.float32))  # never fires
+    progress = backfill(jobs, "Simple RNN", store, weights=str(weights), workers=1)
+    assert progress.files == 2 and progress.detections == 0
+    assert load_model("Simple RNN", str(weights)).label.startswith("Simple RNN@")
+
+
+_score_shard = inference.backfill._score_shard
+
+
+def _fail_on_day_two(jobs):  # runs in the (forked) worker
+    if any("_02UTC" in j.source for j in jobs):
+        raise RuntimeError("worker lost")
+    return _score_shard(jobs)
+
+
+def test_failed_shard_is_logged_and_skipped(tmp_path, monkeypatch, caplog):
+    root = _archive(tmp_path)
+    jobs = backfill_jobs(root, None, None, None)
+    store = DetectionStore(os.path.join(root, "det.sqlite"))
+    monkeypatch.setattr(inference.backfill, "_score_shard", _fail_on_day_two)
+
+    progress = backfill(jobs, "1-D CNN", store, workers=1, shard_files=2)
+    assert progress.files == 4 and progress.errors == 2
+    assert "shard of 2 files" in caplog.text
+    assert store.done(load_model("1-D CNN").label) == {
+        j.version for j in jobs if "_02UTC" not in j.source}
+
+
+def test_mirrors_are_selected_by_station_key(tmp_path):
+    os.makedirs(tmp_path / "Duronia" / "Wav")
+    path = tmp_path / "Duronia" / "Wav" / "DUR01_Audio_02UTC000000.wav"
+    wavfile.write(str(path), SR, np.zeros(3 * SR, np.int16))
+    mtime = datetime(2025, 4, 2, 0, 0, 5, tzinfo=timezone.utc).timestamp()
+    os.utime(path, (mtime, mtime))
+    root = _archive(tmp_path, days=(1,))
+
+    jobs = backfill_jobs(root, "Duronia", None, None)
+    assert [(j.station, j.source) for j in jobs] == [("Duronia", path.name)]
+    assert {j.station for j in backfill_jobs(root, None, None, None)} == {
+        "Duronia", "ExperimentalG4"}
+    assert backfill_jobs(root, "DUR01", None, None) == []
@@ -0,0 +1,98 @@
+# tests/test_catalog.py
+
+import os
+from datetime import datetime, timezone
+
+from parser.catalog import Catalog
+
+
+def _touch(folder, name):
+    folder.mkdir(parents=True, exist_ok=True)
+    (folder / name).write_bytes(b"")
+
+
+def test_refresh_and_query(tmp_path):
+    _touch(tmp_path / "LoRes", "ExperimentalG4_LoRest_180420UTC0100.jpg")
+    _touch(tmp_path / "LoRes", "ExperimentalG4_LoRest_180420UTC0200.jpg")
+    _touch(tmp_path / "LoRes", "Other1_LoRest_180420UTC0100.jpg")
+    _touch(tmp_path / "HiRes", "ExperimentalG4_HiRest_180420UTC150040.jpg")
+    _touch(tmp_path / "HiRes", "not_a_frame.jpg")
+
+    cat = Catalog(str(tmp_path))
+    assert cat.refresh() == 4
+
+    lores = cat.query("ExperimentalG4", "LoRes")
+    assert [x["timestamp"].hour for x in lores] == [1, 2]
+    assert lores[0]["full_path"] == os.path.join(
+        str(tmp_path), "LoRes", "ExperimentalG4_LoRest_180420UTC0100.jpg"
+    )
+
+    hires = cat.query("ExperimentalG4", "HiRes")
+    assert hires[0]["timestamp"] == datetime(
+        2020, 4, 18, 15, 0, 40, tzinfo=timezone.utc
+    )
+
+
+def test_range_query(tmp_path):
+    for hh in range(5):
+        _touch(tmp_path / "LoRes", f"ExperimentalG4_LoRest_180420UTC{hh:02d}00.jpg")
+    cat = Catalog(str(tmp_path))
+    cat.refresh()
+
+    sel = cat.query(
+        "ExperimentalG4",
+        "LoRes",
+        start=datetime(2020, 4, 18, 1, tzinfo=timezone.utc),
+        end=datetime(2020, 4, 18, 3, tzinfo=timezone.utc),
+    )
+    assert [x["timestamp"].hour for x in sel] == [1, 2, 3]
+
+
+def test_refresh_is_incremental(tmp_path):
+    lo = tmp_path / "LoRes"
+    _touch(lo, "ExperimentalG4_LoRest_180420UTC0100.jpg")
+    cat = Catalog(str(tmp_path))
+    cat.refresh()
+
+    # unchanged folders are not listed again
+    assert cat.refresh() == 0
+
+    _touch(lo, "ExperimentalG4_LoRest_180420UTC0200.jpg")
+    os.remove(lo / "ExperimentalG4_LoRest_180420UTC0100.jpg")
+    os.utime(lo, ns=(0, os.stat(lo).st_mtime_ns + 1))
+    assert cat.refresh() == 2
+    assert [x["timestamp"].hour for x in cat.query("ExperimentalG4", "LoRes")] == [2]
+
+
+def test_wavs_use_mtime(tmp_path):
+    # the name only holds the day of month: the mtime supplies the rest
+    mtime = datetime(2020, 5, 3, 9, 0, tzinfo=timezone.utc).timestamp()
+    for name in ("ExperimentalG4_Audio_02UTC201720.wav", "ExperimentalG4_odd.wav"):
+        _touch(tmp_path / "Wav", name)
+        os.utime(tmp_path / "Wav" / name, (mtime, mtime))
+    cat = Catalog(str(tmp_path))
+    cat.refresh()
+    wav, odd = cat.query("ExperimentalG4", "Wav")
+    assert wav["filename"] == "ExperimentalG4_Audio_02UTC201720.wav"
+    assert wav["path"].endswith(os.path.join("Wav", wav["filename"]))
+    assert wav["timestamp"] == datetime(2020, 5, 2, 20, 17, 20, tzinfo=timezone.utc)
+    # a name that does not parse is dated by the mtime itself
+    assert odd["timestamp"] == datetime(2020, 5, 3, 9, 0, tzinfo=timezone.utc)
+
+
+def test_outdated_catalog_is_rebuilt(tmp_path):
+    import sqlite3
+
+    from parser.catalog import CATALOG_VERSION
+
+    db = tmp_path / "cat.sqlite"
+    cat = Catalog(str(tmp_path), db_path=str(db))
+    cat.refresh()
+    with sqlite3.connect(db) as con:
+        con.execute("INSERT INTO frames VALUES ('X', 'Wav', 0, 'stale.wav')")
+        con.execute("PRAGMA user_version = 1")
+
+    Catalog(str(tmp_path), db_path=str(db))
+    with sqlite3.connect(db) as con:
+        assert con.execute("SELECT COUNT(*) FROM frames").fetchone() == (0,)
+        assert con.execute("PRAGMA user_version").fetchone() == (CATALOG_VERSION,)
@@ -0,0 +1,63 @@
+# tests/test_disk_cache.py
+
+import os
+
+from cache.disk import DiskCache, file_key
+
+
+def test_hit_and_miss(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    assert cache.get("k" * 64) is None
+    cache.put("k" * 64, b"payload")
+    assert cache.get("k" * 64) == b"payload"
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+    assert stats["bytes_saved"] == len(b"payload")
+
+
+def test_get_or_fetch_calls_once(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return b"x" * 10
+
+    key = file_key("STN", "C:/VLF/HiRes/a.jpg", 10, 1_700_000_000)
+    assert cache.get_or_fetch(key, fetch) == b"x" * 10
+    assert cache.get_or_fetch(key, fetch) == b"x" * 10
+    assert len(calls) == 1
+
+
+def test_key_changes_with_mtime_and_size():
+    a = file_key("STN", "/a.wav", 100, 1)
+    assert a != file_key("STN", "/a.wav", 100, 2)
+    assert a != file_key("STN", "/a.wav", 101, 1)
+    assert a != file_key("OTHER", "/a.wav", 100, 1)
+
+
+def test_lru_eviction_under_budget(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=30)
+    for k in ("aa", "bb", "cc"):
+        cache.put(k * 32, b"0123456789")
+    cache.get("aa" * 32)  # bump: "bb" is now least recent
+    cache.put("dd" * 32, b"0123456789")
+
+    assert "bb" * 32 not in cache
+    assert "aa" * 32 in cache and "dd" * 32 in cache
+    assert cache.stats()["bytes_stored"] <= 30
+    assert not os.path.exists(os.path.join(tmp_path, "bb", "bb" * 32))
+
+
+def test_survives_restart_without_temp_files(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    cache.put("ab" * 32, b"hello")
+    leftovers = [
+        fn for _, _, files in os.walk(tmp_path) for fn in files if fn.startswith(".")
+    ]
+    assert leftovers == []
+
+    reopened = DiskCache(str(tmp_path))
+    assert reopened.get("ab" * 32) == b"hello"
+    assert reopened.stats()["entries"] == 1
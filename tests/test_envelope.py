@@ -0,0 +1,63 @@
+# tests/test_envelope.py
+
+import io
+
+import numpy as np
+from scipy.io import wavfile
+
+from media.envelope import Envelope, envelope_for, lod_points, minmax_points
+from media.wav import open_local
+
+
+def _signal(n=1_000_000):
+    rng = np.random.default_rng(1)
+    return (rng.standard_normal(n) * 1000).astype(np.int16)
+
+
+def test_pyramid_bounds_points_and_keeps_extremes():
+    sig = _signal()
+    env = Envelope.build(sig)
+
+    for start, stop in [(0, len(sig)), (123_456, 523_456), (10, 50_000)]:
+        x, y = env.points(start, stop, max_points=2000)
+        assert len(y) <= 2000 + 4
+        # the envelope never loses a peak inside the window
+        assert y.max() >= sig[start:stop].max()
+        assert y.min() <= sig[start:stop].min()
+        assert x[0] <= start and x[-1] < stop
+
+    assert env.points(0, 1500, max_points=2000) is None  # raw is cheaper
+
+
+def test_zooming_in_refines_the_level():
+    env = Envelope.build(_signal())
+    coarse_x, _ = env.points(0, 1_000_000)
+    fine_x, _ = env.points(0, 100_000)
+    assert np.diff(fine_x[::2]).max() < np.diff(coarse_x[::2]).max()
+
+
+def test_minmax_points_matches_window():
+    sig = _signal(10_000)
+    x, y = minmax_points(sig, offset=500, max_points=100)
+    assert len(y) <= 100 and x[0] == 500
+    assert y.max() == sig.max() and y.min() == sig.min()
+
+    x, y = minmax_points(sig[:50], offset=7)
+    np.testing.assert_array_equal(y, sig[:50])
+
+
+def test_envelope_persisted_and_reused(tmp_path, monkeypatch):
+    monkeypatch.setenv("CASSANDRA_CACHE_DIR", str(tmp_path / "cache"))
+    path = tmp_path / "a.wav"
+    buf = io.BytesIO()
+    wavfile.write(buf, 44_100, _signal(200_000))
+    path.write_bytes(buf.getvalue())
+
+    envelope_for(str(path))
+    saved = list((tmp_path / "cache" / "envelopes").glob("*.npz"))
+    assert len(saved) == 1
+    loaded = Envelope.load(str(saved[0]))
+    assert loaded.n_samples == 200_000
+
+    x, y = lod_points(open_local(str(path)), 0, 200_000)
+    assert len(y) <= 2004
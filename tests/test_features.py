@@ -0,0 +1,54 @@
+# tests/test_features.py
+
+import os
+
+import numpy as np
+import pytest
+from scipy.io import wavfile
+
+from media.features import (
+    DEFAULT,
+    band_energies,
+    features_for,
+    frame_times,
+    normalise,
+)
+
+SR = 44_100
+
+
+@pytest.fixture(autouse=True)
+def _cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("CASSANDRA_CACHE_DIR", str(tmp_path / "cache"))
+
+
+def _tone(hz, seconds=1.0):
+    t = np.arange(int(seconds * SR)) / SR
+    return (np.sin(2 * np.pi * hz * t) * 10_000).astype(np.int16)
+
+
+def test_a_tone_lands_in_its_band():
+    feats = band_energies(_tone(5_000), SR)  # 4–7 kHz
+    assert feats.shape == (len(frame_times(len(feats), SR)), DEFAULT.n_bands)
+    assert (feats.argmax(axis=1) == 2).all()
+
+
+def test_normalise_per_chunk_and_band():
+    z = normalise(np.random.default_rng(0).normal(5, 3, (4, 64, 7)))
+    np.testing.assert_allclose(z.mean(axis=1), 0, atol=1e-5)
+    np.testing.assert_allclose(z.std(axis=1), 1, atol=1e-3)
+
+
+def test_file_features_are_cached_per_version(tmp_path):
+    path = str(tmp_path / "a.wav")
+    wavfile.write(path, SR, _tone(3_000))
+    first = features_for(path)
+    cached = os.listdir(tmp_path / "cache" / "features")
+    assert len(cached) == 1
+    assert features_for(path) is first  # in memory
+    np.testing.assert_array_equal(np.asarray(first), band_energies(_tone(3_000), SR))
+
+    wavfile.write(path, SR, _tone(9_000))
+    os.utime(path, ns=(1, 1))
+    assert (np.asarray(features_for(path)).argmax(axis=1) == 3).all()
+    assert len(os.listdir(tmp_path / "cache" / "features")) == 2
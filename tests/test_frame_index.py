@@ -0,0 +1,77 @@
+# tests/test_frame_index.py
+
+from datetime import date, datetime, time, timedelta, timezone
+
+from parser.frame_index import FrameIndex, day_bounds, merged_days
+
+UTC = timezone.utc
+BASE = datetime(2020, 4, 18, 15, 0, 0, tzinfo=UTC)
+
+
+def _index(minutes):
+    recs = [
+        {
+            "station": "ExperimentalG4",
+            "resolution": "HiRes",
+            "timestamp": BASE + timedelta(minutes=m),
+            "full_path": f"/VLF/HiRes/{m}.jpg",
+        }
+        for m in minutes
+    ]
+    return FrameIndex.from_records(recs)
+
+
+def _label(row):
+    return int(row["original_filename"][:-4])
+
+
+def test_from_records_sorts():
+    ix = _index([30, 0, 10])
+    assert [_label(r) for r in ix] == [0, 10, 30]
+    assert _label(ix[-1]) == 30
+
+
+def test_window_bounds():
+    ix = _index([0, 10, 20, 30])
+    start, end = BASE + timedelta(minutes=10), BASE + timedelta(minutes=30)
+    assert [_label(r) for r in ix.window(start, end)] == [10, 20, 30]
+    assert [_label(r) for r in ix.window(start, end, include_end=False)] == [10, 20]
+    assert not ix.window(end, start)
+
+
+def test_slices_are_pages():
+    ix = _index([0, 10, 20, 30, 40])
+    page = ix[1:3]
+    assert isinstance(page, FrameIndex)
+    assert [_label(r) for r in page] == [10, 20]
+    assert len(ix[4:8]) == 1 and len(ix[8:]) == 0
+    assert _label(page.nearest(BASE)) == 10
+
+
+def test_nearest():
+    ix = _index([-3, 10])
+    assert _label(ix.nearest(BASE + timedelta(minutes=5))) == 10
+    assert _label(ix.nearest(BASE - timedelta(hours=1))) == -3
+    assert _label(ix.nearest(BASE + timedelta(hours=1))) == 10
+    assert FrameIndex.from_records([]).nearest(BASE) is None
+
+
+def test_hour_and_days():
+    ix = _index([5, 65, 24 * 60 + 1])
+    assert _label(ix.hour(BASE)) == 5
+    assert _label(ix.hour(BASE + timedelta(hours=1))) == 65
+    assert ix.hour(BASE + timedelta(hours=3)) is None
+    assert ix.days() == [date(2020, 4, 18), date(2020, 4, 19)]
+    assert ix.hours(date(2020, 4, 18)) == [BASE, BASE + timedelta(hours=1)]
+
+
+def test_naive_timestamps_are_utc():
+    ix = _index([0])
+    assert _label(ix.nearest(BASE.replace(tzinfo=None))) == 0
+
+
+def test_merged_days_and_bounds():
+    a, b = _index([0, 30]), _index([-60, 24 * 60])
+    assert merged_days([a, b]) == [date(2020, 4, 18), date(2020, 4, 19)]
+    assert day_bounds([a, b], date(2020, 4, 18)) == (time(14, 0), time(15, 30))
+    assert day_bounds([a], date(2021, 1, 1)) is None
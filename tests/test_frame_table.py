@@ -0,0 +1,76 @@
+# tests/test_frame_table.py
+
+import pickle
+import sys
+from datetime import datetime, timezone
+
+import numpy as np
+
+from parser.frame_table import FrameTable, Resolution
+
+TS = datetime(2020, 4, 18, 15, 0, 40, tzinfo=timezone.utc)
+
+
+def _records():
+    return [
+        {
+            "station": "ExperimentalG4",
+            "resolution": "HiRes",
+            "timestamp": TS,
+            "original_filename": "ExperimentalG4_HiRest_180420UTC150040.jpg",
+            "full_path": "VLF/HiRes/ExperimentalG4_HiRest_180420UTC150040.jpg",
+        },
+        {
+            "station": "Duronia",
+            "resolution": "LoRes",
+            "timestamp": TS.replace(second=0),
+            "original_filename": "Duronia_LoRest_180420UTC1500.jpg",
+            "full_path": "VLF/LoRes/Duronia_LoRest_180420UTC1500.jpg",
+        },
+    ]
+
+
+def test_rows_match_records():
+    recs = _records()
+    table = FrameTable.from_records(recs)
+    assert len(table) == 2
+    assert [dict(r) for r in table] == recs
+    assert table[1]["station"] == "Duronia"
+    assert table.resolution.tolist() == [Resolution.HIRES, Resolution.LORES]
+
+
+def test_wav_rows():
+    table = FrameTable.from_records(
+        [{"path": "VLF/Wav/G4_Audio_02UTC201720.wav", "timestamp": TS,
+          "filename": "G4_Audio_02UTC201720.wav"}]
+    )
+    row = table[0]
+    assert row["filename"] == "G4_Audio_02UTC201720.wav"
+    assert row["path"] == "VLF/Wav/G4_Audio_02UTC201720.wav"
+    assert row["station"] == "G4"
+    assert "resolution" not in row
+
+
+def test_take_and_concat_share_pool():
+    a = FrameTable.from_records(_records())
+    b = FrameTable.from_records(_records()[::-1])
+    both = FrameTable.concat([a.take(np.array([1])), b])
+    assert [r["station"] for r in both] == ["Duronia", "Duronia", "ExperimentalG4"]
+    assert both[2]["full_path"] == _records()[0]["full_path"]
+
+
+def test_pickle_roundtrip_and_footprint():
+    recs = []
+    for i in range(1000):
+        fn = f"ExperimentalG4_HiRest_180420UTC15{i // 60 % 60:02d}{i % 60:02d}.jpg"
+        recs.append(dict(_records()[0], original_filename=fn,
+                         full_path="VLF/HiRes/" + fn))
+    table = FrameTable.from_records(recs)
+
+    clone = pickle.loads(pickle.dumps(table))
+    assert dict(clone[-1]) == recs[-1]
+
+    dict_bytes = sum(
+        sys.getsizeof(r) + sum(sys.getsizeof(v) for v in r.values()) for r in recs
+    )
+    assert table.nbytes * 5 < dict_bytes
@@ -0,0 +1,168 @@
+# tests/test_inference.py
+
+import os
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+from scipy.io import wavfile
+
+from inference.models import MODELS, Model, load_model
+from inference.pipeline import InferencePipeline, WavJob, chunk_starts, events
+from inference.service import InferenceService, pending_jobs, wav_roots
+from inference.store import DetectionStore
+
+SR = 1000
+
+
+@pytest.fixture(autouse=True)
+def _cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("CASSANDRA_CACHE_DIR", str(tmp_path / "cache"))
+
+
+class _Recorder(Model):
+    """Scores every chunk 1.0 and remembers the batch sizes."""
+
+    name = "recorder"
+    chunk_seconds = 2.0
+    hop_seconds = 1.0
+
+    def init_weights(self, rng):
+        return {}
+
+    def __init__(self, delay=0.0):
+        super().__init__()
+        self.batches = []
+        self.delay = delay
+
+    def predict(self, batch):
+        time.sleep(self.delay)
+        self.batches.append(len(batch))
+        return np.ones(len(batch))
+
+
+def _wav(path, seconds, mtime=None):
+    rng = np.random.default_rng(len(str(path)))
+    samples = rng.normal(0, 1000, int(seconds * SR)).astype(np.int16)
+    wavfile.write(str(path), SR, samples)
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+    return str(path)
+
+
+def _jobs(paths):
+    t0 = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return [WavJob("S", t0, os.path.basename(p), p, p) for p in paths]
+
+
+def test_chunk_starts_cover_the_file():
+    assert chunk_starts(10, 4, 2).tolist() == [0, 2, 4, 6]
+    assert chunk_starts(11, 4, 3).tolist() == [0, 3, 6, 7]  # tail aligned to the end
+    assert chunk_starts(3, 4, 2).tolist() == [0]
+    assert chunk_starts(0, 4, 2).tolist() == []
+
+
+def test_events_merge_consecutive_chunks():
+    scores = np.array([0.9, 0.8, 0.1, 0.7, 0.2])
+    starts = np.array([0, 10, 20, 30, 40])
+    assert events(scores, starts, 20, 0.5) == [(0, 30, 0.9), (30, 50, 0.7)]
+    assert events(scores, starts, 20, 0.95) == []
+
+
+@pytest.mark.parametrize("name", list(MODELS))
+def test_models_score_rows_independently(name):
+    model = load_model(name)
+    rng = np.random.default_rng(0)
+    batch = rng.normal(-3, 1, (5, 64, model.n_bands)).astype(np.float32)
+    scores = model.predict(batch)
+    assert scores.shape == (5,)
+    assert ((scores >= 0) & (scores <= 1)).all()
+    np.testing.assert_allclose(model.predict(batch[2:3]), scores[2:3], rtol=1e-5)
+
+
+def test_load_model_rejects_unknown_names_and_weights(tmp_path):
+    with pytest.raises(ValueError):
+        load_model("nope")
+    np.savez(tmp_path / "w.npz", bogus=np.zeros(1))
+    with pytest.raises(ValueError):
+        load_model("1-D CNN", str(tmp_path / "w.npz"))
+
+
+def test_batches_span_files_and_files_are_recorded(tmp_path):
+    paths = [_wav(tmp_path / f"S_Audio_{i}.wav", 6) for i in range(3)]  # 5 chunks each
+    model = _Recorder()
+    store = DetectionStore(str(tmp_path / "det.sqlite"))
+    found = InferencePipeline(model, store, batch_size=4).run(_jobs(paths))
+
+    assert model.batches == [4, 4, 4, 3]
+    assert len(found) == 3  # every chunk hits: one event per file
+    d = found[0]
+    assert (d.end - d.start).total_seconds() == pytest.approx(6, abs=0.05)
+    assert all(store.processed("recorder", p) for p in paths)
+    assert len(DetectionStore(store.path).detections()) == 3
+
+
+def test_reader_is_held_back_by_the_model(tmp_path):
+    paths = [_wav(tmp_path / f"S_Audio_{i}.wav", 6) for i in range(4)]
+    pipe = InferencePipeline(_Recorder(delay=0.02), batch_size=2, max_pending=1)
+    pipe.run(_jobs(paths))
+    assert pipe.stats["peak_pending"] <= 1
+    assert pipe.stats["chunks"] == 20 and pipe.stats["files"] == 4
+
+
+def test_unreadable_files_are_skipped(tmp_path):
+    bad = tmp_path / "bad.wav"
+    bad.write_bytes(b"not a wav")
+    good = _wav(tmp_path / "S_Audio_1.wav", 3)
+    pipe = InferencePipeline(_Recorder())
+    pipe.run(_jobs([str(bad), good]))
+    assert pipe.stats["errors"] == 1 and pipe.stats["files"] == 1
+
+
+def test_service_resumes_and_waits_for_settled_files(tmp_path):
+    old = time.time() - 3600
+    os.makedirs(tmp_path / "Wav")
+    os.makedirs(tmp_path / "Duronia" / "Wav")
+    _wav(tmp_path / "Wav" / "ExperimentalG4_Audio_01UTC000000.wav", 3, old)
+    _wav(tmp_path / "Duronia" / "Wav" / "Duronia_Audio_01UTC000000.wav", 3, old)
+    assert wav_roots(str(tmp_path)) == [str(tmp_path), str(tmp_path / "Duronia")]
+
+    store = DetectionStore(str(tmp_path / ".cassandra" / "det.sqlite"))
+    service = InferenceService(_Recorder(), str(tmp_path), store)
+    assert service.run_once() == 2
+    assert service.run_once() == 0
+
+    _wav(tmp_path / "Wav" / "ExperimentalG4_Audio_01UTC000100.wav", 3)  # just written
+    assert pending_jobs(str(tmp_path), store, "recorder") == []
+    reopened = DetectionStore(store.path)
+    service = InferenceService(_Recorder(), str(tmp_path), reopened, settle=0)
+    assert service.run_once() == 1
+
+
+def test_mirrored_files_are_keyed_by_their_station(tmp_path):
+    old = time.time() - 3600
+    os.makedirs(tmp_path / "Wav")
+    os.makedirs(tmp_path / "Duronia" / "Wav")
+    _wav(tmp_path / "Wav" / "ExperimentalG4_Audio_01UTC000000.wav", 3, old)
+    # the file prefix is not the station key
+    _wav(tmp_path / "Duronia" / "Wav" / "DUR01_Audio_01UTC000000.wav", 3, old)
+    store = DetectionStore(str(tmp_path / "det.sqlite"))
+    InferenceService(_Recorder(), str(tmp_path), store).run_once()
+
+    # the names the UI queries with: the sidebar / stations.yml key
+    assert [d.station for d in store.detections("Duronia")] == ["Duronia"]
+    assert len(store.bins("hour", "Duronia")) == 1
+    assert store.detections("DUR01") == []
+    assert [d.station for d in store.detections("ExperimentalG4")] == ["ExperimentalG4"]
+
+
+def test_model_is_abstract():
+    class Partial(Model):
+        name = "partial"
+
+        def init_weights(self, rng):
+            return {}
+
+    with pytest.raises(TypeError):
+        Partial()
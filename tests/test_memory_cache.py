@@ -0,0 +1,66 @@
+# tests/test_memory_cache.py
+
+import threading
+import time
+
+import numpy as np
+from PIL import Image
+
+from cache.memory import MemoryCache, sizeof
+
+
+def test_sizes():
+    assert sizeof(b"abc") == 3
+    assert sizeof(np.zeros((10, 10), np.float32)) == 400
+    assert sizeof(Image.new("RGB", (10, 4))) == 120
+    assert sizeof((b"ab", np.zeros(3, np.uint8))) == 5
+
+
+def test_budget_lru_and_stats():
+    cache = MemoryCache(max_bytes=10)
+    cache.put("a", b"12345")
+    cache.put("b", b"12345")
+    assert cache.get("a") == b"12345"  # a is now most recent
+    cache.put("c", b"12345")
+    assert "b" not in cache and "a" in cache
+
+    cache.put("huge", b"x" * 11)  # larger than the budget: not kept
+    assert "huge" not in cache and "a" in cache
+
+    stats = cache.stats()
+    assert stats["bytes_stored"] == 10 and stats["entries"] == 2
+    assert stats["hits"] == 1 and stats["evictions"] == 1
+
+
+def test_replacing_an_entry_reaccounts_its_size():
+    cache = MemoryCache(max_bytes=10)
+    cache.put("a", b"1234567890")
+    cache.put("a", b"1")
+    cache.put("b", b"123456789")
+    assert cache.stats()["bytes_stored"] == 10 and len(cache) == 2
+
+
+def test_concurrent_misses_compute_once():
+    cache = MemoryCache(max_bytes=1000)
+    calls = []
+
+    def decode():
+        calls.append(1)
+        time.sleep(0.05)
+        return b"pixels"
+
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(cache.get_or_compute("k", decode))
+        )
+        for _ in range(8)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert results == [b"pixels"] * 8 and len(calls) == 1
+    stats = cache.stats()
+    assert stats["misses"] == 1 and stats["hits"] == 7
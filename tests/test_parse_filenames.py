@@ -1,8 +1,9 @@
 from datetime import datetime
 
+import numpy as np
 import pytest
 
-from parser.parse_filenames import parse_filename
+from parser.parse_filenames import parse_filename, parse_filenames_bulk
 
 
 def test_hi_res():
@@ -23,3 +24,66 @@ def test_lo_res():
 
 def test_bad_name():
     assert parse_filename("foo_bar.jpg") is None
+
+
+def test_bulk_matches_single():
+    names = [
+        "ExperimentalG4_HiRest_180420UTC150040.jpg",
+        "ExperimentalG4_LoRest_180420UTC0100.jpg",
+        "foo_bar.jpg",
+        "ExperimentalG4_HiRest_310420UTC150040.jpg",  # 31 April
+    ]
+    res = parse_filenames_bulk(names)
+    assert res.valid.tolist() == [True, True, False, False]
+    assert res.rejected.tolist() == [False, False, True, True]
+    for i in (0, 1):
+        single = parse_filename(names[i])
+        assert res.station[i] == single["station"]
+        naive = single["timestamp"].replace(tzinfo=None)
+        assert res.timestamp[i] == np.datetime64(naive)
+
+
+def test_bulk_wav_dates_from_reference():
+    names = ["ExperimentalG4_Audio_02UTC201720.wav",
+             "ExperimentalG4_Audio_31UTC000000.wav"]
+    res = parse_filenames_bulk(names, reference=datetime(2020, 5, 3))
+    assert res.valid.all()
+    assert res.timestamp.tolist() == [
+        datetime(2020, 5, 2, 20, 17, 20),
+        datetime(2020, 3, 31, 0, 0, 0),  # April has no 31st
+    ]
+
+
+def test_bulk_empty():
+    assert len(parse_filenames_bulk([]).valid) == 0
+
+
+def test_bulk_agrees_with_single_on_a_mixed_corpus():
+    names = [
+        "ExperimentalG4_HiRest_180420UTC150040.jpg",
+        "ExperimentalG4_HiRest_180420UTC1500.jpg",      # 4-digit HiRes time
+        "ExperimentalG4_LoRest_180420UTC0100.jpg",
+        "ExperimentalG4_LoRest_180420UTC010000.jpg",    # 6-digit LoRes time
+        "ExperimentalG4_LoRest_180420UTC01000.jpg",     # 5 digits: rejected by both
+        "VLF/HiRes/Duronia_HiRest_010125UTC235959.jpg",
+        "C:\\htdocs\\VLF\\LoRes\\Duronia_LoRest_010125UTC2300.jpg",
+        "X_HiRest_290221UTC1200.jpg",                   # 29 Feb 2021
+        "X_HiRest_290220UTC1200.jpg",
+        "X_LoRest_180420UTC2460.jpg",
+        "Bad-Name_HiRest_180420UTC1500.jpg",
+        "ExperimentalG4_HiRest_180420UTC150040.png",
+        "ExperimentalG4_Hirest_180420UTC150040.jpg",
+        "foo_bar.jpg",
+        "",
+    ]
+    res = parse_filenames_bulk(names)
+    for i, name in enumerate(names):
+        single = parse_filename(name.replace("\\", "/"))
+        assert res.valid[i] == (single is not None), name
+        if single is not None:
+            assert res.station[i] == single["station"], name
+            code = {"LoRes": 0, "HiRes": 1}[single["resolution"]]
+            assert res.resolution[i].item() == code, name
+            naive = single["timestamp"].replace(tzinfo=None)
+            assert res.timestamp[i] == np.datetime64(naive), name
+    assert res.valid[:4].all() and not res.valid[4]
@@ -0,0 +1,137 @@
+# tests/test_pool.py
+#
+# Exercises the pool bookkeeping with in-memory stand-ins for paramiko
+# clients, so no SSH server is needed.
+
+import threading
+
+import pytest
+
+from ssh.pool import SSHPool
+
+KEY = ("example.org", 22, "User")
+
+
+class _Channel:
+    closed = False
+
+
+class _Sftp:
+    def __init__(self):
+        self.channel = _Channel()
+
+    def get_channel(self):
+        return self.channel
+
+    def close(self):
+        self.channel.closed = True
+
+
+class _Transport:
+    def __init__(self):
+        self.active = True
+        self.keepalive = None
+
+    def is_active(self):
+        return self.active
+
+    def is_authenticated(self):
+        return True
+
+    def set_keepalive(self, secs):
+        self.keepalive = secs
+
+
+class _Client:
+    def __init__(self):
+        self.transport = _Transport()
+
+    def get_transport(self):
+        return self.transport
+
+    def open_sftp(self):
+        return _Sftp()
+
+    def close(self):
+        self.transport.active = False
+
+
+@pytest.fixture
+def pool():
+    clients = []
+
+    def connect(*args):
+        clients.append(_Client())
+        return clients[-1]
+
+    p = SSHPool(connect=connect, idle_timeout=60)
+    p.clients = clients
+    return p
+
+
+def test_transport_and_channel_reused(pool):
+    with pool.sftp(KEY, "~/.ssh/id") as a:
+        pass
+    with pool.sftp(KEY, "~/.ssh/id") as b:
+        pass
+    assert a is b
+    assert pool.stats["connects"] == 1
+    assert pool.stats["channels_opened"] == 1
+    assert pool.clients[0].transport.keepalive == 30
+
+
+def test_concurrent_checkouts_get_separate_channels(pool):
+    with pool.sftp(KEY, "k") as a, pool.sftp(KEY, "k") as b:
+        assert a is not b
+    assert pool.stats["connects"] == 1
+
+
+def test_reconnects_dead_transport(pool):
+    with pool.sftp(KEY, "k"):
+        pass
+    pool.clients[0].transport.active = False
+    assert not pool.alive(KEY)
+    with pool.sftp(KEY, "k"):
+        pass
+    assert pool.stats["connects"] == 2
+
+
+def test_failed_channel_is_discarded(pool):
+    with pytest.raises(EOFError):
+        with pool.sftp(KEY, "k") as a:
+            raise EOFError
+    assert a.channel.closed
+    with pool.sftp(KEY, "k") as b:
+        assert b is not a
+
+
+def test_idle_eviction(pool):
+    with pool.sftp(KEY, "k"):
+        pass
+    assert pool.evict_idle() == 0
+    pool._idle_timeout = -1
+    assert pool.evict_idle() == 1
+    assert len(pool) == 0
+
+
+def test_checked_out_transport_is_never_evicted(pool):
+    with pool.sftp(KEY, "k"):
+        pass
+    pool._idle_timeout = -1
+    conn = pool._connection(KEY, "k", hold=True)  # what sftp() gets
+    assert pool.evict_idle() == 0 and conn.alive()
+    conn.in_use -= 1
+    assert pool.evict_idle() == 1 and not conn.alive()
+
+
+def test_single_handshake_under_contention(pool):
+    def work():
+        with pool.sftp(KEY, "k"):
+            pass
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert pool.stats["connects"] == 1
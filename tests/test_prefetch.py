@@ -0,0 +1,127 @@
+# tests/test_prefetch.py
+
+import io
+import threading
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+from PIL import Image
+from scipy.io import wavfile
+
+import media.envelope as envelope
+from cache.disk import DiskCache
+from media.thumbnails import Thumbnails
+from parser.frame_index import FrameIndex
+from ui.prefetch import (
+    Prefetcher,
+    event_tasks,
+    hour_tasks,
+    prefetch_adjacent_hours,
+    prefetch_events,
+)
+
+H = datetime(2020, 4, 18, 15, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def prefetcher():
+    p = Prefetcher(workers=1)
+    yield p
+    p.close()
+
+
+def test_new_batch_supersedes_queued_work(prefetcher):
+    started, release = threading.Event(), threading.Event()
+    ran = []
+
+    def blocker():
+        started.set()
+        release.wait(5)
+        ran.append("blocker")
+
+    prefetcher.schedule([blocker] + [lambda i=i: ran.append(i) for i in range(5)], "s1")
+    started.wait(5)
+    prefetcher.schedule([lambda: ran.append("new")], "s1")
+    release.set()
+    prefetcher.wait("s1", 5)
+
+    assert ran == ["blocker", "new"]
+    assert prefetcher.stats["skipped"] == 5
+    assert prefetcher.stats["done"] == 2
+
+
+def test_groups_are_independent_and_failures_counted(prefetcher):
+    def boom():
+        raise OSError("unreachable")
+
+    prefetcher.schedule([boom], "a")
+    prefetcher.wait("a", 5)
+    prefetcher.schedule([lambda: None], "b")
+    prefetcher.wait("b", 5)
+    assert prefetcher.stats["failed"] == 1 and prefetcher.stats["done"] == 1
+
+
+def _sources(tmp_path):
+    lores, hires, wavs = [], [], []
+    for h in range(3):
+        t = H + timedelta(hours=h)
+        p = tmp_path / f"lo{h}.jpg"
+        Image.new("RGB", (100, 40)).save(p)
+        lores.append({"timestamp": t, "full_path": str(p)})
+        for m in (0, 20):
+            p = tmp_path / f"hi{h}_{m}.jpg"
+            Image.new("RGB", (1000, 270), (h * 80, m, 0)).save(p)
+            hires.append({"timestamp": t + timedelta(minutes=m), "full_path": str(p)})
+        p = tmp_path / f"w{h}.wav"
+        buf = io.BytesIO()
+        wavfile.write(buf, 8000, np.zeros(8000, np.int16))
+        p.write_bytes(buf.getvalue())
+        wavs.append({"timestamp": t + timedelta(minutes=1), "path": str(p)})
+    return [FrameIndex.from_records(r) for r in (lores, hires, wavs)]
+
+
+def test_adjacent_hours_warm_previews_and_envelopes(tmp_path, monkeypatch, prefetcher):
+    monkeypatch.setenv("CASSANDRA_CACHE_DIR", str(tmp_path / "cache"))
+    cache = DiskCache(str(tmp_path / "thumbs"))
+    monkeypatch.setattr("media.thumbnails.get_thumbnail_cache", lambda: cache)
+    envelope._envelope.cache_clear()
+    lores, hires, wavs = _sources(tmp_path)
+    hours = [H + timedelta(hours=h) for h in range(3)]
+
+    # local: no LoRes transfer, one envelope and two previews
+    assert len(hour_tasks(H, lores=lores, hires=hires, wavs=wavs)) == 3
+
+    n = prefetch_adjacent_hours(hours[0], hours, group="s", prefetcher=prefetcher,
+                                lores=lores, hires=hires, wavs=wavs)
+    prefetcher.wait("s", 30)
+    assert n == 3 and prefetcher.stats["done"] == 3
+
+    thumbs = Thumbnails()
+
+    def in_hour(h):
+        return hires.window(h, h + timedelta(hours=1), include_end=False)
+
+    assert thumbs.missing(in_hour(hours[1])) == []
+    assert len(thumbs.missing(in_hour(hours[2]))) == 2
+    assert envelope._envelope.cache_info().currsize == 1
+
+
+def test_events_warm_their_hour_and_their_wav(tmp_path, monkeypatch, prefetcher):
+    monkeypatch.setenv("CASSANDRA_CACHE_DIR", str(tmp_path / "cache"))
+    cache = DiskCache(str(tmp_path / "thumbs"))
+    monkeypatch.setattr("media.thumbnails.get_thumbnail_cache", lambda: cache)
+    envelope._envelope.cache_clear()
+    lores, hires, wavs = _sources(tmp_path)
+    sources = dict(lores=lores, hires=hires, wavs=wavs)
+
+    # in the WAV the hour shows anyway
+    assert len(event_tasks(H + timedelta(minutes=40), **sources)) == 3
+    # before the hour's first WAV: the previous one holds the event
+    late = H + timedelta(hours=2, seconds=30)
+    assert len(event_tasks(late, **sources)) == 4
+
+    n = prefetch_events([late], group="e", prefetcher=prefetcher, **sources)
+    prefetcher.wait("e", 30)
+    assert n == 4 and prefetcher.stats["done"] == 4
+    assert envelope._envelope.cache_info().currsize == 2
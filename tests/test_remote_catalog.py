@@ -0,0 +1,129 @@
+# tests/test_remote_catalog.py
+#
+# Incremental remote listing against a fake station (no network).
+
+from ssh.fetcher_remote import RemoteEntry, _newer_command, _parse_listing
+from ssh.remote_catalog import RemoteCatalog
+
+
+class _Station:
+    remote_base = "C:/htdocs/VLF"
+
+    def __init__(self):
+        self.files = {"LoRes": {}, "HiRes": {}, "Wav": {}}
+        self.full_listings = 0
+        self.newer_calls = []
+        self.supports_newer = True
+
+    def add(self, resolution, name, mtime, size=100):
+        self.files[resolution][name] = RemoteEntry(name, size, mtime)
+
+    def list_entries(self, resolution, ext):
+        self.full_listings += 1
+        return list(self.files[resolution].values())
+
+    def list_newer(self, resolution, ext, since):
+        self.newer_calls.append(since)
+        if not self.supports_newer:
+            return None
+        return [e for e in self.files[resolution].values() if e.st_mtime > since]
+
+
+def _catalog(tmp_path, station, **kw):
+    kw.setdefault("min_interval", 0)
+    return RemoteCatalog(station, str(tmp_path / "listing.sqlite"), **kw)
+
+
+def test_first_refresh_lists_everything(tmp_path):
+    station = _Station()
+    station.add("LoRes", "STN_LoRest_180420UTC1200.jpg", 1_524_225_600)
+    station.add("HiRes", "STN_HiRest_180420UTC120040.jpg", 1_524_225_640)
+    cat = _catalog(tmp_path, station)
+
+    assert cat.refresh() == 2
+    assert station.full_listings == 3
+    rows = list(cat.table("HiRes"))
+    path = "C:/htdocs/VLF/HiRes/STN_HiRest_180420UTC120040.jpg"
+    assert rows[0]["remote_path"] == path
+    assert rows[0]["station"] == "STN"
+    assert cat.attrs(rows[0]["remote_path"]) == (100, 1_524_225_640)
+
+
+def test_later_refresh_only_merges_new_entries(tmp_path):
+    station = _Station()
+    station.add("LoRes", "STN_LoRest_180420UTC1200.jpg", 1_524_225_600)
+    cat = _catalog(tmp_path, station, slack=60)
+    cat.refresh()
+    stamp = cat.stamp()
+
+    station.add("LoRes", "STN_LoRest_180420UTC1201.jpg", 1_524_225_660)
+    assert cat.refresh() == 1
+    assert station.full_listings == 3  # no second full listing
+    assert 1_524_225_600 - 60 in station.newer_calls
+    assert len(cat.table("LoRes")) == 2
+    assert cat.stamp() != stamp
+
+    # nothing new: stamp is stable so cached indexes survive
+    stamp = cat.stamp()
+    assert cat.refresh() == 0
+    assert cat.stamp() == stamp
+
+
+def test_falls_back_to_full_listing(tmp_path):
+    station = _Station()
+    station.add("Wav", "STN_Audio_20UTC120000.wav", 1_524_225_600)
+    cat = _catalog(tmp_path, station)
+    cat.refresh()
+
+    station.supports_newer = False
+    del station.files["Wav"]["STN_Audio_20UTC120000.wav"]
+    assert cat.refresh() == 1
+    assert len(cat.table("Wav")) == 0
+
+
+def test_listing_persists_across_instances(tmp_path):
+    station = _Station()
+    station.add("LoRes", "STN_LoRest_180420UTC1200.jpg", 1_524_225_600)
+    _catalog(tmp_path, station).refresh()
+
+    again = _catalog(tmp_path, station)
+    again.refresh()
+    assert station.full_listings == 3
+    assert len(again.table("LoRes")) == 1
+
+
+def test_min_interval_skips_refresh(tmp_path):
+    station = _Station()
+    cat = _catalog(tmp_path, station, min_interval=3600)
+    cat.refresh()
+    cat.refresh()
+    assert station.full_listings == 3
+    assert station.newer_calls == []
+
+
+def test_nearest(tmp_path):
+    from datetime import datetime, timezone
+
+    station = _Station()
+    station.add("HiRes", "STN_HiRest_180420UTC120000.jpg", 1)
+    station.add("HiRes", "STN_HiRest_180420UTC120040.jpg", 1)
+    cat = _catalog(tmp_path, station)
+    cat.refresh()
+
+    row = cat.nearest("HiRes", datetime(2020, 4, 18, 12, 0, 30, tzinfo=timezone.utc))
+    assert row["original_filename"] == "STN_HiRest_180420UTC120040.jpg"
+    assert row["remote_path"].startswith("C:/htdocs/VLF/HiRes/")
+    assert cat.nearest("Wav", datetime(2020, 4, 18, tzinfo=timezone.utc)) is None
+
+
+def test_newer_command_and_parse():
+    win = _newer_command("C:/htdocs/VLF/HiRes", ".jpg", 1_700_000_000)
+    assert win.startswith("powershell") and "FromUnixTimeSeconds(1700000000)" in win
+    posix = _newer_command("/srv/vlf/HiRes", ".jpg", 1_700_000_000)
+    assert posix.startswith("find /srv/vlf/HiRes") and "-newermt @1700000000" in posix
+
+    out = "a.jpg|10|1700000001\r\nb c.jpg|20|1700000002.5\ngarbage\n"
+    assert _parse_listing(out) == [
+        RemoteEntry("a.jpg", 10, 1_700_000_001),
+        RemoteEntry("b c.jpg", 20, 1_700_000_002),
+    ]
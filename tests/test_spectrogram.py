@@ -0,0 +1,121 @@
+# tests/test_spectrogram.py
+
+import io
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+from scipy.io import wavfile
+
+import media.spectrogram as spec
+from media.spectrogram import LocalWavs, TileStore, stft_db
+from parser.frame_index import FrameIndex
+
+SR = 8_000
+T0 = datetime(2020, 4, 18, 12, 0, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture(autouse=True)
+def _cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("CASSANDRA_CACHE_DIR", str(tmp_path / "cache"))
+    spec._TILES.clear()
+
+
+def _tone(freq, seconds=10):
+    t = np.arange(int(SR * seconds)) / SR
+    return (np.sin(2 * np.pi * freq * t) * 10_000).astype(np.int16)
+
+
+def _wavs(tmp_path, specs):
+    rows = []
+    for i, (offset, freq) in enumerate(specs):
+        path = tmp_path / f"STN_Audio_{i}.wav"
+        buf = io.BytesIO()
+        wavfile.write(buf, SR, _tone(freq))
+        path.write_bytes(buf.getvalue())
+        rows.append({"timestamp": T0 + timedelta(seconds=offset),
+                     "path": str(path), "filename": path.name})
+    return FrameIndex.from_records(rows)
+
+
+def test_stft_peak_at_tone_frequency():
+    db = stft_db(_tone(1000))
+    f = np.fft.rfftfreq(spec.NFFT, 1 / SR)
+    assert abs(f[db.mean(axis=0).argmax()] - 1000) < SR / spec.NFFT
+    # chunking does not change the result
+    np.testing.assert_allclose(stft_db(_tone(1000), chunk=7), db, rtol=1e-5)
+
+
+def test_window_assembles_files_and_leaves_gaps_empty(tmp_path):
+    store = TileStore(_wavs(tmp_path, [(0, 1000), (30, 2000)]), LocalWavs())
+    assert store.sample_rate == SR
+
+    times, values = store.window(T0 - timedelta(seconds=5), T0 + timedelta(seconds=45))
+    assert len(times) == len(values) <= 768
+    f = store.freqs()
+    v = values.astype(np.float32)
+    t = (times - np.datetime64(T0.replace(tzinfo=None), "ms")) / np.timedelta64(1, "s")
+
+    first = v[(t > 1) & (t < 9)]
+    second = v[(t > 31) & (t < 39)]
+    gap = v[(t > 12) & (t < 28)]
+    assert abs(f[np.nanmean(first, axis=0).argmax()] - 1000) < 20
+    assert abs(f[np.nanmean(second, axis=0).argmax()] - 2000) < 20
+    assert np.isnan(gap).all()
+
+
+def test_tiles_are_reused_from_memory_then_disk(tmp_path):
+    wavs = _wavs(tmp_path, [(0, 1000)])
+    store = TileStore(wavs, LocalWavs())
+    store.window(T0, T0 + timedelta(seconds=10))
+    computed = store.stats["computed"]
+    assert computed > 0
+
+    store.window(T0, T0 + timedelta(seconds=10))
+    assert store.stats["computed"] == computed and store.stats["memory"] > 0
+
+    spec._TILES.clear()
+    again = TileStore(wavs, LocalWavs())
+    again.window(T0, T0 + timedelta(seconds=10))
+    assert again.stats["computed"] == 0 and again.stats["disk"] == computed
+
+
+class _CountingWavs(LocalWavs):
+    def __init__(self):
+        self.lookups = 0
+
+    def version(self, row):
+        self.lookups += 1
+        return super().version(row)
+
+
+def test_file_versions_are_looked_up_once_per_index(tmp_path):
+    wavs = _wavs(tmp_path, [(0, 1000)])
+    source = _CountingWavs()
+    store = TileStore(wavs, source)
+    for _ in range(3):  # reruns panning over the same file
+        store.window(T0, T0 + timedelta(seconds=10))
+        store.window(T0 + timedelta(seconds=2), T0 + timedelta(seconds=4))
+    assert source.lookups == 1
+
+    store.use(wavs)  # same catalog stamp, same index
+    store.window(T0, T0 + timedelta(seconds=10))
+    assert source.lookups == 1
+
+    store.use(FrameIndex.from_records(list(wavs)))  # the catalog changed
+    store.window(T0, T0 + timedelta(seconds=10))
+    assert source.lookups == 2
+
+
+def test_coarse_levels_for_long_windows(tmp_path):
+    store = TileStore(_wavs(tmp_path, [(0, 1000)]), LocalWavs())
+    assert store.level_for(30, 768) < store.level_for(24 * 3600, 768)
+    times, _ = store.window(T0 - timedelta(hours=12), T0 + timedelta(hours=12))
+    assert len(times) <= 768
+
+
+def test_precompute_in_processes(tmp_path):
+    wavs = _wavs(tmp_path, [(0, 1000), (30, 2000)])
+    store = TileStore(wavs, LocalWavs())
+    assert store.precompute(T0, T0 + timedelta(minutes=1), workers=2) == 2
+    store.window(T0, T0 + timedelta(seconds=40))  # STFTs come from the cache
@@ -0,0 +1,92 @@
+# tests/test_store.py
+
+import sqlite3
+import time
+from datetime import datetime, timedelta, timezone
+
+from inference.store import Detection, DetectionStore
+
+T0 = datetime(2025, 4, 1, tzinfo=timezone.utc)
+
+
+def _det(station, minute, seconds, score, model="m"):
+    start = T0 + timedelta(minutes=minute)
+    return Detection(station, start, start + timedelta(seconds=seconds), model, score,
+                     f"{station}_{minute}.wav")
+
+
+def test_window_queries_return_overlapping_events(tmp_path):
+    store = DetectionStore(str(tmp_path / "d.sqlite"))
+    store.add("m", "a", [_det("A", 0, 30, 0.6), _det("A", 10, 600, 0.9)])  # 10:00–20:00
+    store.add("m", "b", [_det("B", 12, 5, 0.7)])
+
+    got = store.detections("A", T0 + timedelta(minutes=15), T0 + timedelta(minutes=16))
+    assert [d.score for d in got] == [0.9]  # started before the window
+    assert got[0].start == T0 + timedelta(minutes=10) and got[0].start.tzinfo
+    assert len(store.detections(None, T0 + timedelta(minutes=11))) == 2
+    later = store.detections("A", T0 + timedelta(minutes=20), T0 + timedelta(hours=1))
+    assert later == []
+    assert [d.station for d in store.detections(min_score=0.65)] == ["A", "B"]
+
+
+def test_top_n_by_score(tmp_path):
+    store = DetectionStore(str(tmp_path / "d.sqlite"))
+    store.add("m", "a", [_det("A", i, 10, i / 100) for i in range(50)])
+    store.add("n", "a", [_det("A", 60, 10, 0.99, model="n")])
+    assert [d.score for d in store.top(3, "A")] == [0.99, 0.49, 0.48]
+    assert [d.score for d in store.top(2, "A", model="m",
+                                       end=T0 + timedelta(minutes=10))] == [0.09, 0.08]
+
+
+def test_files_are_tracked_and_rerecorded(tmp_path):
+    path = str(tmp_path / "d.sqlite")
+    store = DetectionStore(path)
+    store.add("m", "a", [_det("A", 0, 10, 0.6), _det("A", 1, 10, 0.7)])
+    store.add("m", "b", [])
+    assert store.processed("m", "a") and not store.processed("n", "a")
+
+    again = DetectionStore(path)
+    assert again.done("m") == {"a", "b"}
+    again.add("m", "a", [_det("A", 5, 10, 0.8)])  # same file, scored again
+    assert [d.score for d in store.detections()] == [0.8]
+
+
+def test_month_of_detections_is_queried_in_milliseconds(tmp_path):
+    store = DetectionStore(str(tmp_path / "d.sqlite"))
+    for day in range(30):  # ~ one detection a minute for a month
+        store.add("m", str(day), [
+            _det("A", day * 1440 + i, 20, (i * 37 % 100) / 100) for i in range(1440)
+        ])
+    t = time.perf_counter()
+    hour = T0 + timedelta(days=20)
+    window = store.detections("A", hour, hour + timedelta(hours=1))
+    top = store.top(10, "A", T0, T0 + timedelta(days=30))
+    assert time.perf_counter() - t < 0.5
+    assert len(window) == 60 and top[0].score == 0.99
+
+
+def test_timeline_bins_follow_every_write(tmp_path):
+    store = DetectionStore(str(tmp_path / "d.sqlite"))
+    store.add("m", "a", [_det("A", 5, 10, 0.6), _det("A", 50, 10, 0.9),
+                         _det("A", 65, 10, 0.7)])
+    store.add("n", "a", [_det("A", 6, 10, 0.95, model="n"), _det("B", 6, 10, 0.5)])
+
+    t1 = T0 + timedelta(hours=1)
+    assert store.bins("hour", "A") == [(T0, 3, 0.95), (t1, 1, 0.7)]
+    assert store.bins("day", "A", model="m") == [(T0, 3, 0.9)]
+    assert store.bins("hour", None, t1) == [(t1, 1, 0.7)]
+
+    store.add("m", "a", [_det("A", 7, 10, 0.55)])  # rescored: old bins recounted
+    assert store.bins("hour", "A", model="m") == [(T0, 1, 0.55)]
+
+
+def test_bins_are_built_for_older_stores(tmp_path):
+    path = str(tmp_path / "d.sqlite")
+    DetectionStore(path).add("m", "a", [_det("A", 5, 10, 0.6),
+                                        _det("A", 1500, 10, 0.8)])
+    with sqlite3.connect(path) as con:  # a store from before the timeline bins
+        con.execute("DELETE FROM bins")
+        con.execute("PRAGMA user_version = 1")
+    store = DetectionStore(path)
+    assert store.bins("day", "A") == [(T0, 1, 0.6), (T0 + timedelta(days=1), 1, 0.8)]
+    assert store.processed("m", "a")
@@ -0,0 +1,151 @@
+# tests/test_sync.py
+#
+# Station mirroring against a fake remote (no network).
+
+import os
+import time
+
+import pytest
+
+from ssh.fetcher_remote import RemoteEntry
+from ssh.remote_catalog import RemoteCatalog
+from ssh.sync import RateLimiter, StationMirror, with_retry
+
+
+class _Remote:
+    remote_base = "C:/htdocs/VLF"
+
+    def __init__(self):
+        self.files = {"LoRes": {}, "HiRes": {}, "Wav": {}}
+        self.fail_next = 0
+        self.gone = set()  # listed, then deleted before the download
+        self.downloads = []
+        self.listing = None
+
+    def add(self, resolution, name, mtime):
+        self.files[resolution][name] = RemoteEntry(name, 4, mtime)
+
+    def list_entries(self, resolution, ext):
+        return list(self.files[resolution].values())
+
+    def list_newer(self, resolution, ext, since):
+        return [e for e in self.files[resolution].values() if e.st_mtime > since]
+
+    def download(self, remote_path, local_path, throttle=None):
+        if self.fail_next:
+            self.fail_next -= 1
+            raise EOFError("connection dropped")
+        if remote_path.rpartition("/")[2] in self.gone:
+            raise FileNotFoundError(remote_path)
+        if throttle is not None:
+            throttle(4)
+        self.downloads.append(remote_path)
+        resolution, _, name = remote_path.rpartition("/")
+        entry = self.files[resolution.rpartition("/")[2]][name]
+        with open(local_path, "wb") as f:
+            f.write(b"data")
+        os.utime(local_path, (entry.st_mtime, entry.st_mtime))  # like the real client
+        return 4
+
+
+def _mirror(tmp_path, remote, **kw):
+    remote.listing = RemoteCatalog(remote, str(tmp_path / "listing.sqlite"))
+    return StationMirror("STN", remote, str(tmp_path / "mirror"), backoff=0, **kw)
+
+
+def test_mirror_downloads_only_missing_files(tmp_path):
+    remote = _Remote()
+    remote.add("LoRes", "STN_LoRest_180420UTC1200.jpg", 1_524_225_600)
+    remote.add("HiRes", "STN_HiRest_180420UTC120040.jpg", 1_524_225_640)
+    mirror = _mirror(tmp_path, remote)
+
+    assert mirror.sync_once() == 2
+    assert os.path.exists(tmp_path / "mirror/HiRes/STN_HiRest_180420UTC120040.jpg")
+
+    remote.add("HiRes", "STN_HiRest_180420UTC120120.jpg", 1_524_225_680)
+    assert mirror.sync_once() == 1
+    assert remote.downloads[-1].endswith("STN_HiRest_180420UTC120120.jpg")
+
+    # the local catalog sees the mirrored frames
+    from parser.catalog import Catalog
+    assert len(Catalog(str(tmp_path / "mirror")).table(None, "HiRes")) == 2
+
+
+def test_mirror_replaces_truncated_and_changed_copies(tmp_path):
+    remote = _Remote()
+    remote.add("HiRes", "STN_HiRest_180420UTC120040.jpg", 1_524_225_640)
+    remote.add("HiRes", "STN_HiRest_180420UTC120120.jpg", 1_524_225_680)
+    mirror = _mirror(tmp_path, remote)
+    assert mirror.sync_once() == 2
+    assert mirror.sync_once() == 0  # up to date: nothing fetched again
+
+    # copied while the station was still writing it
+    local = tmp_path / "mirror/HiRes/STN_HiRest_180420UTC120040.jpg"
+    local.write_bytes(b"da")
+    os.utime(local, (1_524_225_640, 1_524_225_640))
+    # rewritten on the station later
+    remote.add("HiRes", "STN_HiRest_180420UTC120120.jpg", 1_524_225_900)
+
+    assert mirror.sync_once() == 2
+    assert local.read_bytes() == b"data"
+    assert mirror.sync_once() == 0
+
+
+def test_mirror_retries_then_skips(tmp_path):
+    remote = _Remote()
+    remote.add("LoRes", "STN_LoRest_180420UTC1200.jpg", 1_524_225_600)
+    mirror = _mirror(tmp_path, remote, retries=1)
+
+    remote.fail_next = 1
+    assert mirror.sync_once() == 1  # one retry is enough
+
+    remote.add("LoRes", "STN_LoRest_180420UTC1300.jpg", 1_524_229_200)
+    remote.fail_next = 5
+    assert mirror.sync_once() == 0
+    assert mirror.stats["errors"] == 1
+    remote.fail_next = 0
+    assert mirror.sync_once() == 1  # picked up next cycle
+
+
+def test_file_deleted_after_the_listing_is_skipped(tmp_path):
+    remote = _Remote()
+    remote.add("HiRes", "STN_HiRest_180420UTC120040.jpg", 1_524_225_640)
+    remote.add("HiRes", "STN_HiRest_180420UTC120120.jpg", 1_524_225_680)
+    remote.gone.add("STN_HiRest_180420UTC120120.jpg")
+    mirror = _mirror(tmp_path, remote)
+
+    assert mirror.sync_once() == 1
+    assert mirror.stats["errors"] == 0
+
+
+def test_with_retry_backoff():
+    sleeps = []
+    calls = iter([ConnectionResetError(), EOFError(), "ok"])
+
+    def fn():
+        r = next(calls)
+        if isinstance(r, Exception):
+            raise r
+        return r
+
+    assert with_retry(fn, retries=3, backoff=1.0, sleep=sleeps.append) == "ok"
+    assert len(sleeps) == 2 and 0.5 <= sleeps[0] <= 1.0 and 1.0 <= sleeps[1] <= 2.0
+
+    with pytest.raises(ConnectionResetError):
+        with_retry(lambda: (_ for _ in ()).throw(ConnectionResetError()), retries=1,
+                   backoff=0, sleep=sleeps.append)
+
+    sleeps.clear()  # a file error is not the connection's: no retry
+    with pytest.raises(FileNotFoundError):
+        with_retry(lambda: (_ for _ in ()).throw(FileNotFoundError()),
+                   sleep=sleeps.append)
+    assert sleeps == []
+
+
+def test_rate_limiter_paces_consumers():
+    limiter = RateLimiter(rate=1000, burst=100)
+    t0 = time.perf_counter()
+    for _ in range(3):
+        limiter.consume(100)
+    # burst covers the first 100 bytes, the rest waits ~0.2 s
+    assert time.perf_counter() - t0 >= 0.15
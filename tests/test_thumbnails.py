@@ -0,0 +1,76 @@
+# tests/test_thumbnails.py
+
+import io
+import os
+
+import numpy as np
+import pytest
+from PIL import Image
+
+import media.thumbnails as thumbs_mod
+from cache.disk import DiskCache
+from media.thumbnails import Thumbnails, decode_reduced, fit, render_pool
+
+
+def _jpeg(path, size=(2000, 540), value=0):
+    rng = np.random.default_rng(value)
+    arr = rng.integers(0, 255, (size[1], size[0], 3), dtype=np.uint8)
+    Image.fromarray(arr).save(path, "JPEG")
+    return {"full_path": str(path), "original_filename": os.path.basename(path)}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return DiskCache(str(tmp_path / "thumbs"))
+
+
+def test_fit_keeps_aspect_and_never_upscales():
+    assert fit((1035, 279), 320) == (320, 86)
+    assert fit((100, 50), 320) == (100, 50)
+
+
+def test_reduced_decoding(tmp_path, monkeypatch):
+    row = _jpeg(tmp_path / "a.jpg")
+    seen = []
+    real = Image.Image.resize
+
+    def spy(self, size, *args, **kw):
+        seen.append(self.size)  # size handed over by the decoder
+        return real(self, size, *args, **kw)
+
+    monkeypatch.setattr(Image.Image, "resize", spy)
+    im = decode_reduced(row["full_path"], 320)
+    assert im.size == (320, 86)
+    assert seen[0][0] < 2000 and seen[0][0] >= 320  # DCT-scaled, not full size
+
+
+def test_thumbnail_cached_by_mtime(tmp_path, cache, monkeypatch):
+    row = _jpeg(tmp_path / "a.jpg")
+    t = Thumbnails(cache=cache)
+    first = t.thumbnail(row, 320)
+    assert Image.open(io.BytesIO(first)).size == (320, 86)
+
+    calls = []
+    real = thumbs_mod.make_thumbnail
+    monkeypatch.setattr(thumbs_mod, "make_thumbnail",
+                        lambda *a: calls.append(a) or real(*a))
+    assert t.thumbnail(row, 320) == first and not calls
+
+    _jpeg(tmp_path / "a.jpg", value=1)
+    st = os.stat(row["full_path"])
+    os.utime(row["full_path"], ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert t.thumbnail(row, 320) != first and len(calls) == 1
+
+
+def test_generate_fills_every_size(tmp_path, cache, monkeypatch):
+    rows = [_jpeg(tmp_path / f"{i}.jpg", value=i) for i in range(3)]
+    t = Thumbnails(cache=cache)
+    assert len(t.missing(rows)) == 3
+    with render_pool(2) as pool:
+        assert t.generate(rows, pool) == 3
+        assert t.missing(rows) == [] and t.generate(rows, pool) == 0
+
+    monkeypatch.setattr(thumbs_mod, "make_thumbnail", None)  # must not be needed
+    for edge in thumbs_mod.SIZES:
+        data = t.thumbnail(rows[0], edge)
+        assert max(Image.open(io.BytesIO(data)).size) == edge
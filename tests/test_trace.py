@@ -0,0 +1,65 @@
+# tests/test_trace.py
+
+import contextvars
+import json
+import threading
+
+from perf import trace
+
+
+@trace.traced("work")
+def _work(x):
+    with trace.span("inner", x=x):
+        trace.count("items", x)
+    return x * 2
+
+
+def test_nothing_recorded_when_off():
+    assert trace.current() is None
+    assert _work(3) == 6
+    assert trace.finish() is None
+
+
+def test_spans_nest_and_count():
+    rec = trace.start("test")
+    try:
+        _work(2)
+        _work(5)
+    finally:
+        assert trace.finish() is rec
+    assert trace.current() is None
+
+    assert [(s.name, s.depth) for s in rec.spans] == [
+        ("inner", 1), ("work", 0), ("inner", 1), ("work", 0)
+    ]
+    assert rec.spans[0].attrs == {"x": 2}
+    assert rec.counters == {"items": 7}
+    totals = rec.totals()
+    assert totals["work"]["calls"] == 2
+    assert totals["work"]["total"] >= totals["inner"]["total"]
+    assert rec.duration >= totals["work"]["total"]
+
+
+def test_worker_threads_join_the_rerun_with_a_copied_context():
+    rec = trace.start()
+    t = threading.Thread(target=contextvars.copy_context().run, args=(_work, 1),
+                         name="fetch-1")
+    t.start()
+    t.join()
+    plain = threading.Thread(target=_work, args=(1,))
+    plain.start()
+    plain.join()
+    trace.finish()
+    assert {s.thread for s in rec.spans} == {"fetch-1"}
+
+
+def test_json_lines_dump(tmp_path):
+    log = tmp_path / "perf.jsonl"
+    trace.start("dump")
+    _work(1)
+    rec = trace.finish(str(log))
+    lines = [json.loads(line) for line in log.read_text().splitlines()]
+    assert [entry["type"] for entry in lines] == ["span", "span", "rerun"]
+    assert {entry["run"] for entry in lines} == {rec.run_id}
+    assert lines[0]["attrs"] == {"x": 1}
+    assert lines[-1]["counters"] == {"items": 1}